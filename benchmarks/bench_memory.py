@@ -0,0 +1,110 @@
+"""Mesure l'empreinte mémoire par ligne des représentations de détenus.
+
+Compare l'ancienne dataclass avec __dict__, le Detainee à __slots__ et le
+lot en colonnes DetaineeBatch, sur des données synthétiques où noms,
+prénoms et dates se répètent comme dans une vraie liste.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_memory.py --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus.models import Detainee, DetaineeBatch
+
+SEED = 20240501
+SURNAMES = 5000
+FIRST_NAMES = 800
+
+
+@dataclass(frozen=True)
+class DictDetainee:
+    """Réplique de l'ancien Detainee, avec un __dict__ par instance."""
+
+    nom: str
+    prenom: str
+    date_naissance: str
+
+
+def synthetic_rows(count: int) -> list[tuple[str, str, str]]:
+    """Génère des lignes dont les chaînes sont créées indépendamment.
+
+    Chaque ligne reçoit ses propres objets str, comme après un découpage
+    de texte, afin que l'internement du lot soit mesuré honnêtement.
+    """
+
+    generator = random.Random(SEED)
+    rows = []
+    for _ in range(count):
+        nom = "NOM" + str(generator.randrange(SURNAMES))
+        prenom = "Prenom" + str(generator.randrange(FIRST_NAMES))
+        year = generator.randint(1940, 2005)
+        month = generator.randint(1, 12)
+        day = generator.randint(1, 28)
+        rows.append((nom, prenom, f"{year:04d}-{month:02d}-{day:02d}"))
+    return rows
+
+
+def measure(build: Callable[[], object]) -> int:
+    """Retourne les octets alloués et conservés par build()."""
+
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+
+def main() -> int:
+    """Affiche les octets par ligne de chaque représentation."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    candidates: dict[str, Callable[[], object]] = {
+        "dataclass avec __dict__": lambda: [
+            DictDetainee(*row) for row in synthetic_rows(args.rows)
+        ],
+        "Detainee (__slots__)": lambda: [
+            Detainee(*row) for row in synthetic_rows(args.rows)
+        ],
+        "DetaineeBatch (colonnes)": lambda: _build_batch(args.rows),
+    }
+    reference = None
+    for label, build in candidates.items():
+        per_row = measure(build) / args.rows
+        reference = reference or per_row
+        print(
+            f"{label:<28} {per_row:8.1f} octets/ligne "
+            f"({per_row / reference:6.1%} de la référence)"
+        )
+    return 0
+
+
+def _build_batch(count: int) -> DetaineeBatch:
+    """Construit un lot en colonnes à partir des lignes synthétiques."""
+
+    batch = DetaineeBatch()
+    for nom, prenom, birth_date in synthetic_rows(count):
+        batch.append(nom, prenom, birth_date)
+    return batch
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,272 @@
+"""Mesure le débit de chaque étape de conversion sur un corpus synthétique.
+
+Le corpus est produit par corpus.py avec une graine fixe. Chaque étape
+(read_pdf_tables, tables_to_detainees, write_csv, puis la conversion
+complète convert_pdf_to_csv, en mémoire et en flux) est chronométrée
+plusieurs fois et le meilleur temps est retenu; une passe séparée sous
+tracemalloc relève le pic mémoire de l'étape. Les débits sont comparés à
+ceux d'une référence enregistrée: une baisse au-delà du seuil est une
+régression et le script se termine avec le code 1.
+
+Usage:
+    python benchmarks/bench_stages.py --format texte
+    python benchmarks/bench_stages.py --rows 100000 --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import asdict
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+for path in (SRC_DIR, PROJECT_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from benchmarks.corpus import (
+    CorpusSpec,
+    add_spec_arguments,
+    spec_from_args,
+    write_corpus,
+)
+from listedetenus.csv_writer import write_csv
+from listedetenus.parser import tables_to_detainees
+from listedetenus.pdf_loader import read_pdf_tables
+from listedetenus.workflow import convert_pdf_to_csv
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 3
+
+STAGE_READ = "read_pdf_tables"
+STAGE_PARSE = "tables_to_detainees"
+STAGE_WRITE = "write_csv"
+STAGE_CONVERT = "convert_pdf_to_csv"
+STAGE_STREAM = "convert_pdf_to_csv_flux"
+
+
+def run_stages(
+    workdir: Path, spec: CorpusSpec, repeat: int
+) -> dict[str, dict[str, float]]:
+    """Mesure chaque étape sur le corpus décrit par spec.
+
+    Rôle:
+        Générer le corpus dans workdir puis chronométrer les étapes.
+    Entrées:
+        workdir: dossier de travail temporaire.
+        spec: forme du corpus.
+        repeat: nombre d'exécutions chronométrées par étape.
+    Sorties:
+        Par étape: secondes (meilleur temps), lignes_par_seconde (lignes du
+        corpus, invalides comprises) et pic_memoire_octets.
+    Erreurs:
+        ValueError: paramètres de corpus incohérents.
+        RuntimeError: échec de la conversion du corpus.
+    """
+
+    pdf_path = workdir / "corpus.pdf"
+    csv_path = workdir / "sortie.csv"
+    write_corpus(pdf_path, spec)
+    tables = read_pdf_tables(pdf_path).tables
+    detainees = tables_to_detainees(tables)
+
+    stages: dict[str, Callable[[], object]] = {
+        STAGE_READ: lambda: read_pdf_tables(pdf_path),
+        STAGE_PARSE: lambda: tables_to_detainees(tables),
+        STAGE_WRITE: lambda: write_csv(csv_path, detainees),
+        STAGE_CONVERT: lambda: convert_pdf_to_csv(pdf_path, csv_path),
+        STAGE_STREAM: lambda: convert_pdf_to_csv(
+            pdf_path, csv_path, streaming=True
+        ),
+    }
+    results: dict[str, dict[str, float]] = {}
+    for stage, action in stages.items():
+        seconds = _best_time(action, repeat)
+        results[stage] = {
+            "secondes": round(seconds, 6),
+            "lignes_par_seconde": round(spec.rows / seconds),
+            "pic_memoire_octets": _peak_memory(action),
+        }
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    reference: dict[str, float],
+    threshold: float,
+) -> list[str]:
+    """Liste les étapes dont le débit a baissé de plus que threshold.
+
+    Entrées:
+        results: mesures produites par run_stages.
+        reference: débit de référence (lignes/s) par étape.
+        threshold: baisse relative tolérée, par exemple 0.25 pour 25 %.
+    Sorties:
+        Une description par régression; liste vide si aucune.
+    """
+
+    regressions = []
+    for stage, expected in reference.items():
+        measured = results.get(stage)
+        if measured is None:
+            continue
+        rate = measured["lignes_par_seconde"]
+        if rate < expected * (1 - threshold):
+            regressions.append(
+                f"{stage}: {rate:.0f} lignes/s contre {expected:.0f} "
+                f"({rate / expected - 1:+.1%})"
+            )
+    return regressions
+
+
+def load_baseline(path: Path) -> dict[str, Any]:
+    """Lit les références enregistrées; dictionnaire vide si absentes."""
+
+    if not path.exists():
+        return {}
+    with path.open(encoding="utf-8") as stream:
+        return json.load(stream)
+
+
+def save_baseline(
+    path: Path,
+    scenario: str,
+    spec: CorpusSpec,
+    results: dict[str, dict[str, float]],
+) -> None:
+    """Enregistre les débits mesurés comme référence du scénario."""
+
+    baseline = load_baseline(path)
+    baseline[scenario] = {
+        "corpus": _spec_record(spec),
+        "lignes_par_seconde": {
+            stage: measures["lignes_par_seconde"]
+            for stage, measures in results.items()
+        },
+    }
+    text = json.dumps(baseline, ensure_ascii=False, indent=2, sort_keys=True)
+    path.write_text(text + "\n", encoding="utf-8")
+
+
+def _spec_record(spec: CorpusSpec) -> dict[str, Any]:
+    """Paramètres du corpus tels que relus depuis le JSON de référence."""
+
+    return json.loads(json.dumps(asdict(spec)))
+
+
+def _best_time(action: Callable[[], object], repeat: int) -> float:
+    """Meilleur temps de repeat exécutions, ramasse-miettes suspendu."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = perf_counter()
+            action()
+            best = min(best, perf_counter() - started)
+        finally:
+            gc.enable()
+    return best
+
+
+def _peak_memory(action: Callable[[], object]) -> int:
+    """Pic d'allocations de l'étape, au-delà de la mémoire déjà occupée."""
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        action()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+
+def _print_results(
+    results: dict[str, dict[str, float]], reference: dict[str, float]
+) -> None:
+    """Affiche une ligne par étape, écart à la référence compris."""
+
+    for stage, measures in results.items():
+        rate = measures["lignes_par_seconde"]
+        line = (
+            f"{stage:<26} {measures['secondes']:9.3f} s "
+            f"{rate:>11,.0f} lignes/s "
+            f"{measures['pic_memoire_octets'] / 1_048_576:8.1f} Mio"
+        )
+        if stage in reference:
+            line += f"  ({rate / reference[stage] - 1:+.1%})"
+        print(line)
+
+
+def main() -> int:
+    """Mesure, affiche, puis compare ou enregistre la référence."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_spec_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        "--scenario",
+        help="Nom de la référence (défaut: <format>-<lignes>).",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Baisse de débit tolérée avant d'échouer (défaut: 0.25).",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Enregistre les mesures comme nouvelle référence.",
+    )
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat doit valoir au moins 1.")
+    spec = spec_from_args(args)
+    scenario = args.scenario or f"{spec.output_format}-{spec.rows}"
+
+    stored = load_baseline(args.baseline).get(scenario)
+    if stored is not None and stored["corpus"] != _spec_record(spec):
+        if not args.update_baseline:
+            parser.error(
+                f"La référence {scenario} porte sur un autre corpus; "
+                "choisissez un autre --scenario."
+            )
+    reference = {} if stored is None else stored["lignes_par_seconde"]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            results = run_stages(Path(tmp_dir), spec, args.repeat)
+        except ValueError as error:
+            parser.error(str(error))
+    print(f"Scénario {scenario}: {spec.rows} lignes, {spec.tables} tables")
+    _print_results(results, reference)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, scenario, spec, results)
+        print(f"Référence enregistrée dans {args.baseline}")
+        return 0
+    if not reference:
+        print("Aucune référence pour ce scénario (--update-baseline).")
+        return 0
+    regressions = compare(results, reference, args.threshold)
+    for regression in regressions:
+        print(f"RÉGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""Génère des listes de détenus synthétiques et reproductibles.
+
+Aucune liste réelle ne peut être partagée: ce générateur produit, à partir
+d'une graine, des documents de taille et de forme réglables (nombre de
+lignes et de tables, sauts de page, mélange de séparateurs et de formats
+de date, proportion de lignes invalides), sous forme d'export textuel ou de
+vrai PDF aux flux compressés FlateDecode. À paramètres égaux, les octets
+produits sont identiques d'une exécution à l'autre.
+
+Usage:
+    python benchmarks/corpus.py liste.pdf --rows 100000 --format pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import zlib
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+FORMAT_TEXT = "texte"
+FORMAT_PDF = "pdf"
+OUTPUT_FORMATS = (FORMAT_TEXT, FORMAT_PDF)
+
+DEFAULT_SEED = 20240501
+DEFAULT_SEPARATORS = (";", ",", "\t", "|")
+DEFAULT_DATE_FORMATS = ("%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d", "%d/%m/%y")
+
+SURNAMES = (
+    "MARTIN", "BERNARD", "DUBOIS", "THOMAS", "ROBERT", "RICHARD", "PETIT",
+    "DURAND", "LEROY", "MOREAU", "SIMON", "LAURENT", "LEFÈVRE", "MICHEL",
+    "GARCIA", "DAVID", "BERTRAND", "ROUX", "VINCENT", "FOURNIER", "MOREL",
+    "GIRARD", "ANDRÉ", "MERCIER", "DUPONT", "LAMBERT", "BONNET", "FRANÇOIS",
+    "MARTINEZ", "LEGRAND", "GARNIER", "FAURE", "ROUSSEAU", "BLANC", "GUÉRIN",
+)
+FIRST_NAMES = (
+    "Lena", "Hugo", "Chloé", "Louis", "Inès", "Gabriel", "Léa", "Arthur",
+    "Manon", "Jules", "Camille", "Adam", "Zoé", "Raphaël", "Sarah", "Noé",
+    "Anaïs", "Ethan", "Jade", "Mathis", "Eloïse", "Nathan", "Maëlle",
+    "Théo",
+)
+HEADER_VARIANTS = (
+    ("Nom", "Prénom", "Date de naissance"),
+    ("NOM", "PRENOM", "NAISSANCE"),
+    ("Nom", "Prénom", "Date"),
+)
+INVALID_DATES = ("31/02/1990", "inconnue", "00/00/0000", "1990-13-01")
+
+PAGE_TOP = 800
+LINE_HEIGHT = 12
+PAGE_BOTTOM = 40
+MAX_ROWS_PER_PAGE = (PAGE_TOP - PAGE_BOTTOM) // LINE_HEIGHT
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Forme d'une liste synthétique.
+
+    Attributs:
+        rows: lignes de données, invalides comprises.
+        tables: tables distinctes, chacune avec son entête, son séparateur
+            et sa variante de libellés.
+        rows_per_page: lignes par page; chaque saut de page répète l'entête
+            de la table en cours, comme dans les listes imprimées.
+        separators: séparateurs tirés pour chaque table.
+        date_formats: formats strftime tirés pour chaque ligne.
+        invalid_ratio: proportion de lignes à rejeter (date impossible,
+            champ vide ou ligne tronquée).
+        output_format: FORMAT_TEXT (export UTF-8) ou FORMAT_PDF.
+        seed: graine du générateur pseudo-aléatoire.
+    """
+
+    rows: int = 10_000
+    tables: int = 4
+    rows_per_page: int = 50
+    separators: tuple[str, ...] = DEFAULT_SEPARATORS
+    date_formats: tuple[str, ...] = DEFAULT_DATE_FORMATS
+    invalid_ratio: float = 0.02
+    output_format: str = FORMAT_PDF
+    seed: int = DEFAULT_SEED
+
+    def validate(self) -> None:
+        """Vérifie la cohérence des paramètres.
+
+        Erreurs:
+            ValueError: valeur hors des bornes acceptées.
+        """
+
+        if self.rows < 1 or self.tables < 1:
+            raise ValueError("Il faut au moins une ligne et une table.")
+        if not 1 <= self.rows_per_page <= MAX_ROWS_PER_PAGE - 1:
+            message = (
+                "Le nombre de lignes par page doit être compris entre 1 "
+                f"et {MAX_ROWS_PER_PAGE - 1}."
+            )
+            raise ValueError(message)
+        if not self.separators or not self.date_formats:
+            raise ValueError("Séparateurs et formats de date requis.")
+        if not 0.0 <= self.invalid_ratio < 1.0:
+            message = "La proportion de lignes invalides doit être < 1."
+            raise ValueError(message)
+        if self.output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Format inconnu: {self.output_format}.")
+
+
+def write_corpus(path: Path, spec: CorpusSpec) -> int:
+    """Écrit la liste décrite par spec.
+
+    Rôle:
+        Produire un document synthétique, page par page, sans le garder en
+        mémoire.
+    Entrées:
+        path: fichier de sortie (extension libre).
+        spec: forme du document.
+    Sorties:
+        Nombre de lignes valides attendues dans le CSV.
+    Erreurs:
+        ValueError: paramètres incohérents.
+    """
+
+    spec.validate()
+    pages = _iter_pages(spec)
+    with path.open("wb") as stream:
+        if spec.output_format == FORMAT_PDF:
+            return _write_pdf(stream, pages)
+        return _write_text(stream, pages)
+
+
+class _Page:
+    """Lignes d'une page et nombre de lignes valides qu'elle contient."""
+
+    __slots__ = ("lines", "valid")
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.valid = 0
+
+
+def _iter_pages(spec: CorpusSpec) -> Iterator[_Page]:
+    """Découpe les lignes générées en pages, entête en tête de page."""
+
+    generator = random.Random(spec.seed)
+    first_ordinal = date(1940, 1, 1).toordinal()
+    last_ordinal = date(2005, 12, 31).toordinal()
+    table_sizes = _split_evenly(spec.rows, spec.tables)
+    for table_size in table_sizes:
+        separator = generator.choice(spec.separators)
+        header = separator.join(generator.choice(HEADER_VARIANTS))
+        remaining = table_size
+        while remaining:
+            page = _Page()
+            page.lines.append(header)
+            for _ in range(min(remaining, spec.rows_per_page)):
+                birth = date.fromordinal(
+                    generator.randint(first_ordinal, last_ordinal)
+                )
+                fields = [
+                    generator.choice(SURNAMES),
+                    generator.choice(FIRST_NAMES),
+                    birth.strftime(generator.choice(spec.date_formats)),
+                ]
+                if generator.random() < spec.invalid_ratio:
+                    _spoil(fields, generator)
+                else:
+                    page.valid += 1
+                page.lines.append(separator.join(fields))
+            remaining -= len(page.lines) - 1
+            yield page
+
+
+def _spoil(fields: list[str], generator: random.Random) -> None:
+    """Rend une ligne invalide: date impossible, champ vide ou troncature."""
+
+    defect = generator.randrange(3)
+    if defect == 0:
+        fields[2] = generator.choice(INVALID_DATES)
+    elif defect == 1:
+        fields[1] = ""
+    else:
+        del fields[1:]
+
+
+def _split_evenly(total: int, parts: int) -> list[int]:
+    """Répartit total en parts tailles égales à une unité près."""
+
+    parts = min(parts, total)
+    size, extra = divmod(total, parts)
+    return [size + (index < extra) for index in range(parts)]
+
+
+def _write_text(stream: BinaryIO, pages: Iterator[_Page]) -> int:
+    """Export textuel: pages séparées par un saut de page (form feed)."""
+
+    valid = 0
+    for number, page in enumerate(pages):
+        if number:
+            stream.write(b"\f\n")
+        stream.write("\n".join(page.lines).encode("utf-8") + b"\n")
+        valid += page.valid
+    return valid
+
+
+def _write_pdf(stream: BinaryIO, pages: Iterator[_Page]) -> int:
+    """PDF 1.4: une page et un flux FlateDecode par page, xref classique.
+
+    Les objets sont écrits au fil de l'eau; le catalogue et l'arbre des
+    pages, qui référencent toutes les pages, sont placés en fin de fichier.
+    """
+
+    offsets: list[int] = []
+    position = 0
+    page_numbers: list[int] = []
+    valid = 0
+
+    def write_object(body: bytes) -> int:
+        nonlocal position
+        offsets.append(position)
+        number = len(offsets)
+        data = b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        stream.write(data)
+        position += len(data)
+        return number
+
+    header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+    stream.write(header)
+    position = len(header)
+    font = write_object(
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    )
+    # Numéro réservé à l'arbre des pages, écrit en dernier.
+    pages_number = len(offsets) + 1
+    offsets.append(0)
+    for page in pages:
+        data = zlib.compress(_page_content(page.lines))
+        content = write_object(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data)
+            + data
+            + b"\nendstream"
+        )
+        page_numbers.append(
+            write_object(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> "
+                b"/Contents %d 0 R >>" % (pages_number, font, content)
+            )
+        )
+        valid += page.valid
+
+    offsets[pages_number - 1] = position
+    kids = b" ".join(b"%d 0 R" % number for number in page_numbers)
+    tree = b"%d 0 obj\n<< /Type /Pages /Kids [%s] /Count %d >>\nendobj\n" % (
+        pages_number,
+        kids,
+        len(page_numbers),
+    )
+    stream.write(tree)
+    position += len(tree)
+    catalog = write_object(
+        b"<< /Type /Catalog /Pages %d 0 R >>" % pages_number
+    )
+
+    size = len(offsets) + 1
+    xref = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+    xref.extend(b"%010d 00000 n \n" % offset for offset in offsets)
+    xref.append(b"trailer\n<< /Size %d /Root %d 0 R >>\n" % (size, catalog))
+    xref.append(b"startxref\n%d\n%%%%EOF\n" % position)
+    stream.write(b"".join(xref))
+    return valid
+
+
+def _page_content(lines: list[str]) -> bytes:
+    """Flux de contenu affichant chaque ligne en un seul fragment Tj."""
+
+    commands = [b"BT", b"/F1 10 Tf"]
+    for index, line in enumerate(lines):
+        text = line.encode("latin-1")
+        text = text.replace(b"\\", b"\\\\").replace(b"(", b"\\(")
+        text = text.replace(b")", b"\\)")
+        y = PAGE_TOP - index * LINE_HEIGHT
+        commands.append(b"1 0 0 1 40 %d Tm (%s) Tj" % (y, text))
+    commands.append(b"ET")
+    return b"\n".join(commands)
+
+
+def main() -> int:
+    """Écrit un corpus selon les options de la ligne de commande."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path, help="Fichier à produire.")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    try:
+        valid = write_corpus(args.output, spec_from_args(args))
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"{args.output}: {args.rows} lignes dont {valid} valides")
+    return 0
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """Déclare les options décrivant un CorpusSpec."""
+
+    defaults = CorpusSpec()
+    parser.add_argument("--rows", type=int, default=defaults.rows)
+    parser.add_argument("--tables", type=int, default=defaults.tables)
+    parser.add_argument(
+        "--rows-per-page", type=int, default=defaults.rows_per_page
+    )
+    parser.add_argument(
+        "--separators",
+        default="".join(defaults.separators),
+        help="Caractères séparateurs à mélanger (défaut: ;,TAB|).",
+    )
+    parser.add_argument(
+        "--date-formats",
+        default=",".join(defaults.date_formats),
+        help="Formats strftime séparés par des virgules.",
+    )
+    parser.add_argument(
+        "--invalid-ratio", type=float, default=defaults.invalid_ratio
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default=defaults.output_format,
+        dest="output_format",
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def spec_from_args(args: argparse.Namespace) -> CorpusSpec:
+    """Construit le CorpusSpec correspondant aux options analysées."""
+
+    return CorpusSpec(
+        rows=args.rows,
+        tables=args.tables,
+        rows_per_page=args.rows_per_page,
+        separators=tuple(args.separators),
+        date_formats=tuple(
+            fmt for fmt in args.date_formats.split(",") if fmt
+        ),
+        invalid_ratio=args.invalid_ratio,
+        output_format=args.output_format,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,40 @@
-"""Conversion d'un tableau PDF de détenus vers CSV."""
+"""Conversion d'un tableau PDF de détenus vers CSV.
 
-from listedetenus.cli import main
-from listedetenus.models import Detainee
+Les attributs publics sont chargés à la première utilisation: importer le
+paquet pour Detainee ne charge pas la ligne de commande ni le pipeline.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+# Équivaut à typing.TYPE_CHECKING sans importer typing au démarrage.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from listedetenus.cli import main
+    from listedetenus.models import Detainee
 
 __all__ = ["main", "Detainee"]
+
+_LAZY_ATTRIBUTES: dict[str, str] = {
+    "main": "listedetenus.cli",
+    "Detainee": "listedetenus.models",
+}
+
+
+def __getattr__(name: str) -> object:
+    """Importe le module qui définit name lors du premier accès."""
+
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        message = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(message)
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Liste aussi les attributs pas encore chargés."""
+
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,158 @@
+"""API asyncio pour intégrer la conversion dans une boucle d'événements.
+
+Lecture, analyse et écriture s'exécutent dans un exécuteur: la boucle n'est
+jamais bloquée, y compris par les accès disque. Un asyncio.Semaphore
+partagé limite le nombre de documents traités simultanément, et
+l'annulation d'une tâche interrompt la conversion en cours entre deux
+tables ou deux lots.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator
+
+from listedetenus.models import Detainee, DetaineeBatch
+from listedetenus.parser import iter_detainee_batches
+from listedetenus.pdf_loader import iter_pdf_tables
+from listedetenus.workflow import convert_pdf_to_csv
+
+
+async def convert_pdf_to_csv_async(
+    pdf_path: Path,
+    csv_path: Path,
+    *,
+    executor: Executor | None = None,
+    limit: asyncio.Semaphore | None = None,
+    **options: Any,
+) -> Path:
+    """Équivalent asynchrone de convert_pdf_to_csv.
+
+    Rôle:
+        Déléguer la conversion à un exécuteur et libérer la boucle pendant
+        toute sa durée.
+    Entrées:
+        pdf_path, csv_path: comme pour convert_pdf_to_csv.
+        executor: exécuteur de la conversion; par défaut celui de la boucle
+            (threads). Avec un ProcessPoolExecutor, une conversion déjà
+            démarrée ne peut pas être interrompue.
+        limit: sémaphore partagé bornant les conversions simultanées.
+        options: options de convert_pdf_to_csv (streaming, jobs, cache...),
+            sauf cancel_event: l'annulation passe par celle de la tâche.
+    Sorties:
+        Chemin absolu du CSV écrit.
+    Erreurs:
+        Celles de convert_pdf_to_csv; TypeError si cancel_event est fourni;
+        asyncio.CancelledError si la tâche est annulée, le CSV existant
+        étant laissé intact.
+    """
+
+    if "cancel_event" in options:
+        message = "cancel_event est géré par l'API: annulez la tâche."
+        raise TypeError(message)
+
+    async with _limited(limit):
+        loop = asyncio.get_running_loop()
+        cancel_event = None
+        if not isinstance(executor, ProcessPoolExecutor):
+            cancel_event = threading.Event()
+            options["cancel_event"] = cancel_event
+        conversion = partial(convert_pdf_to_csv, pdf_path, csv_path, **options)
+        future = loop.run_in_executor(executor, conversion)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if cancel_event is not None:
+                cancel_event.set()
+            with contextlib.suppress(Exception):
+                await future
+            raise
+
+
+async def iter_detainees_async(
+    pdf_path: Path,
+    *,
+    executor: Executor | None = None,
+    limit: asyncio.Semaphore | None = None,
+) -> AsyncIterator[Detainee]:
+    """Produit les détenus d'un PDF de manière asynchrone.
+
+    Rôle:
+        Analyser le document lot par lot dans un exécuteur et restituer
+        chaque Detainee à la boucle au fil de l'eau.
+    Entrées:
+        pdf_path: chemin du fichier PDF à extraire.
+        executor: exécuteur à threads (le générateur d'analyse reste dans
+            le processus courant); par défaut celui de la boucle.
+        limit: sémaphore partagé bornant les documents lus simultanément.
+    Sorties:
+        Itérateur asynchrone de Detainee.
+    Erreurs:
+        ValueError si l'exécuteur est un pool de processus ou si aucune
+        ligne valide n'est trouvée; RuntimeError si le PDF est illisible.
+    """
+
+    if isinstance(executor, ProcessPoolExecutor):
+        message = "La lecture asynchrone exige un exécuteur à threads."
+        raise ValueError(message)
+
+    async with _limited(limit):
+        loop = asyncio.get_running_loop()
+        batches = await loop.run_in_executor(
+            executor, _BatchReader, Path(pdf_path)
+        )
+        try:
+            while True:
+                batch = await loop.run_in_executor(executor, batches.next)
+                if batch is None:
+                    break
+                for detainee in batch:
+                    yield detainee
+        finally:
+            # La fermeture attend la fin du lot en cours: elle est protégée
+            # d'une nouvelle annulation et ses erreurs sont propagées.
+            closing = loop.run_in_executor(executor, batches.close)
+            await asyncio.shield(closing)
+
+
+class _BatchReader:
+    """Générateur de lots partagé sans risque entre threads de l'exécuteur.
+
+    Après une annulation, le lot en cours peut encore être en analyse dans
+    un thread: le verrou fait attendre la fermeture jusqu'à sa fin.
+    """
+
+    def __init__(self, pdf_path: Path) -> None:
+        self._lock = threading.Lock()
+        self._batches: Iterator[DetaineeBatch] = iter_detainee_batches(
+            iter_pdf_tables(pdf_path.resolve())
+        )
+
+    def next(self) -> DetaineeBatch | None:
+        """Lot suivant, ou None en fin de document."""
+
+        with self._lock:
+            return next(self._batches, None)
+
+    def close(self) -> None:
+        """Libère le document ouvert."""
+
+        with self._lock:
+            self._batches.close()
+
+
+@contextlib.asynccontextmanager
+async def _limited(limit: asyncio.Semaphore | None) -> AsyncIterator[None]:
+    """Acquiert le sémaphore s'il est fourni."""
+
+    if limit is None:
+        yield
+        return
+    async with limit:
+        yield
+
@@ -0,0 +1,291 @@
+"""Conversion par lot de plusieurs PDF dans un pool de processus."""
+
+from __future__ import annotations
+
+import csv
+import glob
+import logging
+import shutil
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, TextIO
+
+from listedetenus.cache import ConversionCache
+from listedetenus.parser import DuplicateFilter
+from listedetenus.workflow import CSV_EXTENSION, convert_pdf_to_csv
+
+PDF_EXTENSION = ".pdf"
+GLOB_CHARACTERS = "*?["
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BatchItemResult:
+    """Résultat de la conversion d'un fichier du lot.
+
+    Attributs:
+        source: PDF traité.
+        target: CSV écrit, ou None en cas d'échec.
+        error: message d'erreur, ou None en cas de succès.
+    """
+
+    source: Path
+    target: Path | None
+    error: str | None = None
+
+    @property
+    def exit_status(self) -> int:
+        """Code de sortie du fichier: 0 en cas de succès, 1 sinon."""
+
+        return 0 if self.error is None else 1
+
+
+@dataclass(frozen=True)
+class BatchSummary:
+    """Bilan d'une conversion par lot.
+
+    Attributs:
+        items: résultats par fichier, dans l'ordre des sources.
+        merged_csv: CSV fusionné écrit, le cas échéant.
+    """
+
+    items: list[BatchItemResult]
+    merged_csv: Path | None = None
+
+    @property
+    def succeeded(self) -> int:
+        """Nombre de fichiers convertis."""
+
+        return sum(1 for item in self.items if item.error is None)
+
+    @property
+    def failed(self) -> int:
+        """Nombre de fichiers en échec."""
+
+        return len(self.items) - self.succeeded
+
+    @property
+    def exit_status(self) -> int:
+        """Code de sortie global: 0 si tous les fichiers ont réussi."""
+
+        return 0 if self.items and self.failed == 0 else 1
+
+
+def collect_pdf_sources(sources: Iterable[Path | str]) -> list[Path]:
+    """Développe dossiers et motifs glob en liste ordonnée de PDF.
+
+    Rôle:
+        Accepter indifféremment des fichiers, des dossiers (leurs PDF
+        directs) ou des motifs glob, sans doublon.
+    Entrées:
+        sources: chemins ou motifs fournis par l'utilisateur.
+    Sorties:
+        Liste des PDF trouvés, dans l'ordre des sources puis alphabétique.
+    """
+
+    collected: list[Path] = []
+    seen: set[Path] = set()
+    for source in sources:
+        for candidate in _expand_source(str(source)):
+            resolved = candidate.expanduser().resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                collected.append(resolved)
+    return collected
+
+
+def convert_batch(
+    sources: Iterable[Path | str],
+    output: Path,
+    *,
+    jobs: int = 1,
+    merge: bool = False,
+    cache: ConversionCache | None = None,
+    dedup: DuplicateFilter | None = None,
+) -> BatchSummary:
+    """Convertit plusieurs PDF, un CSV par fichier ou un CSV fusionné.
+
+    Rôle:
+        Répartir les fichiers sur un pool de processus; l'échec d'un
+        fichier est consigné dans le bilan sans interrompre les autres.
+    Entrées:
+        sources: fichiers, dossiers ou motifs glob de PDF.
+        output: dossier de sortie, ou chemin du CSV fusionné si merge.
+        jobs: nombre de fichiers convertis simultanément.
+        merge: si vrai, concatène les lignes de tous les fichiers réussis
+            dans output, dans l'ordre des sources.
+        cache: cache de conversions partagé par les processus.
+        dedup: avec merge, écarte du CSV fusionné les lignes déjà écrites,
+            y compris d'un fichier à l'autre.
+    Sorties:
+        BatchSummary avec le statut de chaque fichier.
+    Erreurs:
+        ValueError: aucune source PDF, jobs invalide, sortie incorrecte ou
+            dédoublonnage demandé sans fusion.
+    """
+
+    if jobs < 1:
+        raise ValueError("Le nombre de processus doit être au moins 1.")
+    if dedup is not None and not merge:
+        raise ValueError("Le dédoublonnage d'un lot exige la fusion.")
+    pdf_paths = collect_pdf_sources(sources)
+    if not pdf_paths:
+        raise ValueError("Aucun fichier PDF à convertir.")
+
+    output = Path(output).expanduser().resolve()
+    if not merge:
+        _ensure_output_directory(output)
+        targets = _target_paths(pdf_paths, output)
+        return BatchSummary(items=_run(pdf_paths, targets, jobs, cache))
+
+    if output.suffix.lower() != CSV_EXTENSION:
+        raise ValueError("Le CSV fusionné doit avoir l'extension .csv.")
+    with tempfile.TemporaryDirectory(prefix="listedetenus-") as tmp_dir:
+        targets = _target_paths(pdf_paths, Path(tmp_dir))
+        parts = _run(pdf_paths, targets, jobs, cache)
+        merged = _merge_csv_parts(parts, output, dedup)
+    items = [
+        BatchItemResult(
+            item.source, merged if item.target else None, item.error
+        )
+        for item in parts
+    ]
+    return BatchSummary(items=items, merged_csv=merged)
+
+
+def _expand_source(source: str) -> list[Path]:
+    """Développe une source unique."""
+
+    if any(character in source for character in GLOB_CHARACTERS):
+        matches = sorted(glob.glob(source))
+        return [Path(match) for match in matches if _is_pdf(Path(match))]
+    path = Path(source)
+    if path.is_dir():
+        return sorted(item for item in path.iterdir() if _is_pdf(item))
+    return [path]
+
+
+def _is_pdf(path: Path) -> bool:
+    """Indique si le chemin désigne un fichier .pdf."""
+
+    return path.is_file() and path.suffix.lower() == PDF_EXTENSION
+
+
+def _ensure_output_directory(output: Path) -> None:
+    """Crée le dossier de sortie du lot si nécessaire."""
+
+    if output.exists() and not output.is_dir():
+        raise ValueError("La sortie d'un lot doit être un dossier.")
+    output.mkdir(parents=True, exist_ok=True)
+
+
+def _target_paths(pdf_paths: list[Path], output_dir: Path) -> list[Path]:
+    """Associe à chaque PDF un CSV unique dans le dossier de sortie."""
+
+    targets: list[Path] = []
+    used: set[str] = set()
+    for pdf_path in pdf_paths:
+        name = pdf_path.stem
+        suffix = 2
+        while name.lower() in used:
+            name = f"{pdf_path.stem}-{suffix}"
+            suffix += 1
+        used.add(name.lower())
+        targets.append(output_dir / f"{name}{CSV_EXTENSION}")
+    return targets
+
+
+def _run(
+    pdf_paths: list[Path],
+    targets: list[Path],
+    jobs: int,
+    cache: ConversionCache | None = None,
+) -> list[BatchItemResult]:
+    """Exécute les conversions, en parallèle si jobs > 1."""
+
+    if jobs == 1 or len(pdf_paths) == 1:
+        errors = [
+            convert_file(pdf, csv, cache)
+            for pdf, csv in zip(pdf_paths, targets)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(convert_file, pdf, csv, cache)
+                for pdf, csv in zip(pdf_paths, targets)
+            ]
+            errors = [_future_error(future) for future in futures]
+
+    results = []
+    for pdf_path, target, error in zip(pdf_paths, targets, errors):
+        if error is None:
+            LOGGER.info("Converti: %s", pdf_path)
+        else:
+            LOGGER.error("Échec pour %s: %s", pdf_path, error)
+        results.append(
+            BatchItemResult(pdf_path, None if error else target, error)
+        )
+    return results
+
+
+def convert_file(
+    pdf_path: Path, csv_path: Path, cache: ConversionCache | None = None
+) -> str | None:
+    """Convertit un fichier en flux; retourne le message d'erreur éventuel.
+
+    Tâche commune aux pools de processus du mode lot, de la surveillance de
+    dossier et du service local: l'erreur est renvoyée sous forme de texte
+    pour rester transmissible d'un processus à l'autre.
+    """
+
+    try:
+        convert_pdf_to_csv(pdf_path, csv_path, streaming=True, cache=cache)
+    except Exception as error:  # noqa: BLE001
+        return str(error)
+    return None
+
+
+def _future_error(future: Future[str | None]) -> str | None:
+    """Récupère le résultat d'une tâche, y compris un processus mort."""
+
+    try:
+        return future.result()
+    except Exception as error:  # noqa: BLE001
+        return f"Processus de conversion interrompu: {error}."
+
+
+def _merge_csv_parts(
+    parts: list[BatchItemResult],
+    output: Path,
+    dedup: DuplicateFilter | None = None,
+) -> Path | None:
+    """Concatène les CSV réussis en ne gardant qu'une ligne d'en-tête."""
+
+    written = [item.target for item in parts if item.target is not None]
+    if not written:
+        return None
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8", newline="") as merged:
+        for index, part in enumerate(written):
+            with part.open("r", encoding="utf-8", newline="") as handle:
+                header = handle.readline()
+                if index == 0:
+                    merged.write(header)
+                if dedup is None:
+                    shutil.copyfileobj(handle, merged)
+                else:
+                    _copy_new_rows(handle, merged, dedup)
+    return output
+
+
+def _copy_new_rows(
+    source: TextIO, target: TextIO, dedup: DuplicateFilter
+) -> None:
+    """Recopie les lignes CSV que le filtre n'a encore jamais vues."""
+
+    writer = csv.writer(target)
+    for row in csv.reader(source):
+        if len(row) != 3 or dedup.add(*row):
+            writer.writerow(row)
@@ -0,0 +1,258 @@
+"""Cache disque des conversions, indexé par le contenu des PDF.
+
+Une entrée est identifiée par l'empreinte SHA-256 du PDF combinée à celle
+de la configuration d'analyse: toute modification des formats de date, des
+mots-clés d'entête ou des séparateurs invalide donc naturellement le cache.
+Les lignes sont stockées en CSV compressé (gzip), les dates sous forme
+d'ordinaux; une entrée illisible est supprimée et le PDF reconverti. Un
+index (taille, date de modification) évite de recalculer l'empreinte des
+fichiers déjà vus.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from listedetenus import constants, pdf_content, pdf_loader
+from listedetenus.constants import DEFAULT_CACHE_SIZE
+from listedetenus.models import DetaineeBatch
+from listedetenus.parser import BATCH_SIZE
+
+CACHE_FORMAT_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+ENTRY_SUFFIX = ".csv.gz"
+STAT_INDEX_NAME = "stat-index.json"
+LOGGER = logging.getLogger(__name__)
+
+
+class ConversionCache:
+    """Cache des lignes extraites, avec éviction LRU bornée en taille.
+
+    Rôle:
+        Retrouver les détenus d'un PDF déjà converti sans relire ni
+        analyser le document.
+    Entrées:
+        directory: dossier du cache, créé au besoin.
+        max_bytes: taille totale maximale des entrées.
+    Erreurs:
+        ValueError si le dossier est un fichier ou max_bytes négatif.
+    """
+
+    def __init__(
+        self, directory: Path, max_bytes: int = DEFAULT_CACHE_SIZE
+    ) -> None:
+        if max_bytes < 0:
+            raise ValueError("La taille du cache doit être positive.")
+        self.directory = Path(directory).expanduser().resolve()
+        if self.directory.exists() and not self.directory.is_dir():
+            raise ValueError("Le dossier de cache est un fichier.")
+        self.max_bytes = max_bytes
+
+    def key_for(self, pdf_path: Path) -> str:
+        """Calcule la clé d'un PDF (contenu et configuration).
+
+        L'empreinte du contenu est réutilisée sans relire le fichier si sa
+        taille et sa date de modification n'ont pas changé.
+        """
+
+        resolved = Path(pdf_path).resolve()
+        stat = resolved.stat()
+        signature = [stat.st_size, stat.st_mtime_ns]
+        index = self._load_stat_index()
+        known = index.get(str(resolved))
+        if known is not None and known[:2] == signature:
+            content_digest = known[2]
+        else:
+            content_digest = _file_digest(resolved)
+            self._save_stat_index(
+                {str(resolved): [*signature, content_digest]}
+            )
+        combined = f"{configuration_fingerprint()}:{content_digest}"
+        return hashlib.sha256(combined.encode("ascii")).hexdigest()
+
+    def load(self, key: str) -> Iterator[DetaineeBatch] | None:
+        """Retourne les lots d'une entrée, ou None si elle est absente.
+
+        Une entrée tronquée ou corrompue est supprimée et traitée comme
+        absente: le PDF est alors reconverti.
+        """
+
+        entry = self._entry_path(key)
+        try:
+            os.utime(entry)
+            _check_entry(entry)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, zlib.error) as error:
+            LOGGER.warning("Entrée de cache illisible supprimée: %s", error)
+            entry.unlink(missing_ok=True)
+            return None
+        LOGGER.info("Conversion trouvée dans le cache: %s", key[:12])
+        return _read_entry(entry)
+
+    def record(
+        self, key: str, batches: Iterable[DetaineeBatch]
+    ) -> Iterator[DetaineeBatch]:
+        """Relaie les lots tout en les enregistrant dans le cache.
+
+        L'entrée n'est validée qu'après consommation complète des lots et
+        si au moins une ligne a été vue; une interruption la supprime.
+        """
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+        )
+        os.close(handle)
+        row_count = 0
+        try:
+            with gzip.open(
+                temporary, "wt", encoding="utf-8", newline=""
+            ) as stream:
+                writer = csv.writer(stream)
+                for batch in batches:
+                    writer.writerows(
+                        zip(batch.noms, batch.prenoms, batch.birth_ordinals)
+                    )
+                    row_count += len(batch)
+                    yield batch
+            if row_count:
+                os.replace(temporary, self._entry_path(key))
+                self.evict()
+        finally:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+
+    def store(self, key: str, batches: Iterable[DetaineeBatch]) -> None:
+        """Enregistre des lots déjà calculés."""
+
+        for _ in self.record(key, batches):
+            pass
+
+    def evict(self) -> None:
+        """Supprime les entrées les moins récemment utilisées en excès."""
+
+        entries = []
+        for entry in self.directory.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            LOGGER.debug("Entrée de cache évincée: %s", entry.name)
+
+    def _entry_path(self, key: str) -> Path:
+        """Chemin du fichier d'une entrée."""
+
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def _load_stat_index(self) -> dict[str, list]:
+        """Lit l'index (taille, mtime, empreinte) des fichiers déjà vus."""
+
+        try:
+            with (self.directory / STAT_INDEX_NAME).open(
+                "r", encoding="utf-8"
+            ) as handle:
+                index = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    def _save_stat_index(self, updates: dict[str, list]) -> None:
+        """Ajoute des empreintes à l'index, réécrit de manière atomique.
+
+        L'index est relu juste avant l'écriture pour conserver les ajouts
+        des autres processus; les fichiers disparus en sont retirés.
+        """
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        index = self._load_stat_index()
+        index.update(updates)
+        index = {
+            path: known
+            for path, known in index.items()
+            if os.path.exists(path)
+        }
+        handle, temporary = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as stream:
+                json.dump(index, stream)
+            os.replace(temporary, self.directory / STAT_INDEX_NAME)
+        finally:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+
+
+def configuration_fingerprint() -> str:
+    """Empreinte des paramètres qui influencent le résultat de l'analyse."""
+
+    settings = {
+        "version": CACHE_FORMAT_VERSION,
+        "date_formats": constants.DATE_FORMATS,
+        "header_keywords": constants.HEADER_KEYWORDS,
+        "header_search_depth": constants.HEADER_SEARCH_DEPTH,
+        "max_row_fields": constants.MAX_ROW_FIELDS,
+        "line_separators": pdf_loader.LINE_SEPARATORS,
+        "fallback_separator": pdf_loader.FALLBACK_SEPARATOR,
+        "dialect_sample_lines": pdf_loader.DIALECT_SAMPLE_LINES,
+        "min_column_count": pdf_loader.MIN_COLUMN_COUNT,
+        "line_tolerance": pdf_content.LINE_TOLERANCE,
+        "tj_space_threshold": pdf_content.TJ_SPACE_THRESHOLD,
+    }
+    encoded = json.dumps(settings, sort_keys=True, ensure_ascii=True)
+    return hashlib.sha256(encoded.encode("ascii")).hexdigest()
+
+
+def _file_digest(path: Path) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier, lu par blocs."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _check_entry(entry: Path) -> None:
+    """Décompresse une entrée sans la garder, pour vérifier son CRC.
+
+    Erreurs:
+        OSError, EOFError ou zlib.error si l'entrée est corrompue.
+    """
+
+    with gzip.open(entry, "rb") as stream:
+        while stream.read(HASH_CHUNK_SIZE):
+            pass
+
+
+def _read_entry(entry: Path) -> Iterator[DetaineeBatch]:
+    """Relit une entrée par lots, sans la charger entièrement."""
+
+    with gzip.open(entry, "rt", encoding="utf-8", newline="") as stream:
+        batch = DetaineeBatch()
+        for nom, prenom, ordinal in csv.reader(stream):
+            batch.noms.append(nom)
+            batch.prenoms.append(prenom)
+            batch.birth_ordinals.append(int(ordinal))
+            if len(batch) >= BATCH_SIZE:
+                yield batch
+                batch = DetaineeBatch()
+        if len(batch):
+            yield batch
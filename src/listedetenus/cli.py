@@ -1,15 +1,59 @@
-"""Interface en ligne de commande pour convertir un PDF en CSV."""
+"""Interface en ligne de commande pour convertir un PDF en CSV.
+
+Le pipeline (lecture, analyse, écriture, pools de processus) n'est importé
+qu'une fois les arguments validés: --help et les erreurs d'usage répondent
+sans le charger, et chaque mode n'importe que ce qu'il utilise.
+"""
 
 from __future__ import annotations
 
 import argparse
 import logging
+import sys
+from contextlib import ExitStack
 from pathlib import Path
 
-from listedetenus.workflow import convert_pdf_to_csv
+from listedetenus.constants import DEFAULT_CACHE_SIZE, SQLITE_EXTENSIONS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from datetime import date
 
+    from listedetenus.batch import BatchSummary
+    from listedetenus.cache import ConversionCache
+    from listedetenus.delta import DeltaSummary
+    from listedetenus.parser import DuplicateFilter
+    from listedetenus.stats import ConversionStats
+
+FORMAT_CSV = "csv"
+FORMAT_SQLITE = "sqlite"
 LOG_FORMAT = "%(levelname)s | %(message)s"
 LOGGER = logging.getLogger(__name__)
+MEBIBYTE = 1024 * 1024
+
+
+def positive_int(value: str) -> int:
+    """Valide un entier strictement positif passé en argument."""
+
+    try:
+        number = int(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError("Entier attendu.") from error
+    if number < 1:
+        raise argparse.ArgumentTypeError("La valeur doit être au moins 1.")
+    return number
+
+
+def iso_date(value: str) -> date:
+    """Valide une date AAAA-MM-JJ passée en argument."""
+
+    from datetime import date
+
+    try:
+        return date.fromisoformat(value)
+    except ValueError as error:
+        message = "Date AAAA-MM-JJ attendue."
+        raise argparse.ArgumentTypeError(message) from error
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -24,12 +68,156 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "pdf",
         type=Path,
-        help="Chemin vers le PDF contenant le tableau à extraire",
+        nargs="+",
+        help=(
+            "Chemin vers le PDF contenant le tableau à extraire; avec "
+            "--batch, fichiers, dossiers ou motifs glob"
+        ),
     )
     parser.add_argument(
         "csv",
         type=Path,
-        help="Chemin du fichier CSV de sortie",
+        help=(
+            "Chemin du fichier CSV de sortie (ou de la base .sqlite/.db); "
+            "avec --batch, dossier de sortie (ou CSV fusionné avec --merge)"
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=(FORMAT_CSV, FORMAT_SQLITE),
+        help=(
+            "Format de sortie (défaut: sqlite pour une sortie .sqlite ou "
+            ".db, csv sinon)"
+        ),
+    )
+    parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help=(
+            "En SQLite, ajoute la liste aux précédentes au lieu de les "
+            "remplacer; une liste de même source et même date est remplacée"
+        ),
+    )
+    parser.add_argument(
+        "--list-date",
+        type=iso_date,
+        metavar="AAAA-MM-JJ",
+        help="En SQLite, date de la liste chargée (défaut: aujourd'hui)",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Convertit plusieurs PDF, un CSV par fichier",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Avec --batch, écrit toutes les lignes dans un seul CSV",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Traite les tables et les lignes en flux pour garder une "
+            "mémoire constante sur les très gros fichiers"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=1,
+        metavar="N",
+        help=(
+            "Nombre de processus pour analyser les pages en parallèle, "
+            "ou les fichiers avec --batch (défaut: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--since",
+        type=Path,
+        metavar="PRECEDENT.csv",
+        help=(
+            "N'écrit que les arrivées et départs par rapport à ce CSV, "
+            "avec une colonne operation"
+        ),
+    )
+    parser.add_argument(
+        "--split-delta",
+        action="store_true",
+        help=(
+            "Avec --since, écrit les arrivées et les départs dans deux "
+            "fichiers (-arrivees.csv et -departs.csv)"
+        ),
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help=(
+            "Supprime les lignes répétées (fins de page, tables recopiées); "
+            "avec --batch, exige --merge"
+        ),
+    )
+    parser.add_argument(
+        "--dedup-bloom",
+        type=positive_int,
+        metavar="LIGNES",
+        help=(
+            "Comme --dedup, avec un filtre de Bloom dimensionné pour ce "
+            "nombre de lignes distinctes: mémoire fixe, rares faux doublons"
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        metavar="DOSSIER",
+        help=(
+            "Réutilise les conversions déjà faites des PDF inchangés, "
+            "stockées dans ce dossier"
+        ),
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=positive_int,
+        default=DEFAULT_CACHE_SIZE // MEBIBYTE,
+        metavar="MO",
+        help=(
+            "Taille maximale du cache en mégaoctets "
+            f"(défaut: {DEFAULT_CACHE_SIZE // MEBIBYTE})"
+        ),
+    )
+    parser.add_argument(
+        "--index",
+        type=Path,
+        metavar="DOSSIER",
+        help=(
+            "Ajoute les CSV écrits à l'index de recherche de ce dossier "
+            "(voir python -m listedetenus.index)"
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help=(
+            "Affiche en JSON sur la sortie standard les temps par étape et "
+            "le bilan des lignes (acceptées, rejetées par motif, écrites)"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="SORTIE.pstats",
+        help=(
+            "Exécute la conversion sous cProfile, enregistre le profil et "
+            "affiche sur la sortie d'erreur les fonctions les plus coûteuses"
+        ),
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help=(
+            "Exécute la conversion sous tracemalloc et affiche sur la sortie "
+            "d'erreur le pic mémoire par étape et les sites d'allocation"
+        ),
     )
     parser.add_argument(
         "--verbose",
@@ -46,25 +234,269 @@ def configure_logging(is_verbose: bool) -> None:
     logging.basicConfig(level=level, format=LOG_FORMAT)
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     """Point d'entrée CLI.
 
-    Retourne 0 en cas de succès, 1 en cas d'erreur contrôlée.
+    Retourne 0 en cas de succès, 1 en cas d'erreur contrôlée. En mode lot,
+    retourne 1 dès qu'un fichier a échoué.
     """
 
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.merge and not args.batch:
+        parser.error("--merge exige --batch.")
+    if not args.batch and len(args.pdf) > 1:
+        parser.error("Plusieurs PDF exigent l'option --batch.")
+    if args.since is not None and args.batch:
+        parser.error("--since ne s'utilise pas avec --batch.")
+    if args.split_delta and args.since is None:
+        parser.error("--split-delta exige --since.")
+    dedup = build_dedup(args)
+    if dedup is not None and args.batch and not args.merge:
+        parser.error("--dedup en mode lot exige --merge.")
+    args.format = args.format or output_format(args.csv)
+    sqlite_only = args.upsert or args.list_date is not None
+    if sqlite_only and args.format != FORMAT_SQLITE:
+        parser.error("--upsert et --list-date exigent une sortie SQLite.")
+    if args.format == FORMAT_SQLITE and (
+        args.batch or args.since is not None
+    ):
+        parser.error(
+            "La sortie SQLite ne s'utilise ni avec --batch ni avec --since."
+        )
+    if args.index is not None and (
+        args.format == FORMAT_SQLITE or args.since is not None
+    ):
+        parser.error("--index exige une sortie CSV, sans --since.")
+    measured = args.stats or args.trace_memory or args.profile is not None
+    if measured and (args.batch or args.since is not None):
+        parser.error(
+            "--stats, --profile et --trace-memory ne s'utilisent pas avec "
+            "--batch ni --since."
+        )
     configure_logging(args.verbose)
 
+    if args.batch:
+        return run_batch(args, dedup)
+    if args.since is not None:
+        return run_delta(args, dedup)
+    return run_single(args, dedup)
+
+
+def run_single(
+    args: argparse.Namespace, dedup: DuplicateFilter | None = None
+) -> int:
+    """Convertit un PDF, avec les mesures et diagnostics demandés."""
+
+    from listedetenus.stats import ConversionStats
+
+    stats = ConversionStats() if args.stats or args.trace_memory else None
     try:
-        convert_pdf_to_csv(args.pdf, args.csv)
+        with ExitStack() as diagnostics:
+            # Le profil, fermé en premier, n'inclut pas le rapport mémoire.
+            if args.trace_memory:
+                from listedetenus.profiling import memory_traced
+
+                diagnostics.enter_context(memory_traced(stats, sys.stderr))
+            if args.profile is not None:
+                from listedetenus.profiling import profiled
+
+                diagnostics.enter_context(profiled(args.profile, sys.stderr))
+            convert_single(args, dedup, stats)
     except Exception as error:  # noqa: BLE001
         LOGGER.error("Échec: %s", error)
         return 1
 
+    log_duplicates(dedup)
+    if args.stats:
+        print_stats(stats)
     LOGGER.info("Conversion réussie: %s", args.csv)
+    return update_index(args.index, [args.csv])
+
+
+def convert_single(
+    args: argparse.Namespace,
+    dedup: DuplicateFilter | None,
+    stats: ConversionStats | None,
+) -> None:
+    """Écrit le CSV ou charge la base SQLite demandée."""
+
+    if args.format == FORMAT_SQLITE:
+        from listedetenus.workflow import convert_pdf_to_sqlite
+
+        loaded = convert_pdf_to_sqlite(
+            args.pdf[0],
+            args.csv,
+            upsert=args.upsert,
+            list_date=args.list_date,
+            jobs=args.jobs,
+            cache=build_cache(args),
+            dedup=dedup,
+            stats=stats,
+        )
+        LOGGER.info("Lignes chargées dans la base: %d.", loaded)
+        return
+
+    from listedetenus.workflow import convert_pdf_to_csv
+
+    convert_pdf_to_csv(
+        args.pdf[0],
+        args.csv,
+        streaming=args.stream,
+        jobs=args.jobs,
+        cache=build_cache(args),
+        dedup=dedup,
+        stats=stats,
+    )
+
+
+def output_format(output_path: Path) -> str:
+    """Format de sortie déduit de l'extension du fichier."""
+
+    if output_path.suffix.lower() in SQLITE_EXTENSIONS:
+        return FORMAT_SQLITE
+    return FORMAT_CSV
+
+
+def run_batch(
+    args: argparse.Namespace, dedup: DuplicateFilter | None = None
+) -> int:
+    """Exécute le mode lot et journalise le bilan par fichier."""
+
+    from listedetenus.batch import convert_batch
+
+    try:
+        summary = convert_batch(
+            args.pdf,
+            args.csv,
+            jobs=args.jobs,
+            merge=args.merge,
+            cache=build_cache(args),
+            dedup=dedup,
+        )
+    except Exception as error:  # noqa: BLE001
+        LOGGER.error("Échec: %s", error)
+        return 1
+
+    log_duplicates(dedup)
+    log_batch_summary(summary)
+    if summary.merged_csv is not None:
+        written = [summary.merged_csv]
+    else:
+        written = [item.target for item in summary.items if item.target]
+    return max(summary.exit_status, update_index(args.index, written))
+
+
+def run_delta(
+    args: argparse.Namespace, dedup: DuplicateFilter | None = None
+) -> int:
+    """Exécute le mode delta et journalise les compteurs."""
+
+    from listedetenus.workflow import convert_pdf_to_delta
+
+    try:
+        summary = convert_pdf_to_delta(
+            args.pdf[0],
+            args.since,
+            args.csv,
+            split=args.split_delta,
+            jobs=args.jobs,
+            cache=build_cache(args),
+            dedup=dedup,
+        )
+    except Exception as error:  # noqa: BLE001
+        LOGGER.error("Échec: %s", error)
+        return 1
+
+    log_duplicates(dedup)
+    log_delta_summary(summary)
+    return 0
+
+
+def update_index(index_dir: Path | None, csv_paths: list[Path]) -> int:
+    """Ajoute les CSV écrits à l'index demandé; 1 en cas d'échec."""
+
+    if index_dir is None or not csv_paths:
+        return 0
+    from listedetenus.index import SearchIndex
+
+    try:
+        index = SearchIndex(index_dir)
+        for csv_path in csv_paths:
+            count = index.add_csv(csv_path)
+            LOGGER.info("Indexé: %s (%d lignes)", csv_path, count)
+    except (ValueError, RuntimeError) as error:
+        LOGGER.error("Échec de l'indexation: %s", error)
+        return 1
     return 0
 
 
+def log_delta_summary(summary: DeltaSummary) -> None:
+    """Affiche les compteurs du delta et les fichiers écrits."""
+
+    LOGGER.info(
+        "Delta: %d arrivée(s), %d départ(s), %d ligne(s) inchangée(s).",
+        summary.arrivals,
+        summary.departures,
+        summary.unchanged,
+    )
+    for output in summary.outputs:
+        LOGGER.info("Écrit: %s", output)
+
+
+def build_cache(args: argparse.Namespace) -> ConversionCache | None:
+    """Construit le cache de conversions demandé, le cas échéant."""
+
+    if args.cache_dir is None:
+        return None
+    from listedetenus.cache import ConversionCache
+
+    return ConversionCache(args.cache_dir, args.cache_size * MEBIBYTE)
+
+
+def build_dedup(args: argparse.Namespace) -> DuplicateFilter | None:
+    """Construit le filtre de doublons demandé, le cas échéant."""
+
+    if args.dedup_bloom is None and not args.dedup:
+        return None
+    from listedetenus.parser import DuplicateFilter
+
+    if args.dedup_bloom is not None:
+        return DuplicateFilter(bloom_capacity=args.dedup_bloom)
+    return DuplicateFilter()
+
+
+def log_duplicates(dedup: DuplicateFilter | None) -> None:
+    """Indique le nombre de lignes répétées écartées."""
+
+    if dedup is not None:
+        LOGGER.info("Doublons supprimés: %d.", dedup.dropped)
+
+
+def print_stats(stats: ConversionStats | None) -> None:
+    """Écrit les mesures de la conversion en JSON sur la sortie standard."""
+
+    if stats is not None:
+        import json
+
+        json.dump(stats.as_dict(), sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+
+
+def log_batch_summary(summary: BatchSummary) -> None:
+    """Affiche le statut de chaque fichier puis le bilan global."""
+
+    for item in summary.items:
+        status = "OK" if item.error is None else "ÉCHEC"
+        LOGGER.info("[%s] %d %s", status, item.exit_status, item.source)
+    if summary.merged_csv is not None:
+        LOGGER.info("CSV fusionné: %s", summary.merged_csv)
+    LOGGER.info(
+        "Lot terminé: %d réussi(s), %d échec(s).",
+        summary.succeeded,
+        summary.failed,
+    )
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
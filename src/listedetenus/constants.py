@@ -12,12 +12,25 @@ DATE_FORMATS: list[str] = [
     "%d/%m/%y",
 ]
 
+DATE_CACHE_SIZE: int = 4096
+
 CSV_HEADERS: list[str] = ["nom", "prenom", "date_naissance"]
 
+OPERATION_HEADER: str = "operation"
+ARRIVAL: str = "arrivee"
+DEPARTURE: str = "depart"
+
 HEADER_KEYWORDS: dict[str, list[str]] = {
     "nom": ["nom"],
     "prenom": ["prénom", "prenom"],
     "date_naissance": ["naissance", "date de naissance", "date"],
 }
 
+HEADER_SEARCH_DEPTH: int = 20
+HEADER_CACHE_SIZE: int = 1024
+
 MAX_ROW_FIELDS: int = 30
+
+DEFAULT_CACHE_SIZE: int = 256 * 1024 * 1024
+
+SQLITE_EXTENSIONS: tuple[str, ...] = (".sqlite", ".db")
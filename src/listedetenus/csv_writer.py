@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import csv
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable, Iterator
 
-from listedetenus.constants import CSV_HEADERS
-from listedetenus.models import Detainee
+from listedetenus.constants import ARRIVAL, CSV_HEADERS, OPERATION_HEADER
+from listedetenus.models import Change, Detainee, DetaineeBatch
+from listedetenus.stats import STAGE_WRITE, ConversionStats
 
 
 def write_csv(output_path: Path, detainees: Iterable[Detainee]) -> None:
@@ -17,12 +19,127 @@ def write_csv(output_path: Path, detainees: Iterable[Detainee]) -> None:
         Créer le fichier CSV et y déposer chaque détenu sur une ligne.
     Entrées:
         output_path: chemin du fichier CSV à créer.
-        detainees: séquence de Detainee.
+        detainees: itérable de Detainee, consommé au fil de l'écriture.
     Sorties:
         Aucun retour. Le fichier est créé ou écrasé.
     Erreurs:
         ValueError si le chemin est invalide.
-        RuntimeError en cas d'échec d'écriture.
+        RuntimeError en cas d'échec d'écriture. Les erreurs levées par
+        l'itérable lui-même sont propagées telles quelles.
+    """
+
+    rows = (
+        (detainee.nom, detainee.prenom, detainee.date_naissance)
+        for detainee in detainees
+    )
+    _write_rows(output_path, [rows])
+
+
+def write_csv_batches(
+    output_path: Path,
+    batches: Iterable[DetaineeBatch],
+    stats: ConversionStats | None = None,
+) -> None:
+    """Écrit des lots de détenus stockés en colonnes dans un fichier CSV.
+
+    Rôle:
+        Équivalent de write_csv pour les DetaineeBatch: les lignes sont lues
+        directement dans les colonnes, sans créer d'objet Detainee.
+    Entrées:
+        output_path: chemin du fichier CSV à créer.
+        batches: itérable de DetaineeBatch, consommé au fil de l'écriture.
+        stats: mesures complétées du temps d'écriture et du nombre de
+            lignes écrites.
+    Sorties:
+        Aucun retour. Le fichier est créé ou écrasé.
+    Erreurs:
+        Identiques à write_csv.
+    """
+
+    if stats is None:
+        _write_rows(output_path, (batch.iter_rows() for batch in batches))
+    else:
+        _write_rows(output_path, _iter_counted_rows(batches, stats), stats)
+
+
+def write_delta_csv(output_path: Path, changes: Iterable[Change]) -> None:
+    """Écrit arrivées et départs dans un CSV avec une colonne operation.
+
+    Rôle:
+        Produire un fichier delta unique, la première colonne valant
+        "arrivee" ou "depart".
+    Entrées:
+        output_path: chemin du fichier CSV à créer.
+        changes: couples (opération, ligne), consommés au fil de l'écriture.
+    Erreurs:
+        Identiques à write_csv.
+    """
+
+    rows = ((operation, *row) for operation, row in changes)
+    _write_rows(
+        output_path, [rows], headers=[OPERATION_HEADER, *CSV_HEADERS]
+    )
+
+
+def write_split_delta_csv(
+    arrivals_path: Path, departures_path: Path, changes: Iterable[Change]
+) -> None:
+    """Écrit arrivées et départs dans deux CSV au format standard.
+
+    Rôle:
+        Variante de write_delta_csv pour les imports qui attendent un
+        fichier par opération; les deux fichiers sont remplis en un seul
+        parcours des changements.
+    Erreurs:
+        Identiques à write_csv.
+    """
+
+    if arrivals_path is None or departures_path is None:
+        raise ValueError("Le chemin de sortie ne peut pas être nul.")
+
+    try:
+        with ExitStack() as stack:
+            arrivals = _open_writer(stack, arrivals_path)
+            departures = _open_writer(stack, departures_path)
+            for operation, row in changes:
+                target = arrivals if operation == ARRIVAL else departures
+                target.writerow(row)
+    except (OSError, csv.Error) as error:
+        message = f"Impossible d'écrire le CSV: {error}."
+        raise RuntimeError(message) from error
+
+
+def _open_writer(stack: ExitStack, output_path: Path) -> Any:
+    """Ouvre un CSV dans la pile de contextes et écrit son entête."""
+
+    handle = stack.enter_context(
+        output_path.open("w", encoding="utf-8", newline="")
+    )
+    writer = csv.writer(handle)
+    writer.writerow(CSV_HEADERS)
+    return writer
+
+
+def _iter_counted_rows(
+    batches: Iterable[DetaineeBatch], stats: ConversionStats
+) -> Iterator[Iterable[tuple[str, ...]]]:
+    """Lignes de chaque lot, comptées dans stats."""
+
+    for batch in batches:
+        stats.rows_written += len(batch)
+        yield batch.iter_rows()
+
+
+def _write_rows(
+    output_path: Path,
+    row_groups: Iterable[Iterable[tuple[str, ...]]],
+    stats: ConversionStats | None = None,
+    headers: list[str] = CSV_HEADERS,
+) -> None:
+    """Écrit l'entête puis chaque groupe de lignes.
+
+    Avec stats, seul le temps d'écriture est mesuré, pas celui passé à
+    produire les groupes en amont.
     """
 
     if output_path is None:
@@ -30,16 +147,14 @@ def write_csv(output_path: Path, detainees: Iterable[Detainee]) -> None:
 
     try:
         with output_path.open("w", encoding="utf-8", newline="") as handle:
-            writer = csv.DictWriter(handle, fieldnames=CSV_HEADERS)
-            writer.writeheader()
-            for detainee in detainees:
-                writer.writerow(
-                    {
-                        "nom": detainee.nom,
-                        "prenom": detainee.prenom,
-                        "date_naissance": detainee.date_naissance,
-                    }
-                )
-    except Exception as error:  # noqa: BLE001
+            writer = csv.writer(handle)
+            writer.writerow(headers)
+            for rows in row_groups:
+                if stats is None:
+                    writer.writerows(rows)
+                else:
+                    with stats.timer(STAGE_WRITE):
+                        writer.writerows(rows)
+    except (OSError, csv.Error) as error:
         message = f"Impossible d'écrire le CSV: {error}."
         raise RuntimeError(message) from error
@@ -0,0 +1,168 @@
+"""Normalisation rapide des dates de naissance.
+
+Les formats de constants.DATE_FORMATS sont traduits une fois en expressions
+régulières équivalentes à celles de datetime.strptime; la validité du jour
+est ensuite vérifiée par calcul, sans passer par des exceptions. Les
+résultats sont mémorisés dans un cache borné, car les mêmes dates reviennent
+très souvent dans une liste.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+from listedetenus.constants import DATE_CACHE_SIZE, DATE_FORMATS
+
+_DIRECTIVES: dict[str, str] = {
+    "d": r"(?P<day>3[01]|[12]\d|0[1-9]|[1-9])",
+    "m": r"(?P<month>1[0-2]|0[1-9]|[1-9])",
+    "Y": r"(?P<year>\d\d\d\d)",
+    "y": r"(?P<short_year>\d\d)",
+}
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_MISSING = object()
+
+
+class _CompiledFormat:
+    """Format de date compilé, ou conservé tel quel pour strptime."""
+
+    __slots__ = ("fmt", "pattern")
+
+    def __init__(self, fmt: str) -> None:
+        self.fmt = fmt
+        self.pattern = _compile_pattern(fmt)
+
+    def parse(self, cleaned: str) -> str | None:
+        """Retourne la date ISO si la valeur respecte ce format."""
+
+        if self.pattern is None:
+            try:
+                return datetime.strptime(cleaned, self.fmt).date().isoformat()
+            except ValueError:
+                return None
+
+        match = self.pattern.fullmatch(cleaned)
+        if match is None:
+            return None
+        groups = match.groupdict()
+        day = int(groups.get("day") or 1)
+        month = int(groups.get("month") or 1)
+        if groups.get("year") is not None:
+            year = int(groups["year"])
+        elif groups.get("short_year") is not None:
+            short_year = int(groups["short_year"])
+            year = 2000 + short_year if short_year <= 68 else 1900 + short_year
+        else:
+            year = 1900
+        if year < 1 or day > _days_in_month(year, month):
+            return None
+        return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+class _FormatSet:
+    """Formats compilés et cache partagé des valeurs déjà vues.
+
+    Le cache est partagé entre threads (analyses parallèles, API asyncio):
+    les lectures restent sans verrou, l'éviction et l'ajout se font sous
+    verrou pour que deux threads n'évincent pas la même entrée.
+    """
+
+    def __init__(self, formats: tuple[str, ...], cache_size: int) -> None:
+        self.formats = [_CompiledFormat(fmt) for fmt in formats]
+        self.cache: dict[str, str | None] = {}
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def remember(self, raw_value: str, result: str | None) -> None:
+        """Mémorise un résultat en évinçant l'entrée la plus ancienne."""
+
+        cache = self.cache
+        with self._lock:
+            if raw_value not in cache and len(cache) >= self.cache_size:
+                del cache[next(iter(cache))]
+            cache[raw_value] = result
+
+
+class BirthDateParser:
+    """Normalise les dates de naissance d'une table en ISO 8601.
+
+    Rôle:
+        Un analyseur est créé par table: le format qui a reconnu la dernière
+        date est essayé en premier pour les lignes suivantes.
+    Entrées:
+        formats: formats strptime acceptés, DATE_FORMATS par défaut.
+        cache_size: nombre maximal de valeurs mémorisées.
+    """
+
+    def __init__(
+        self,
+        formats: list[str] | None = None,
+        cache_size: int = DATE_CACHE_SIZE,
+    ) -> None:
+        selected = tuple(DATE_FORMATS if formats is None else formats)
+        self._format_set = _format_set(selected, cache_size)
+        self._order = list(range(len(self._format_set.formats)))
+
+    def parse(self, raw_value: str) -> str | None:
+        """Retourne la date ISO, ou None si aucun format ne convient."""
+
+        cache = self._format_set.cache
+        cached = cache.get(raw_value, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        cleaned = raw_value.replace(" ", "").replace(".", "/")
+        formats = self._format_set.formats
+        result = None
+        for position, format_index in enumerate(self._order):
+            result = formats[format_index].parse(cleaned)
+            if result is not None:
+                if position:
+                    self._order.insert(0, self._order.pop(position))
+                break
+        self._format_set.remember(raw_value, result)
+        return result
+
+
+@lru_cache(maxsize=8)
+def _format_set(formats: tuple[str, ...], cache_size: int) -> _FormatSet:
+    """Compile une seule fois chaque jeu de formats."""
+
+    return _FormatSet(formats, cache_size)
+
+
+def _compile_pattern(fmt: str) -> re.Pattern[str] | None:
+    """Traduit un format strptime; None si une directive est inconnue."""
+
+    parts: list[str] = []
+    seen: set[str] = set()
+    index = 0
+    while index < len(fmt):
+        character = fmt[index]
+        if character != "%":
+            parts.append(re.escape(character))
+            index += 1
+            continue
+        directive = fmt[index + 1:index + 2]
+        if directive == "%":
+            parts.append("%")
+        elif directive in _DIRECTIVES and directive not in seen:
+            seen.add(directive)
+            parts.append(_DIRECTIVES[directive])
+        else:
+            return None
+        index += 2
+    if "Y" in seen and "y" in seen:
+        return None
+    return re.compile("".join(parts), re.IGNORECASE)
+
+
+def _days_in_month(year: int, month: int) -> int:
+    """Nombre de jours du mois, années bissextiles comprises."""
+
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return _DAYS_IN_MONTH[month - 1]
@@ -0,0 +1,131 @@
+"""Comparaison d'une extraction avec la liste précédente.
+
+La liste précédente est indexée une seule fois dans un multiensemble de
+lignes; l'extraction courante est ensuite parcourue en flux contre cet
+index. Les lignes absentes de l'index sont des arrivées, celles de l'index
+jamais revues des départs. Les doublons sont comptés, si bien qu'une ligne
+présente deux fois hier et une fois aujourd'hui produit un départ.
+"""
+
+from __future__ import annotations
+
+import csv
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from listedetenus.constants import ARRIVAL, CSV_HEADERS, DEPARTURE
+from listedetenus.models import Change, DetaineeRecord
+
+ARRIVALS_SUFFIX = "-arrivees"
+DEPARTURES_SUFFIX = "-departs"
+
+
+@dataclass(frozen=True)
+class DeltaSummary:
+    """Bilan d'une comparaison avec la liste précédente.
+
+    Attributs:
+        arrivals: lignes nouvelles.
+        departures: lignes disparues.
+        unchanged: lignes présentes dans les deux listes.
+        outputs: fichiers écrits (un CSV delta, ou arrivées puis départs).
+    """
+
+    arrivals: int
+    departures: int
+    unchanged: int
+    outputs: tuple[Path, ...]
+
+
+class RowDelta:
+    """Différence en flux entre la liste précédente et des lignes neuves.
+
+    Rôle:
+        Confronter chaque ligne neuve à l'index de la liste précédente,
+        puis restituer les lignes restantes comme départs.
+    Entrées:
+        previous: multiensemble des lignes précédentes, consommé.
+    """
+
+    def __init__(self, previous: Counter[DetaineeRecord]) -> None:
+        self._previous = previous
+        self.arrivals = 0
+        self.departures = 0
+        self.unchanged = 0
+
+    def iter_changes(
+        self, rows: Iterable[DetaineeRecord]
+    ) -> Iterator[Change]:
+        """Produit les arrivées au fil des lignes, puis les départs."""
+
+        previous = self._previous
+        for row in rows:
+            remaining = previous.get(row, 0)
+            if remaining:
+                if remaining == 1:
+                    del previous[row]
+                else:
+                    previous[row] = remaining - 1
+                self.unchanged += 1
+            else:
+                self.arrivals += 1
+                yield ARRIVAL, row
+        for row in previous.elements():
+            self.departures += 1
+            yield DEPARTURE, row
+        previous.clear()
+
+
+def load_previous_rows(csv_path: Path) -> Counter[DetaineeRecord]:
+    """Indexe un CSV produit précédemment par l'outil.
+
+    Rôle:
+        Construire le multiensemble des lignes (nom, prénom, date) en une
+        seule lecture; les chaînes répétées sont partagées.
+    Entrées:
+        csv_path: CSV avec les colonnes nom, prenom, date_naissance.
+    Sorties:
+        Counter des lignes.
+    Erreurs:
+        ValueError si les colonnes attendues sont absentes.
+        RuntimeError si le fichier est illisible.
+    """
+
+    intern = sys.intern
+    rows: Counter[DetaineeRecord] = Counter()
+    try:
+        with Path(csv_path).open("r", encoding="utf-8", newline="") as handle:
+            reader = csv.reader(handle)
+            header = [cell.strip().lower() for cell in next(reader, [])]
+            if header != CSV_HEADERS:
+                message = (
+                    "Le CSV précédent doit contenir les colonnes "
+                    f"{', '.join(CSV_HEADERS)}."
+                )
+                raise ValueError(message)
+            for line in reader:
+                if len(line) != len(CSV_HEADERS):
+                    continue
+                nom, prenom, birth_date = line
+                rows[(intern(nom), intern(prenom), intern(birth_date))] += 1
+    except (OSError, csv.Error, UnicodeDecodeError) as error:
+        message = f"Impossible de lire le CSV précédent: {error}."
+        raise RuntimeError(message) from error
+    return rows
+
+
+def split_delta_paths(output_path: Path) -> tuple[Path, Path]:
+    """Chemins des CSV d'arrivées et de départs dérivés de la sortie."""
+
+    output_path = Path(output_path)
+    return (
+        output_path.with_name(
+            f"{output_path.stem}{ARRIVALS_SUFFIX}{output_path.suffix}"
+        ),
+        output_path.with_name(
+            f"{output_path.stem}{DEPARTURES_SUFFIX}{output_path.suffix}"
+        ),
+    )
@@ -1,36 +1,93 @@
-"""Interface graphique minimale sans dépendances externes."""
+"""Interface graphique minimale sans dépendances externes.
+
+Plusieurs PDF peuvent être placés dans une file puis convertis en
+parallèle dans un pool de processus. Les processus ne touchent jamais aux
+widgets: ils déposent leurs messages (début, progression) dans une file
+inter-processus, et la fin de chaque tâche y est ajoutée par le pool.
+Le thread Tk relève cette file via root.after, si bien que la fenêtre
+reste réactive pendant toute la conversion.
+"""
 
 from __future__ import annotations
 
 import logging
+import multiprocessing
+import os
+import queue
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
+from typing import Any
 
-from listedetenus.workflow import convert_pdf_to_csv
+from listedetenus.workflow import (
+    CSV_EXTENSION,
+    ConversionCancelled,
+    convert_pdf_to_csv,
+)
 
 LOG_FORMAT = "%(levelname)s | %(message)s"
 WINDOW_TITLE = "Liste des détenus - Conversion PDF vers CSV"
-WINDOW_SIZE = "520x220"
+WINDOW_SIZE = "640x460"
 PADDING = 8
+POLL_INTERVAL_MS = 100
+PROGRESS_MAXIMUM = 1000
+QUEUE_HEIGHT = 10
+MAX_JOBS = max(os.cpu_count() or 1, 1)
+
+STATUS_WAITING = "En attente"
+STATUS_RUNNING = "En cours"
+STATUS_DONE = "Terminé"
+STATUS_FAILED = "Échec"
+STATUS_CANCELLED = "Annulé"
+CANCELLED_MARKER = "\0annulé"
 
 LOGGER = logging.getLogger(__name__)
 
+_worker_messages: Any = None
+_worker_cancel: Any = None
+
+
+@dataclass
+class _QueuedFile:
+    """Fichier de la file et état de sa conversion."""
+
+    pdf_path: Path
+    status: str = STATUS_WAITING
+    fraction: float = 0.0
+    message: str = ""
+
 
 class ConversionApp:
-    """Gère l'interface Tkinter et les interactions utilisateur."""
+    """Gère l'interface Tkinter et les interactions utilisateur.
+
+    Rôle:
+        Constituer une file de PDF, les convertir en parallèle et afficher
+        l'état de chaque fichier ainsi que la progression globale.
+    Entrées:
+        root: fenêtre Tk principale.
+    """
 
     def __init__(self, root: tk.Tk) -> None:
         self.root = root
-        self.pdf_path_var = tk.StringVar()
-        self.csv_path_var = tk.StringVar()
-        self.status_var = tk.StringVar(value="Prêt à convertir.")
+        self.output_dir_var = tk.StringVar()
+        self.jobs_var = tk.IntVar(value=min(2, MAX_JOBS))
+        self.status_var = tk.StringVar(value="Ajoutez des fichiers PDF.")
+        self.progress_var = tk.DoubleVar(value=0)
+        self._files: dict[str, _QueuedFile] = {}
+        self._executor: ProcessPoolExecutor | None = None
+        self._messages: Any = None
+        self._cancel_event: Any = None
+        self._remaining = 0
+        self._finished: set[str] = set()
         self._configure_root()
         self._build_widgets()
 
     def run(self) -> None:
         """Démarre la boucle principale Tkinter."""
 
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
         self.root.mainloop()
 
     def _configure_root(self) -> None:
@@ -38,29 +95,104 @@ class ConversionApp:
 
         self.root.title(WINDOW_TITLE)
         self.root.geometry(WINDOW_SIZE)
-        self.root.resizable(False, False)
+        self.root.minsize(520, 380)
 
     def _build_widgets(self) -> None:
-        """Construit les champs et boutons de l'interface."""
+        """Construit la file, les champs et les boutons de l'interface."""
 
         frame = tk.Frame(self.root, padx=PADDING, pady=PADDING)
         frame.pack(fill=tk.BOTH, expand=True)
+        frame.columnconfigure(1, weight=1)
+        frame.rowconfigure(1, weight=1)
 
-        self._build_path_row(
-            frame, "Fichier PDF :", self.pdf_path_var, self._on_browse_pdf
+        queue_buttons = tk.Frame(frame)
+        queue_buttons.grid(row=0, column=0, columnspan=3, sticky="w")
+        self.add_button = tk.Button(
+            queue_buttons, text="Ajouter des PDF", command=self._on_add_pdfs
         )
-        self._build_path_row(
-            frame, "CSV de sortie :", self.csv_path_var, self._on_browse_csv
+        self.add_button.pack(side=tk.LEFT, padx=(0, 8))
+        self.clear_button = tk.Button(
+            queue_buttons, text="Vider la file", command=self._on_clear
         )
+        self.clear_button.pack(side=tk.LEFT)
 
-        convert_button = tk.Button(
+        self.queue_view = ttk.Treeview(
             frame,
+            columns=("status",),
+            height=QUEUE_HEIGHT,
+            selectmode="extended",
+        )
+        self.queue_view.heading("#0", text="Fichier")
+        self.queue_view.heading("status", text="Statut")
+        self.queue_view.column("status", width=160, stretch=False)
+        self.queue_view.grid(
+            row=1, column=0, columnspan=2, sticky="nsew", pady=(8, 8)
+        )
+        scrollbar = ttk.Scrollbar(
+            frame, orient=tk.VERTICAL, command=self.queue_view.yview
+        )
+        scrollbar.grid(row=1, column=2, sticky="nsw", pady=(8, 8))
+        self.queue_view.configure(yscrollcommand=scrollbar.set)
+
+        label = tk.Label(frame, text="Dossier de sortie :", anchor="w")
+        label.grid(row=2, column=0, sticky="w", pady=(0, 4))
+        entry = tk.Entry(frame, textvariable=self.output_dir_var)
+        entry.grid(row=2, column=1, sticky="we", padx=(8, 8), pady=(0, 4))
+        browse = tk.Button(
+            frame, text="Parcourir", command=self._on_browse_output
+        )
+        browse.grid(row=2, column=2, pady=(0, 4))
+        hint = tk.Label(
+            frame,
+            text="Vide: chaque CSV est écrit à côté de son PDF.",
+            anchor="w",
+            fg="gray30",
+        )
+        hint.grid(row=3, column=1, sticky="w", padx=(8, 8))
+
+        jobs_label = tk.Label(frame, text="Conversions parallèles :")
+        jobs_label.grid(row=4, column=0, sticky="w", pady=(8, 0))
+        self.jobs_spinbox = ttk.Spinbox(
+            frame,
+            from_=1,
+            to=MAX_JOBS,
+            textvariable=self.jobs_var,
+            width=4,
+            state="readonly",
+        )
+        self.jobs_spinbox.grid(
+            row=4, column=1, sticky="w", padx=(8, 8), pady=(8, 0)
+        )
+
+        buttons = tk.Frame(frame)
+        buttons.grid(row=5, column=0, columnspan=3, pady=(12, 0))
+        self.convert_button = tk.Button(
+            buttons,
             text="Convertir",
             command=self._on_convert,
             padx=12,
             pady=6,
         )
-        convert_button.grid(row=2, column=0, columnspan=3, pady=(12, 0))
+        self.convert_button.pack(side=tk.LEFT, padx=(0, 8))
+        self.cancel_button = tk.Button(
+            buttons,
+            text="Annuler",
+            command=self._on_cancel,
+            padx=12,
+            pady=6,
+            state=tk.DISABLED,
+        )
+        self.cancel_button.pack(side=tk.LEFT)
+
+        self.progress_bar = ttk.Progressbar(
+            frame,
+            variable=self.progress_var,
+            maximum=PROGRESS_MAXIMUM,
+            mode="determinate",
+        )
+        self.progress_bar.grid(
+            row=6, column=0, columnspan=3, sticky="we", pady=(12, 0)
+        )
 
         status_label = tk.Label(
             frame,
@@ -69,84 +201,248 @@ class ConversionApp:
             fg="gray30",
         )
         status_label.grid(
-            row=3,
+            row=7,
             column=0,
             columnspan=3,
             sticky="we",
             pady=(12, 0),
         )
 
-    def _build_path_row(
-        self,
-        frame: tk.Frame,
-        label_text: str,
-        path_var: tk.StringVar,
-        browse_callback: tk.Callable[[], None],
-    ) -> None:
-        """Crée une ligne avec libellé, champ et bouton Parcourir."""
-
-        row_index = frame.grid_size()[1]
-        label = tk.Label(frame, text=label_text, anchor="w")
-        label.grid(row=row_index, column=0, sticky="w", pady=(0, 4))
-
-        entry = tk.Entry(frame, textvariable=path_var, width=48)
-        entry.grid(row=row_index, column=1, padx=(8, 8), pady=(0, 4))
-
-        button = tk.Button(frame, text="Parcourir", command=browse_callback)
-        button.grid(row=row_index, column=2, pady=(0, 4))
-
-    def _on_browse_pdf(self) -> None:
-        """Demande à l'utilisateur de choisir un PDF."""
-
-        selected = filedialog.askopenfilename(filetypes=[("PDF", "*.pdf")])
-        if selected:
-            self.pdf_path_var.set(selected)
+    def _on_add_pdfs(self) -> None:
+        """Ajoute à la file les PDF choisis (sélection multiple)."""
+
+        selected = filedialog.askopenfilenames(filetypes=[("PDF", "*.pdf")])
+        known = {item.pdf_path for item in self._files.values()}
+        for value in selected:
+            pdf_path = Path(value).expanduser().resolve()
+            if pdf_path in known:
+                continue
+            known.add(pdf_path)
+            item_id = self.queue_view.insert(
+                "", tk.END, text=pdf_path.name, values=(STATUS_WAITING,)
+            )
+            self._files[item_id] = _QueuedFile(pdf_path)
+        self._set_status(f"{len(self._files)} fichier(s) dans la file.")
+
+    def _on_clear(self) -> None:
+        """Vide la file (hors conversion en cours)."""
+
+        if self._executor is not None:
+            return
+        self.queue_view.delete(*self._files)
+        self._files.clear()
+        self.progress_var.set(0)
+        self._set_status("File vide.")
 
-    def _on_browse_csv(self) -> None:
-        """Demande à l'utilisateur de choisir un CSV de sortie."""
+    def _on_browse_output(self) -> None:
+        """Demande à l'utilisateur de choisir le dossier des CSV."""
 
-        selected = filedialog.asksaveasfilename(
-            defaultextension=".csv", filetypes=[("CSV", "*.csv")]
-        )
+        selected = filedialog.askdirectory(mustexist=True)
         if selected:
-            self.csv_path_var.set(selected)
+            self.output_dir_var.set(selected)
 
     def _on_convert(self) -> None:
-        """Lance la conversion et affiche le résultat."""
+        """Soumet au pool les fichiers de la file encore à convertir."""
 
-        pdf_value = self.pdf_path_var.get().strip()
-        csv_value = self.csv_path_var.get().strip()
-        if not self._paths_provided(pdf_value, csv_value):
+        if self._executor is not None:
             return
-
-        pdf_path = Path(pdf_value).expanduser()
-        csv_path = Path(csv_value).expanduser()
-
-        self._set_status("Conversion en cours...")
-        try:
-            result_path = convert_pdf_to_csv(pdf_path, csv_path)
-        except Exception as error:  # noqa: BLE001
-            LOGGER.error("Échec GUI: %s", error)
-            self._show_error(str(error))
-            self._set_status("Échec de la conversion.")
+        pending = [
+            item_id
+            for item_id, item in self._files.items()
+            if item.status != STATUS_DONE
+        ]
+        if not pending:
+            self._show_error("Veuillez ajouter des fichiers PDF.")
+            return
+        output_dir = self._output_dir()
+        if output_dir is False:
             return
 
-        messagebox.showinfo(
-            "Succès",
-            f"Fichier CSV généré :\n{result_path.as_posix()}",
+        context = multiprocessing.get_context()
+        self._messages = context.Queue()
+        self._cancel_event = context.Event()
+        self._executor = ProcessPoolExecutor(
+            max_workers=min(self._jobs(), len(pending)),
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._messages, self._cancel_event),
         )
-        self._set_status("Conversion terminée.")
+        self._remaining = len(pending)
+        self._finished = set()
+        for item_id in pending:
+            item = self._files[item_id]
+            self._update_item(item_id, STATUS_WAITING, 0.0)
+            target_dir = output_dir or item.pdf_path.parent
+            csv_path = target_dir / f"{item.pdf_path.stem}{CSV_EXTENSION}"
+            future = self._executor.submit(
+                _convert_file, item_id, item.pdf_path, csv_path
+            )
+            future.add_done_callback(self._on_task_done(item_id))
+        self._set_running(True)
+        self._set_status(f"Conversion de {len(pending)} fichier(s)...")
+        self.root.after(POLL_INTERVAL_MS, self._poll_messages)
+
+    def _on_task_done(self, item_id: str) -> Any:
+        """Rappel de fin de tâche (thread du pool, sans accès aux widgets)."""
+
+        messages = self._messages
+
+        def callback(future: Future[str | None]) -> None:
+            if future.cancelled():
+                error: str | None = CANCELLED_MARKER
+            else:
+                try:
+                    error = future.result()
+                except Exception as exception:  # noqa: BLE001
+                    error = f"Processus de conversion interrompu: {exception}"
+            messages.put(("done", item_id, error))
+
+        return callback
+
+    def _on_cancel(self) -> None:
+        """Annule les fichiers en attente et interrompt ceux en cours."""
+
+        if self._executor is None:
+            return
+        self._cancel_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.cancel_button.configure(state=tk.DISABLED)
+        self._set_status("Annulation en cours...")
+
+    def _on_close(self) -> None:
+        """Annule les conversions puis ferme la fenêtre."""
+
+        self._on_cancel()
+        self.root.destroy()
+
+    def _poll_messages(self) -> None:
+        """Applique les messages des processus de travail (thread Tk)."""
+
+        while True:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            self._apply_message(message)
+        self._show_progress()
+        if self._remaining:
+            self.root.after(POLL_INTERVAL_MS, self._poll_messages)
+        else:
+            self._finish()
+
+    def _apply_message(self, message: tuple) -> None:
+        """Applique un message de début, d'avancement ou de fin.
+
+        « done » est émis par le rappel du futur, dans ce processus, alors
+        que « start » et « progress » transitent par le thread d'envoi de
+        la file du processus de travail: rien ne les ordonne. Les messages
+        d'un fichier déjà terminé sont donc ignorés.
+        """
+
+        kind, item_id = message[0], message[1]
+        if kind == "done":
+            self._finished.add(item_id)
+            self._finish_item(item_id, message[2])
+        elif item_id in self._finished:
+            return
+        elif kind == "start":
+            self._update_item(item_id, STATUS_RUNNING, 0.0)
+        else:
+            done, total = message[2], message[3]
+            if total > 0:
+                fraction = min(done, total) / total
+                self._update_item(item_id, STATUS_RUNNING, fraction)
+
+    def _finish_item(self, item_id: str, error: str | None) -> None:
+        """Enregistre l'issue de la conversion d'un fichier."""
+
+        self._remaining -= 1
+        if error is None:
+            self._update_item(item_id, STATUS_DONE, 1.0)
+        elif error == CANCELLED_MARKER:
+            self._update_item(item_id, STATUS_CANCELLED, 0.0)
+        else:
+            self._files[item_id].message = error
+            self._update_item(item_id, STATUS_FAILED, 0.0)
+
+    def _update_item(self, item_id: str, status: str, fraction: float) -> None:
+        """Met à jour l'état d'un fichier et sa ligne dans la file."""
+
+        item = self._files[item_id]
+        item.status = status
+        item.fraction = fraction
+        label = status
+        if status == STATUS_RUNNING and fraction:
+            label = f"{status} ({fraction:.0%})"
+        elif status == STATUS_FAILED and item.message:
+            label = f"{status}: {item.message}"
+        self.queue_view.set(item_id, "status", label)
+
+    def _show_progress(self) -> None:
+        """Affiche la progression globale de la file."""
+
+        if not self._files:
+            return
+        total = sum(
+            1.0 if item.status == STATUS_DONE else item.fraction
+            for item in self._files.values()
+        )
+        self.progress_var.set(PROGRESS_MAXIMUM * total / len(self._files))
+
+    def _finish(self) -> None:
+        """Libère le pool et affiche le bilan de la file."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._set_running(False)
+        statuses = [item.status for item in self._files.values()]
+        failed = statuses.count(STATUS_FAILED)
+        cancelled = statuses.count(STATUS_CANCELLED)
+        summary = (
+            f"{statuses.count(STATUS_DONE)} converti(s), "
+            f"{failed} échec(s), {cancelled} annulé(s)."
+        )
+        self._set_status(summary)
+        if failed:
+            self._show_error(
+                f"Certains fichiers n'ont pas été convertis.\n{summary}"
+            )
+
+    def _output_dir(self) -> Path | None | bool:
+        """Dossier de sortie choisi, None (à côté du PDF) ou False."""
+
+        value = self.output_dir_var.get().strip()
+        if not value:
+            return None
+        output_dir = Path(value).expanduser()
+        if not output_dir.is_dir():
+            self._show_error("Le dossier de sortie est introuvable.")
+            return False
+        return output_dir.resolve()
 
-    def _paths_provided(self, pdf_value: str, csv_value: str) -> bool:
-        """Vérifie que les champs PDF et CSV sont remplis."""
+    def _jobs(self) -> int:
+        """Nombre de conversions parallèles demandé, borné."""
 
-        if not pdf_value:
-            self._show_error("Veuillez sélectionner un fichier PDF.")
-            return False
-        if not csv_value:
-            self._show_error("Veuillez sélectionner un fichier CSV.")
-            return False
-        return True
+        try:
+            jobs = int(self.jobs_var.get())
+        except (tk.TclError, ValueError):
+            jobs = 1
+        return min(max(jobs, 1), MAX_JOBS)
+
+    def _set_running(self, running: bool) -> None:
+        """Active ou désactive les commandes selon l'état de la file."""
+
+        idle_state = tk.DISABLED if running else tk.NORMAL
+        buttons = (self.convert_button, self.add_button, self.clear_button)
+        for button in buttons:
+            button.configure(state=idle_state)
+        self.cancel_button.configure(
+            state=tk.NORMAL if running else tk.DISABLED
+        )
+        self.jobs_spinbox.configure(
+            state=tk.DISABLED if running else "readonly"
+        )
 
     def _show_error(self, message: str) -> None:
         """Affiche une boîte de dialogue d'erreur."""
@@ -168,5 +464,37 @@ def main() -> None:
     app.run()
 
 
+def _init_worker(messages: Any, cancel_event: Any) -> None:
+    """Conserve la file de messages et l'annulation (processus fils)."""
+
+    global _worker_messages, _worker_cancel
+    _worker_messages = messages
+    _worker_cancel = cancel_event
+
+
+def _convert_file(item_id: str, pdf_path: Path, csv_path: Path) -> str | None:
+    """Convertit un fichier (processus fils); retourne l'erreur éventuelle."""
+
+    messages = _worker_messages
+    messages.put(("start", item_id))
+
+    def report(done: int, total: int) -> None:
+        messages.put(("progress", item_id, done, total))
+
+    try:
+        convert_pdf_to_csv(
+            pdf_path,
+            csv_path,
+            streaming=True,
+            cancel_event=_worker_cancel,
+            progress=report,
+        )
+    except ConversionCancelled:
+        return CANCELLED_MARKER
+    except Exception as error:  # noqa: BLE001
+        return str(error)
+    return None
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,531 @@
+"""Index de recherche persistant sur les listes converties.
+
+L'index est un dossier de segments triés. Chaque segment associe un
+fichier d'enregistrements (une ligne par détenu, clé de recherche en tête)
+et un tableau d'entiers 64 bits donnant la position de chaque
+enregistrement, dans l'ordre des clés. Les deux fichiers sont projetés en
+mémoire (mmap) et une recherche n'est qu'une paire de bisections par
+segment: seules les pages touchées sont lues, quelle que soit la taille
+de l'index.
+
+La clé est formée du nom et du prénom normalisés (sans accents, en
+majuscules) puis de l'ordinal de la date de naissance, ce qui permet les
+recherches exactes ou par préfixe. Chaque ajout de liste écrit de nouveaux
+segments; au-delà de MAX_SEGMENTS, ils sont fusionnés en flux en un seul.
+Un manifeste JSON, remplacé de manière atomique, recense les segments et
+les listes indexées; réindexer une liste retire l'ancienne version.
+
+Usage:
+    python -m listedetenus.index add index/ sortie/*.csv
+    python -m listedetenus.index search index/ lefevre --prenom chloe
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import heapq
+import json
+import logging
+import mmap
+import os
+import sys
+import tempfile
+import unicodedata
+from array import array
+from bisect import bisect_left
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from listedetenus.constants import CSV_HEADERS
+from listedetenus.models import Detainee
+
+INDEX_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+RECORDS_SUFFIX = ".keys"
+OFFSETS_SUFFIX = ".offsets"
+SEGMENT_ROWS = 500_000
+MAX_SEGMENTS = 8
+NAME_CACHE_SIZE = 65536
+LOG_FORMAT = "%(levelname)s | %(message)s"
+LOGGER = logging.getLogger(__name__)
+
+_SEPARATOR = b"\x1f"
+_RECORD_END = b"\n"
+# Aucun octet UTF-8 ne vaut 0xFF: borne supérieure de tout préfixe.
+_AFTER_PREFIX = b"\xff"
+_ORDINAL_WIDTH = 7
+
+
+@dataclass(frozen=True)
+class IndexMatch:
+    """Ligne retrouvée dans l'index.
+
+    Attributs:
+        nom, prenom, date_naissance: tels qu'écrits dans la liste.
+        source: liste (CSV) qui contient la ligne.
+    """
+
+    nom: str
+    prenom: str
+    date_naissance: str
+    source: str
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize_name(value: str) -> str:
+    """Forme de recherche d'un nom: sans accents, en majuscules.
+
+    Les espaces (et caractères de contrôle) successifs sont réduits à un
+    seul espace, si bien qu'un nom normalisé ne contient jamais le
+    séparateur de champs de l'index.
+    """
+
+    decomposed = unicodedata.normalize("NFKD", value)
+    folded = "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+    return " ".join(folded.upper().split())
+
+
+class SearchIndex:
+    """Index de recherche par nom, prénom et date de naissance.
+
+    Rôle:
+        Ajouter des listes converties puis y retrouver des personnes sans
+        charger l'index en mémoire.
+    Entrées:
+        directory: dossier de l'index, créé au premier ajout.
+    Erreurs:
+        ValueError si le dossier est un fichier ou si le manifeste provient
+        d'une version inconnue.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        if self.directory.exists() and not self.directory.is_dir():
+            raise ValueError("Le dossier d'index est un fichier.")
+        self._manifest = self._load_manifest()
+
+    @property
+    def sources(self) -> list[str]:
+        """Listes actuellement indexées."""
+
+        return [
+            source["path"]
+            for source in self._manifest["sources"]
+            if not source["retired"]
+        ]
+
+    def add(self, source: str, detainees: Iterable[Detainee]) -> int:
+        """Indexe les détenus d'une liste.
+
+        Rôle:
+            Écrire de nouveaux segments pour la liste source; si elle était
+            déjà indexée, l'ancienne version est retirée.
+        Entrées:
+            source: identifiant de la liste (chemin du CSV en général).
+            detainees: lignes de la liste, dates au format ISO.
+        Sorties:
+            Nombre de lignes indexées.
+        Erreurs:
+            ValueError si une date n'est pas au format ISO.
+            RuntimeError si l'index ne peut pas être écrit.
+        """
+
+        rows = (
+            (detainee.nom, detainee.prenom, detainee.date_naissance)
+            for detainee in detainees
+        )
+        return self._add_rows(source, rows)
+
+    def add_csv(self, csv_path: Path) -> int:
+        """Indexe un CSV produit par la conversion.
+
+        Erreurs:
+            ValueError si le fichier n'a pas les colonnes nom, prenom,
+            date_naissance ou contient une date invalide.
+            RuntimeError si le CSV ou l'index ne peuvent être lus ou écrits.
+        """
+
+        resolved = Path(csv_path).expanduser().resolve()
+        try:
+            with resolved.open("r", encoding="utf-8", newline="") as handle:
+                reader = csv.reader(handle)
+                if next(reader, None) != CSV_HEADERS:
+                    message = f"Colonnes inattendues dans {resolved.name}."
+                    raise ValueError(message)
+                return self._add_rows(str(resolved), reader)
+        except (OSError, csv.Error) as error:
+            message = f"Impossible de lire le CSV: {error}."
+            raise RuntimeError(message) from error
+
+    def search(
+        self,
+        nom: str,
+        prenom: str | None = None,
+        date_naissance: str | None = None,
+        *,
+        prefix: bool = False,
+        limit: int | None = None,
+    ) -> list[IndexMatch]:
+        """Recherche des personnes par nom, accents et casse ignorés.
+
+        Rôle:
+            Délimiter par bisection, dans chaque segment, la plage des clés
+            commençant par la clé recherchée.
+        Entrées:
+            nom: nom recherché.
+            prenom: prénom recherché, facultatif.
+            date_naissance: date ISO AAAA-MM-JJ, facultative.
+            prefix: si vrai, le dernier nom donné (prénom, ou nom à défaut)
+                est un préfixe: « dup » trouve DUPONT et DUPUIS.
+            limit: nombre maximal de résultats.
+        Sorties:
+            Lignes trouvées, triées par nom, prénom, date puis liste.
+        Erreurs:
+            ValueError si la date n'est pas au format ISO.
+        """
+
+        ordinal = None
+        if date_naissance is not None:
+            ordinal = date.fromisoformat(date_naissance).toordinal()
+        key = _search_key(nom, prenom, ordinal, prefix)
+        retired = self._retired_ids()
+        sources = {
+            source["id"]: source["path"]
+            for source in self._manifest["sources"]
+        }
+        matches = []
+        with ExitStack() as stack:
+            for name in self._manifest["segments"]:
+                segment = stack.enter_context(_Segment(self._path(name)))
+                for record in segment.iter_prefix(key):
+                    fields = record[:-1].split(_SEPARATOR)
+                    source_id = int(fields[3])
+                    if source_id in retired:
+                        continue
+                    if ordinal is not None and int(fields[2]) != ordinal:
+                        continue
+                    matches.append((fields, sources[source_id]))
+        matches.sort(key=lambda match: (match[0][:3], match[1]))
+        return [
+            IndexMatch(
+                nom=fields[4].decode("utf-8"),
+                prenom=fields[5].decode("utf-8"),
+                date_naissance=date.fromordinal(int(fields[2])).isoformat(),
+                source=source,
+            )
+            for fields, source in islice(matches, limit)
+        ]
+
+    def compact(self) -> None:
+        """Fusionne tous les segments en un seul, listes retirées exclues.
+
+        La fusion est faite en flux: la mémoire utilisée ne dépend pas de
+        la taille de l'index.
+        """
+
+        names = list(self._manifest["segments"])
+        retired = self._retired_ids()
+        if len(names) <= 1 and not retired:
+            return
+        merged: list[str] = []
+        with ExitStack() as stack:
+            segments = [
+                stack.enter_context(_Segment(self._path(name)))
+                for name in names
+            ]
+            records = heapq.merge(*(iter(segment) for segment in segments))
+            kept = (
+                record
+                for record in records
+                if int(record.split(_SEPARATOR)[3]) not in retired
+            )
+            name = self._write_segment(kept)
+            if name is not None:
+                merged.append(name)
+        self._manifest["segments"] = merged
+        self._manifest["sources"] = [
+            source
+            for source in self._manifest["sources"]
+            if not source["retired"]
+        ]
+        self._save_manifest()
+        for name in names:
+            self._remove_segment(name)
+
+    def _add_rows(
+        self, source: str, rows: Iterable[Iterable[str]]
+    ) -> int:
+        """Écrit les segments d'une liste puis met à jour le manifeste."""
+
+        for entry in self._manifest["sources"]:
+            if entry["path"] == source and not entry["retired"]:
+                entry["retired"] = True
+                LOGGER.info("Liste réindexée: %s", source)
+        source_id = self._manifest["next_source"]
+        self._manifest["next_source"] += 1
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        written: list[str] = []
+        count = 0
+        try:
+            records = _iter_records(rows, source_id)
+            while True:
+                chunk = sorted(islice(records, SEGMENT_ROWS))
+                if not chunk:
+                    break
+                count += len(chunk)
+                name = self._write_segment(chunk)
+                if name is not None:
+                    written.append(name)
+        except BaseException:
+            for name in written:
+                self._remove_segment(name)
+            self._manifest = self._load_manifest()
+            raise
+        self._manifest["sources"].append(
+            {"id": source_id, "path": source, "rows": count, "retired": False}
+        )
+        self._manifest["segments"].extend(written)
+        self._save_manifest()
+        if len(self._manifest["segments"]) > MAX_SEGMENTS:
+            self.compact()
+        return count
+
+    def _write_segment(self, records: Iterable[bytes]) -> str | None:
+        """Écrit des enregistrements déjà triés; None s'il n'y en a aucun."""
+
+        name = f"{self._manifest['next_segment']:06d}"
+        self._manifest["next_segment"] += 1
+        offsets = array("Q")
+        position = 0
+        records_path = self._path(name).with_suffix(RECORDS_SUFFIX)
+        try:
+            with records_path.open("wb") as stream:
+                for record in records:
+                    offsets.append(position)
+                    stream.write(record)
+                    position += len(record)
+            if not offsets:
+                records_path.unlink()
+                return None
+            with self._path(name).with_suffix(OFFSETS_SUFFIX).open(
+                "wb"
+            ) as stream:
+                offsets.tofile(stream)
+        except OSError as error:
+            self._remove_segment(name)
+            message = f"Impossible d'écrire l'index: {error}."
+            raise RuntimeError(message) from error
+        return name
+
+    def _remove_segment(self, name: str) -> None:
+        """Supprime les fichiers d'un segment."""
+
+        for suffix in (RECORDS_SUFFIX, OFFSETS_SUFFIX):
+            self._path(name).with_suffix(suffix).unlink(missing_ok=True)
+
+    def _retired_ids(self) -> set[int]:
+        """Identifiants des listes remplacées par une réindexation."""
+
+        return {
+            source["id"]
+            for source in self._manifest["sources"]
+            if source["retired"]
+        }
+
+    def _path(self, name: str) -> Path:
+        """Chemin d'un segment, sans suffixe."""
+
+        return self.directory / f"segment-{name}"
+
+    def _load_manifest(self) -> dict:
+        """Lit le manifeste; index vide s'il n'existe pas encore."""
+
+        path = self.directory / MANIFEST_NAME
+        if not path.exists():
+            return {
+                "version": INDEX_FORMAT_VERSION,
+                "next_segment": 1,
+                "next_source": 1,
+                "segments": [],
+                "sources": [],
+            }
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError) as error:
+            message = f"Manifeste d'index illisible: {error}."
+            raise RuntimeError(message) from error
+        if manifest.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError("Version d'index non prise en charge.")
+        return manifest
+
+    def _save_manifest(self) -> None:
+        """Réécrit le manifeste de manière atomique."""
+
+        handle, temporary = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+        )
+        with os.fdopen(handle, "w", encoding="utf-8") as stream:
+            json.dump(self._manifest, stream, indent=0, ensure_ascii=False)
+        os.replace(temporary, self.directory / MANIFEST_NAME)
+
+
+class _Segment:
+    """Segment projeté en mémoire, vu comme une séquence triée."""
+
+    def __init__(self, path: Path) -> None:
+        self._stack = ExitStack()
+        try:
+            self._records = self._map(path.with_suffix(RECORDS_SUFFIX))
+            offsets = self._map(path.with_suffix(OFFSETS_SUFFIX))
+            self._offsets = self._stack.enter_context(
+                memoryview(offsets).cast("Q")
+            )
+        except BaseException:
+            self._stack.close()
+            raise
+
+    def __enter__(self) -> _Segment:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stack.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, position: int) -> bytes:
+        start = self._offsets[position]
+        end = self._records.find(_RECORD_END, start) + 1
+        return self._records[start:end]
+
+    def __iter__(self) -> Iterator[bytes]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def iter_prefix(self, key: bytes) -> Iterator[bytes]:
+        """Enregistrements dont la clé commence par key."""
+
+        start = bisect_left(self, key)
+        end = bisect_left(self, key + _AFTER_PREFIX, start)
+        for position in range(start, end):
+            yield self[position]
+
+    def _map(self, path: Path) -> mmap.mmap:
+        """Projette un fichier en lecture seule."""
+
+        with path.open("rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._stack.enter_context(mapped)
+
+
+def _iter_records(
+    rows: Iterable[Iterable[str]], source_id: int
+) -> Iterator[bytes]:
+    """Enregistrements de l'index pour des lignes (nom, prénom, date).
+
+    Forme: NOM␟PRENOM␟ordinal␟source␟nom␟prénom, le tri des octets suivant
+    celui des clés normalisées puis de la date.
+    """
+
+    ordinals: dict[str, int] = {}
+    for nom, prenom, birth_date in rows:
+        ordinal = ordinals.get(birth_date)
+        if ordinal is None:
+            ordinal = date.fromisoformat(birth_date).toordinal()
+            ordinals[birth_date] = ordinal
+        record = "\x1f".join(
+            (
+                normalize_name(nom),
+                normalize_name(prenom),
+                f"{ordinal:0{_ORDINAL_WIDTH}d}",
+                str(source_id),
+                " ".join(nom.split()),
+                " ".join(prenom.split()),
+            )
+        )
+        yield record.encode("utf-8") + _RECORD_END
+
+
+def _search_key(
+    nom: str, prenom: str | None, ordinal: int | None, prefix: bool
+) -> bytes:
+    """Préfixe de clé correspondant aux critères de recherche."""
+
+    parts = [normalize_name(nom)]
+    if prenom is not None:
+        parts.append(normalize_name(prenom))
+        if ordinal is not None and not prefix:
+            parts.append(f"{ordinal:0{_ORDINAL_WIDTH}d}")
+    key = "\x1f".join(parts).encode("utf-8")
+    return key if prefix else key + _SEPARATOR
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Point d'entrée: ajoute des listes à l'index ou l'interroge."""
+
+    parser = argparse.ArgumentParser(
+        description="Index de recherche sur les listes converties"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_parser = commands.add_parser("add", help="Indexe des CSV convertis")
+    add_parser.add_argument("index", type=Path, help="Dossier de l'index")
+    add_parser.add_argument(
+        "csv", type=Path, nargs="+", help="CSV à indexer"
+    )
+    search_parser = commands.add_parser(
+        "search", help="Recherche une personne dans l'index"
+    )
+    search_parser.add_argument("index", type=Path, help="Dossier de l'index")
+    search_parser.add_argument("nom", help="Nom (accents et casse ignorés)")
+    search_parser.add_argument("--prenom", help="Prénom")
+    search_parser.add_argument(
+        "--date", dest="date_naissance", help="Date de naissance AAAA-MM-JJ"
+    )
+    search_parser.add_argument(
+        "--prefix",
+        action="store_true",
+        help="Le dernier nom donné est un début de nom",
+    )
+    search_parser.add_argument("--limit", type=int, help="Résultats maximum")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    try:
+        index = SearchIndex(args.index)
+        if args.command == "add":
+            for csv_path in args.csv:
+                count = index.add_csv(csv_path)
+                LOGGER.info("Indexé: %s (%d lignes)", csv_path, count)
+            return 0
+        matches = index.search(
+            args.nom,
+            args.prenom,
+            args.date_naissance,
+            prefix=args.prefix,
+            limit=args.limit,
+        )
+    except (ValueError, RuntimeError) as error:
+        LOGGER.error("Échec: %s", error)
+        return 1
+
+    writer = csv.writer(sys.stdout)
+    writer.writerow([*CSV_HEADERS, "source"])
+    for match in matches:
+        writer.writerow(
+            [match.nom, match.prenom, match.date_naissance, match.source]
+        )
+    return 0 if matches else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
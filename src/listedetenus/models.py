@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import sys
+from array import array
+from dataclasses import dataclass, field
+from datetime import date
 from pathlib import Path
+from typing import Iterable, Iterator
 
+# Ligne (nom, prénom, date ISO) et changement (opération, ligne) d'un delta.
+DetaineeRecord = tuple[str, str, str]
+Change = tuple[str, DetaineeRecord]
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Detainee:
     """Représente un détenu extrait d'un tableau PDF.
 
@@ -21,6 +29,65 @@ class Detainee:
     date_naissance: str
 
 
+@dataclass(slots=True)
+class DetaineeBatch:
+    """Lot de détenus stocké par colonnes pour limiter la mémoire.
+
+    Les noms et prénoms sont internés (un seul objet par valeur distincte)
+    et les dates de naissance sont conservées en ordinaux dans un tableau
+    d'entiers 32 bits. L'itération produit des Detainee à la demande.
+
+    Attributs:
+        noms: noms de famille, dans l'ordre d'ajout.
+        prenoms: prénoms, dans l'ordre d'ajout.
+        birth_ordinals: dates de naissance (date.toordinal()).
+    """
+
+    noms: list[str] = field(default_factory=list)
+    prenoms: list[str] = field(default_factory=list)
+    birth_ordinals: array = field(default_factory=lambda: array("i"))
+
+    @classmethod
+    def from_detainees(cls, detainees: Iterable[Detainee]) -> DetaineeBatch:
+        """Construit un lot à partir de Detainee existants."""
+
+        batch = cls()
+        for detainee in detainees:
+            batch.append(
+                detainee.nom, detainee.prenom, detainee.date_naissance
+            )
+        return batch
+
+    def append(self, nom: str, prenom: str, date_naissance: str) -> None:
+        """Ajoute une ligne; date_naissance est au format ISO."""
+
+        self.noms.append(sys.intern(nom))
+        self.prenoms.append(sys.intern(prenom))
+        self.birth_ordinals.append(
+            date.fromisoformat(date_naissance).toordinal()
+        )
+
+    def __len__(self) -> int:
+        return len(self.noms)
+
+    def __iter__(self) -> Iterator[Detainee]:
+        for nom, prenom, birth_date in self.iter_rows():
+            yield Detainee(nom=nom, prenom=prenom, date_naissance=birth_date)
+
+    def iter_rows(self) -> Iterator[tuple[str, str, str]]:
+        """Produit les lignes (nom, prénom, date ISO) sans créer d'objet."""
+
+        iso_dates: dict[int, str] = {}
+        for nom, prenom, ordinal in zip(
+            self.noms, self.prenoms, self.birth_ordinals
+        ):
+            birth_date = iso_dates.get(ordinal)
+            if birth_date is None:
+                birth_date = date.fromordinal(ordinal).isoformat()
+                iso_dates[ordinal] = birth_date
+            yield nom, prenom, birth_date
+
+
 @dataclass(frozen=True)
 class PdfExtractionResult:
     """Agrège les lignes extraites d'un PDF.
@@ -33,3 +100,21 @@ class PdfExtractionResult:
 
     source: Path
     tables: list[list[list[str]]]
+
+
+@dataclass(frozen=True)
+class PdfChunk:
+    """Portion d'un PDF analysable indépendamment des autres.
+
+    Attributs:
+        pages: plage de pages d'un vrai PDF; None pour un export textuel ou
+            un PDF sans index exploitable (lu en entier).
+        start: position du premier octet pour un export textuel.
+        stop: position qui suit le dernier octet pour un export textuel.
+        encoding: décodage retenu pour un export textuel.
+    """
+
+    pages: range | None = None
+    start: int = 0
+    stop: int = 0
+    encoding: str = "utf-8"
@@ -2,16 +2,39 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import math
+import re
+from collections import Counter
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Iterable
+from itertools import islice, starmap
+from time import perf_counter
+from typing import Iterable, Iterator
 
-from listedetenus.constants import CSV_HEADERS, DATE_FORMATS, HEADER_KEYWORDS
-from listedetenus.models import Detainee
+from listedetenus.constants import (
+    CSV_HEADERS,
+    HEADER_CACHE_SIZE,
+    HEADER_KEYWORDS,
+    HEADER_SEARCH_DEPTH,
+)
+from listedetenus.dates import BirthDateParser
+from listedetenus.models import Detainee, DetaineeBatch, DetaineeRecord
+from listedetenus.stats import (
+    REJECT_INVALID_DATE,
+    REJECT_MISSING_FIELD,
+    REJECT_SHORT_ROW,
+    STAGE_DATES,
+    STAGE_HEADERS,
+    ConversionStats,
+)
 
 LOGGER = logging.getLogger(__name__)
 
+BATCH_SIZE = 8192
+NO_ROWS_MESSAGE = "Aucune ligne exploitable après analyse des tables."
+BLOOM_ERROR_RATE = 0.0001
+
 
 @dataclass
 class ColumnMapping:
@@ -23,40 +46,324 @@ class ColumnMapping:
     header_row_index: int
 
 
-def tables_to_detainees(tables: Iterable[list[list[str]]]) -> list[Detainee]:
+class DuplicateFilter:
+    """Filtre en flux des lignes déjà vues (nom, prénom, date).
+
+    Rôle:
+        Écarter les lignes répétées d'une page ou d'une table à l'autre.
+        Chaque ligne est réduite à une empreinte BLAKE2b de 64 bits, gardée
+        dans un ensemble d'entiers Python: environ 80 octets par ligne
+        distincte (objet entier et case de l'ensemble), quelle que soit la
+        longueur des noms. Le filtre de Bloom utilise une quantité fixe de
+        bits choisie d'après bloom_capacity.
+    Entrées:
+        bloom_capacity: si fourni, nombre de lignes distinctes attendues;
+            active le filtre de Bloom, dont la mémoire ne croît pas mais
+            qui peut écarter à tort une ligne unique (avec la probabilité
+            error_rate).
+        error_rate: taux de faux positifs visé par le filtre de Bloom.
+    Attributs:
+        dropped: nombre de lignes écartées comme doublons.
+    Erreurs:
+        ValueError si la capacité ou le taux d'erreur sont invalides.
+    """
+
+    def __init__(
+        self,
+        bloom_capacity: int | None = None,
+        error_rate: float = BLOOM_ERROR_RATE,
+    ) -> None:
+        self.dropped = 0
+        self._seen: set[int] = set()
+        self._bits: bytearray | None = None
+        if bloom_capacity is None:
+            return
+        if bloom_capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("Paramètres du filtre de Bloom invalides.")
+        bit_count = math.ceil(
+            -bloom_capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self._bit_count = bit_count
+        self._hash_count = max(
+            1, round(bit_count / bloom_capacity * math.log(2))
+        )
+        self._bits = bytearray((bit_count + 7) // 8)
+
+    def add(self, nom: str, prenom: str, date_naissance: str) -> bool:
+        """Enregistre une ligne; retourne False si elle a déjà été vue."""
+
+        key = f"{nom}\x1f{prenom}\x1f{date_naissance}".encode("utf-8")
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        if self._bits is None:
+            fingerprint = int.from_bytes(digest[:8], "little")
+            is_new = fingerprint not in self._seen
+            if is_new:
+                self._seen.add(fingerprint)
+        else:
+            is_new = self._add_to_bloom(digest)
+        if not is_new:
+            self.dropped += 1
+        return is_new
+
+    def filter_records(
+        self, records: Iterable[DetaineeRecord]
+    ) -> Iterator[DetaineeRecord]:
+        """Relaie les lignes jamais vues."""
+
+        add = self.add
+        for record in records:
+            if add(*record):
+                yield record
+
+    def filter_batches(
+        self, batches: Iterable[DetaineeBatch]
+    ) -> Iterator[DetaineeBatch]:
+        """Relaie les lots privés de leurs lignes déjà vues."""
+
+        add = self.add
+        for batch in batches:
+            kept = DetaineeBatch()
+            rows = zip(batch.iter_rows(), batch.birth_ordinals)
+            for (nom, prenom, birth_date), ordinal in rows:
+                if add(nom, prenom, birth_date):
+                    kept.noms.append(nom)
+                    kept.prenoms.append(prenom)
+                    kept.birth_ordinals.append(ordinal)
+            if len(kept):
+                yield kept
+
+    def _add_to_bloom(self, digest: bytes) -> bool:
+        """Positionne les bits de l'empreinte (double hachage)."""
+
+        bits = self._bits
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        is_new = False
+        for index in range(self._hash_count):
+            position = (first + index * second) % self._bit_count
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                is_new = True
+        return is_new
+
+
+def tables_to_detainees(
+    tables: Iterable[list[list[str]]],
+    *,
+    dedup: DuplicateFilter | None = None,
+) -> list[Detainee]:
     """Transforme les tables en liste de détenus.
 
     Rôle:
         Parcourir les tables et isoler nom, prénom, date de naissance.
     Entrées:
         tables: séquence de tables issues du PDF.
+        dedup: filtre optionnel écartant les lignes répétées.
     Sorties:
         Liste de Detainee prête pour l'écriture CSV.
     Erreurs:
         ValueError si aucune ligne valide n'est trouvée.
     """
 
-    detainees: list[Detainee] = []
+    return list(iter_detainees(tables, dedup=dedup))
+
+
+def iter_detainees(
+    tables: Iterable[list[list[str]]],
+    *,
+    require_rows: bool = True,
+    dedup: DuplicateFilter | None = None,
+) -> Iterator[Detainee]:
+    """Produit les détenus au fil des tables, sans les accumuler.
+
+    Rôle:
+        Version en flux de tables_to_detainees: chaque détenu est transmis
+        dès que sa ligne est analysée.
+    Entrées:
+        tables: itérable de tables, éventuellement lui-même un générateur.
+        require_rows: si faux, un parcours sans ligne valide n'est pas une
+            erreur (utile pour analyser une portion de document).
+        dedup: filtre optionnel écartant les lignes répétées.
+    Sorties:
+        Itérateur de Detainee.
+    Erreurs:
+        ValueError en fin de parcours si aucune ligne valide n'est trouvée
+        et que require_rows est vrai.
+    """
+
+    detainees = starmap(Detainee, _iter_records(tables, dedup))
+    if require_rows:
+        return require_detainees(detainees)
+    return detainees
+
+
+def iter_detainee_batches(
+    tables: Iterable[list[list[str]]],
+    *,
+    batch_size: int = BATCH_SIZE,
+    require_rows: bool = True,
+    dedup: DuplicateFilter | None = None,
+    stats: ConversionStats | None = None,
+) -> Iterator[DetaineeBatch]:
+    """Produit les détenus par lots compacts stockés en colonnes.
+
+    Rôle:
+        Variante de iter_detainees pour les très grandes listes: aucune
+        instance Detainee n'est créée, chaque ligne rejoint directement les
+        colonnes d'un DetaineeBatch.
+    Entrées:
+        tables: itérable de tables.
+        batch_size: nombre maximal de lignes par lot.
+        require_rows: si faux, l'absence de ligne valide est acceptée.
+        dedup: filtre optionnel écartant les lignes répétées.
+        stats: mesures complétées au fil de l'analyse (temps de recherche
+            des entêtes et de lecture des dates, tables ignorées, lignes
+            acceptées et rejetées par motif).
+    Sorties:
+        Itérateur de DetaineeBatch non vides.
+    Erreurs:
+        ValueError en fin de parcours si aucune ligne valide n'est trouvée
+        et que require_rows est vrai.
+    """
+
+    records = _iter_records(tables, dedup, stats)
+    batches = _iter_record_batches(records, batch_size)
+    if require_rows:
+        return require_batches(batches)
+    return batches
+
+
+def require_detainees(detainees: Iterable[Detainee]) -> Iterator[Detainee]:
+    """Relaie les détenus et lève ValueError en fin de parcours si aucun."""
+
+    found = False
+    for detainee in detainees:
+        found = True
+        yield detainee
+
+    if not found:
+        raise ValueError(NO_ROWS_MESSAGE)
+
+
+def require_batches(
+    batches: Iterable[DetaineeBatch],
+) -> Iterator[DetaineeBatch]:
+    """Relaie les lots non vides; ValueError en fin de parcours si aucun."""
+
+    found = False
+    for batch in batches:
+        if len(batch):
+            found = True
+            yield batch
+
+    if not found:
+        raise ValueError(NO_ROWS_MESSAGE)
+
+
+def _iter_record_batches(
+    records: Iterable[DetaineeRecord], batch_size: int
+) -> Iterator[DetaineeBatch]:
+    """Regroupe les lignes en lots d'au plus batch_size éléments."""
+
+    batch = DetaineeBatch()
+    for nom, prenom, birth_date in records:
+        batch.append(nom, prenom, birth_date)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = DetaineeBatch()
+    if len(batch):
+        yield batch
+
+
+def _iter_records(
+    tables: Iterable[list[list[str]]],
+    dedup: DuplicateFilter | None,
+    stats: ConversionStats | None = None,
+) -> Iterable[DetaineeRecord]:
+    """Lignes valides des tables, dédoublonnées si un filtre est fourni."""
+
+    records = _iter_table_records(tables, stats)
+    if dedup is None:
+        return records
+    return dedup.filter_records(records)
+
+
+def _iter_table_records(
+    tables: Iterable[list[list[str]]],
+    stats: ConversionStats | None = None,
+) -> Iterator[DetaineeRecord]:
+    """Parcourt les tables et produit les lignes valides.
+
+    Les lignes rejetées sont comptées par motif et résumées une fois par
+    table, dans stats ou à défaut dans le journal de débogage.
+    """
+
     for table in tables:
-        mapping = _find_columns(table)
+        if stats is None:
+            mapping = _find_columns(table)
+        else:
+            stats.tables_read += 1
+            with stats.timer(STAGE_HEADERS):
+                mapping = _find_columns(table)
         if mapping is None:
+            if stats is not None:
+                stats.tables_skipped += 1
             LOGGER.info("Table ignorée: entêtes introuvables.")
             continue
-        detainees.extend(_parse_table_rows(table, mapping))
+        rejected: Counter[str] = Counter()
+        yield from _iter_table_rows(table, mapping, rejected, stats)
+        if stats is not None:
+            stats.rows_rejected.update(rejected)
+        elif rejected:
+            reasons = sorted(rejected.items())
+            LOGGER.debug(
+                "Lignes ignorées dans la table: %s.",
+                ", ".join(f"{reason}={count}" for reason, count in reasons),
+            )
 
-    if not detainees:
-        message = "Aucune ligne exploitable après analyse des tables."
-        raise ValueError(message)
 
-    return detainees
+def _compile_header_pattern(
+    keywords: dict[str, list[str]],
+) -> re.Pattern[str]:
+    """Compile tous les mots-clés d'entête en un seul motif.
+
+    Le motif ne s'arrête qu'aux positions où commence un mot-clé, et y
+    capture chaque champ dont un mot-clé commence à cette position, y
+    compris lorsque des mots-clés se chevauchent ("prénom" contient "nom").
+    """
 
+    alternatives = [
+        "|".join(re.escape(keyword) for keyword in sorted(words, key=len))
+        for words in keywords.values()
+    ]
+    guard = "(?=" + "|".join(alternatives) + ")"
+    captures = "".join(
+        f"(?=(?:(?P<f{index}>{alternative})|))"
+        for index, alternative in enumerate(alternatives)
+    )
+    return re.compile(guard + captures)
+
+
+_HEADER_FIELDS: list[str] = list(HEADER_KEYWORDS)
+_HEADER_PATTERN = _compile_header_pattern(HEADER_KEYWORDS)
+# Entêtes déjà reconnus, par cellules en minuscules (borné à
+# HEADER_CACHE_SIZE entrées).
+_HEADER_SIGNATURES: dict[tuple[str, ...], tuple[int, int, int]] = {}
+
+
+def _find_columns(
+    table: list[list[str]], max_depth: int = HEADER_SEARCH_DEPTH
+) -> ColumnMapping | None:
+    """Localise les indices de colonnes nom, prénom et naissance.
 
-def _find_columns(table: list[list[str]]) -> ColumnMapping | None:
-    """Localise les indices de colonnes nom, prénom et naissance."""
+    Seules les max_depth premières lignes sont examinées, de sorte qu'une
+    table sans entête est rejetée en temps constant.
+    """
 
     if not table:
         return None
-    for row_index, row in enumerate(table):
+    for row_index, row in enumerate(islice(table, max_depth)):
         mapping = _match_header_row(row, row_index)
         if mapping is not None:
             return mapping
@@ -68,64 +375,131 @@ def _match_header_row(
 ) -> ColumnMapping | None:
     """Retourne le mapping si la ligne passée contient les entêtes."""
 
-    positions: dict[str, int] = {}
-    for cell_index, cell in enumerate(row):
-        lowered = cell.lower()
-        for field, keywords in HEADER_KEYWORDS.items():
-            if field in positions:
-                continue
-            if any(keyword in lowered for keyword in keywords):
-                positions[field] = cell_index
-    if set(positions) != set(CSV_HEADERS):
+    positions = _match_header_signature(tuple(row))
+    if positions is None:
         return None
     return ColumnMapping(
-        nom=positions["nom"],
-        prenom=positions["prenom"],
-        date_naissance=positions["date_naissance"],
+        nom=positions[0],
+        prenom=positions[1],
+        date_naissance=positions[2],
         header_row_index=row_index,
     )
 
 
-def _parse_table_rows(
-    table: list[list[str]], mapping: ColumnMapping
-) -> list[Detainee]:
+def _match_header_signature(
+    cells: tuple[str, ...],
+) -> tuple[int, int, int] | None:
+    """Calcule les positions nom, prénom, naissance d'une ligne d'entête.
+
+    Seules les lignes reconnues comme entêtes sont mémorisées, par cellules
+    en minuscules: les entêtes répétés à chaque page d'un export sont
+    reconnus immédiatement, sans que les lignes de données examinées avant
+    l'entête n'encombrent le cache.
+    """
+
+    lowered = tuple(cell.lower() for cell in cells)
+    known = _HEADER_SIGNATURES.get(lowered)
+    if known is not None:
+        return known
+    positions: dict[str, int] = {}
+    for cell_index, cell in enumerate(lowered):
+        for field in _cell_fields(cell):
+            positions.setdefault(field, cell_index)
+    if set(positions) != set(CSV_HEADERS):
+        return None
+    signature = (
+        positions["nom"],
+        positions["prenom"],
+        positions["date_naissance"],
+    )
+    if len(_HEADER_SIGNATURES) < HEADER_CACHE_SIZE:
+        _HEADER_SIGNATURES[lowered] = signature
+    return signature
+
+
+def _cell_fields(lowered: str) -> list[str]:
+    """Liste, dans l'ordre de HEADER_KEYWORDS, les champs d'une cellule."""
+
+    found: set[int] = set()
+    for match in _HEADER_PATTERN.finditer(lowered):
+        for name, value in match.groupdict().items():
+            if value is not None:
+                found.add(int(name[1:]))
+    return [_HEADER_FIELDS[index] for index in sorted(found)]
+
+
+class _TimedDates:
+    """Lecteur de dates qui chronomètre chaque analyse dans stats."""
+
+    def __init__(self, dates: BirthDateParser, stats: ConversionStats):
+        self._parse = dates.parse
+        self._add_elapsed = stats.add_elapsed
+
+    def parse(self, raw_value: str) -> str | None:
+        """Analyse la date et ajoute sa durée à l'étape des dates."""
+
+        started = perf_counter()
+        parsed = self._parse(raw_value)
+        self._add_elapsed(STAGE_DATES, started)
+        return parsed
+
+
+def _iter_table_rows(
+    table: list[list[str]],
+    mapping: ColumnMapping,
+    rejected: Counter[str] | None = None,
+    stats: ConversionStats | None = None,
+) -> Iterator[DetaineeRecord]:
     """Lit les lignes d'un tableau en appliquant la correspondance d'index."""
 
-    detainees: list[Detainee] = []
+    dates: BirthDateParser | _TimedDates = BirthDateParser()
+    if stats is not None:
+        dates = _TimedDates(dates, stats)
     start_index = mapping.header_row_index + 1
-    for row in table[start_index:]:
+    for row_index in range(start_index, len(table)):
+        row = table[row_index]
         if not row:
             continue
-        detainee = _row_to_detainee(row, mapping)
-        if detainee is not None:
-            detainees.append(detainee)
-    return detainees
+        record = _row_to_record(row, mapping, dates, rejected)
+        if record is not None:
+            if stats is not None:
+                stats.rows_accepted += 1
+            yield record
+
 
+def _row_to_record(
+    row: list[str],
+    mapping: ColumnMapping,
+    dates: BirthDateParser | _TimedDates | None = None,
+    rejected: Counter[str] | None = None,
+) -> DetaineeRecord | None:
+    """Extrait (nom, prénom, date ISO) si tous les champs sont valides.
 
-def _row_to_detainee(row: list[str], mapping: ColumnMapping) -> Detainee | None:
-    """Convertit une ligne en Detainee si tous les champs sont valides."""
+    Une ligne rejetée incrémente son motif dans rejected, s'il est fourni.
+    """
 
     if len(row) <= max(mapping.nom, mapping.prenom, mapping.date_naissance):
-        LOGGER.debug("Ligne ignorée: longueur insuffisante.")
-        return None
-    nom = row[mapping.nom].strip()
-    prenom = row[mapping.prenom].strip()
-    birth_raw = row[mapping.date_naissance].strip()
-    birth_date = _parse_birth_date(birth_raw)
-    if not nom or not prenom or birth_date is None:
-        LOGGER.debug("Ligne ignorée: champs manquants ou date invalide.")
-        return None
-    return Detainee(nom=nom, prenom=prenom, date_naissance=birth_date)
+        reason = REJECT_SHORT_ROW
+    else:
+        nom = row[mapping.nom].strip()
+        prenom = row[mapping.prenom].strip()
+        birth_raw = row[mapping.date_naissance].strip()
+        if not nom or not prenom or not birth_raw:
+            reason = REJECT_MISSING_FIELD
+        else:
+            if dates is None:
+                birth_date = _parse_birth_date(birth_raw)
+            else:
+                birth_date = dates.parse(birth_raw)
+            if birth_date is not None:
+                return nom, prenom, birth_date
+            reason = REJECT_INVALID_DATE
+    if rejected is not None:
+        rejected[reason] += 1
+    return None
 
 
 def _parse_birth_date(raw_value: str) -> str | None:
     """Valide et normalise la date de naissance en ISO 8601."""
 
-    cleaned = raw_value.replace(" ", "").replace(".", "/")
-    for fmt in DATE_FORMATS:
-        try:
-            parsed = datetime.strptime(cleaned, fmt)
-            return parsed.date().isoformat()
-        except ValueError:
-            continue
-    return None
+    return BirthDateParser().parse(raw_value)
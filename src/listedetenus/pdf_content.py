@@ -0,0 +1,375 @@
+"""Décodage des flux de contenu PDF avec la seule bibliothèque standard.
+
+Les flux compressés (FlateDecode) sont décompressés un par un, au moment où
+ils sont parcourus, puis les opérateurs texte (Tj, TJ, ', ") sont regroupés
+en lignes visuelles dont chaque fragment affiché devient une cellule.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import zlib
+from typing import Iterator
+
+LOGGER = logging.getLogger(__name__)
+
+PDF_SIGNATURE: bytes = b"%PDF-"
+SIGNATURE_SEARCH_SIZE: int = 1024
+LINE_TOLERANCE: float = 1.0
+TJ_SPACE_THRESHOLD: float = -250.0
+
+_STREAM_START = re.compile(rb"\bstream(?:\r\n|\n|\r)")
+_OBJECT_START = re.compile(rb"\d+\s+\d+\s+obj\b")
+_DIRECT_LENGTH = re.compile(rb"/Length\s+(\d+)(?!\s+\d+\s+R)")
+_FILTER = re.compile(rb"/Filter\s*(\[[^\]]*\]|/[^\s/\[\]<>]+)")
+_SKIPPED_STREAM = re.compile(
+    rb"/(?:Length[123]\b"
+    rb"|Subtype\s*/(?:Image|Type1C|CIDFontType0C|OpenType|XML)\b"
+    rb"|Type\s*/(?:XRef|ObjStm|Metadata|EmbeddedFile)\b)"
+)
+_TOKEN = re.compile(
+    rb"[\x00\t\n\x0c\r ]+"
+    rb"|%[^\r\n]*"
+    rb"|/[^\x00\t\n\x0c\r /\[\]()<>{}%]*"
+    rb"|[+-]?(?:\d+\.?\d*|\.\d+)"
+    rb"|<<|>>|\[|\]|\{|\}"
+    rb"|[^\x00\t\n\x0c\r /\[\]()<>{}%]+"
+)
+_NON_HEX = re.compile(rb"[^0-9A-Fa-f]")
+_NUMBER = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+_INLINE_IMAGE_END = re.compile(
+    rb"[\x00\t\n\x0c\r ]EI(?=[\x00\t\n\x0c\r ]|$)"
+)
+_LITERAL_ESCAPES: dict[int, bytes] = {
+    ord("n"): b"\n",
+    ord("r"): b"\r",
+    ord("t"): b"\t",
+    ord("b"): b"\b",
+    ord("f"): b"\f",
+    ord("("): b"(",
+    ord(")"): b")",
+    ord("\\"): b"\\",
+}
+_ARRAY_START = object()
+
+
+def is_pdf_document(data: bytes) -> bool:
+    """Indique si les octets commencent par une signature PDF."""
+
+    return data.find(PDF_SIGNATURE, 0, SIGNATURE_SEARCH_SIZE) != -1
+
+
+def iter_content_streams(data: bytes) -> Iterator[bytes]:
+    """Parcourt les flux de contenu du document, décompressés à la demande.
+
+    Rôle:
+        Repérer les objets `stream ... endstream`, ignorer les flux qui ne
+        contiennent pas de contenu de page (images, polices, métadonnées) et
+        décompresser les autres un à un.
+    Entrées:
+        data: contenu binaire du PDF (bytes ou mmap).
+    Sorties:
+        Itérateur des flux décodés; un seul flux est en mémoire à la fois.
+    """
+
+    position = 0
+    while True:
+        match = _STREAM_START.search(data, position)
+        if match is None:
+            return
+        start = match.end()
+        dictionary = _stream_dictionary(data, position, match.start())
+        end = _stream_end(data, start, dictionary)
+        if end is None:
+            return
+        position = end
+        if _SKIPPED_STREAM.search(dictionary):
+            continue
+        content = decode_stream(dictionary, data[start:end])
+        if content is not None:
+            yield content
+
+
+def decode_stream(dictionary: bytes, raw: bytes) -> bytes | None:
+    """Applique le filtre du flux; retourne None si non pris en charge."""
+
+    filter_match = _FILTER.search(dictionary)
+    if filter_match is None:
+        return raw
+    names = re.findall(rb"/([^\s/\[\]<>]+)", filter_match.group(1))
+    return apply_filters([name.decode("latin-1") for name in names], raw)
+
+
+def apply_filters(filters: list[str], raw: bytes) -> bytes | None:
+    """Applique les filtres nommés d'un flux; None s'ils sont inconnus.
+
+    Seul FlateDecode (ou son abréviation Fl) est pris en charge; c'est le
+    filtre des flux de contenu produits par les logiciels courants.
+    """
+
+    if not filters:
+        return raw
+    if filters not in (["FlateDecode"], ["Fl"]):
+        LOGGER.debug("Flux ignoré: filtre %s non pris en charge.", filters)
+        return None
+    try:
+        return zlib.decompressobj().decompress(raw)
+    except zlib.error as error:
+        LOGGER.debug("Flux ignoré: décompression impossible (%s).", error)
+        return None
+
+
+def iter_text_lines(content: bytes) -> Iterator[list[str]]:
+    """Regroupe les chaînes affichées d'un flux en lignes de cellules.
+
+    Rôle:
+        Suivre la matrice de texte (Td, TD, Tm, T*) pour savoir quand la
+        position verticale change; chaque opérateur d'affichage produit une
+        cellule de la ligne visuelle courante.
+    Entrées:
+        content: flux de contenu décompressé.
+    Sorties:
+        Itérateur de lignes, chaque ligne étant une liste de cellules non
+        vides.
+    """
+
+    cells: list[str] = []
+    line_y: float | None = None
+    matrix = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+    line_matrix = list(matrix)
+    leading = 0.0
+    operands: list[object] = []
+    arrays: list[list[object]] = []
+
+    for kind, value in _iter_tokens(content):
+        if kind == "operator":
+            operator = value
+        else:
+            if kind == "array_start":
+                arrays.append([])
+            elif kind == "array_end":
+                if arrays:
+                    finished = arrays.pop()
+                    (arrays[-1] if arrays else operands).append(finished)
+            elif arrays:
+                arrays[-1].append(value)
+            else:
+                operands.append(value)
+            continue
+
+        shown: str | None = None
+        if operator == b"BT":
+            matrix = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+            line_matrix = list(matrix)
+        elif operator in (b"Td", b"TD") and _has_numbers(operands, 2):
+            tx, ty = operands[-2], operands[-1]
+            if operator == b"TD":
+                leading = -ty
+            line_matrix = _translate(line_matrix, tx, ty)
+            matrix = list(line_matrix)
+        elif operator == b"Tm" and _has_numbers(operands, 6):
+            line_matrix = [float(item) for item in operands[-6:]]
+            matrix = list(line_matrix)
+        elif operator == b"TL" and _has_numbers(operands, 1):
+            leading = operands[-1]
+        elif operator == b"T*":
+            line_matrix = _translate(line_matrix, 0.0, -leading)
+            matrix = list(line_matrix)
+        elif operator == b"Tj" and operands:
+            shown = _show_text(operands[-1])
+        elif operator == b"TJ" and operands:
+            shown = _show_text_array(operands[-1])
+        elif operator in (b"'", b'"') and operands:
+            line_matrix = _translate(line_matrix, 0.0, -leading)
+            matrix = list(line_matrix)
+            shown = _show_text(operands[-1])
+        operands = []
+
+        if shown is None:
+            continue
+        shown = shown.strip()
+        if not shown:
+            continue
+        current_y = matrix[5]
+        if line_y is not None and abs(current_y - line_y) > LINE_TOLERANCE:
+            if cells:
+                yield cells
+            cells = []
+        line_y = current_y
+        cells.append(shown)
+
+    if cells:
+        yield cells
+
+
+def decode_pdf_string(raw: bytes) -> str:
+    """Convertit une chaîne PDF en texte (UTF-16BE si BOM, sinon latin-1)."""
+
+    if raw.startswith(b"\xfe\xff"):
+        return raw[2:].decode("utf-16-be", errors="replace")
+    return raw.decode("latin-1")
+
+
+def _stream_dictionary(data: bytes, lower: int, stream_start: int) -> bytes:
+    """Retourne le dictionnaire précédant le mot-clé `stream`."""
+
+    window_start = max(lower, stream_start - 4096)
+    header = data[window_start:stream_start]
+    starts = list(_OBJECT_START.finditer(header))
+    if starts:
+        return header[starts[-1].end():]
+    return header
+
+
+def _stream_end(data: bytes, start: int, dictionary: bytes) -> int | None:
+    """Localise la fin des données du flux."""
+
+    length_match = _DIRECT_LENGTH.search(dictionary)
+    if length_match is not None:
+        end = start + int(length_match.group(1))
+        trailer = data[end:end + 32].lstrip(b"\r\n \t")
+        if trailer.startswith(b"endstream"):
+            return end
+    end = data.find(b"endstream", start)
+    if end == -1:
+        LOGGER.debug("Flux tronqué: endstream introuvable.")
+        return None
+    while end > start and data[end - 1:end] in (b"\n", b"\r"):
+        end -= 1
+    return end
+
+
+def _iter_tokens(content: bytes) -> Iterator[tuple[str, object]]:
+    """Découpe un flux de contenu en jetons (opérandes et opérateurs)."""
+
+    position = 0
+    size = len(content)
+    while position < size:
+        current = content[position:position + 1]
+        if current == b"(":
+            value, position = read_literal_string(content, position + 1)
+            yield "string", value
+            continue
+        if current == b"<" and content[position + 1:position + 2] != b"<":
+            end = content.find(b">", position)
+            if end == -1:
+                return
+            yield "string", decode_hex_string(content[position + 1:end])
+            position = end + 1
+            continue
+        match = _TOKEN.match(content, position)
+        if match is None:
+            position += 1
+            continue
+        token = match.group()
+        position = match.end()
+        first = token[:1]
+        if first in b"\x00\t\n\x0c\r %" or token in (b"<<", b">>", b"{", b"}"):
+            continue
+        if token == b"[":
+            yield "array_start", _ARRAY_START
+        elif token == b"]":
+            yield "array_end", None
+        elif first == b"/":
+            yield "name", token.decode("latin-1")
+        elif _NUMBER.fullmatch(token):
+            yield "number", float(token)
+        elif token == b"ID":
+            end = _INLINE_IMAGE_END.search(content, position)
+            position = size if end is None else end.end()
+        else:
+            yield "operator", token
+
+
+def read_literal_string(content: bytes, position: int) -> tuple[bytes, int]:
+    """Lit une chaîne littérale en gérant imbrication et échappements.
+
+    position désigne l'octet qui suit la parenthèse ouvrante; la position
+    retournée suit la parenthèse fermante.
+    """
+
+    output = bytearray()
+    depth = 1
+    size = len(content)
+    while position < size:
+        byte = content[position]
+        position += 1
+        if byte == 0x5C:
+            if position >= size:
+                break
+            escaped = content[position]
+            position += 1
+            if escaped in _LITERAL_ESCAPES:
+                output += _LITERAL_ESCAPES[escaped]
+            elif 0x30 <= escaped <= 0x37:
+                digits = bytes([escaped])
+                while (
+                    len(digits) < 3
+                    and position < size
+                    and 0x30 <= content[position] <= 0x37
+                ):
+                    digits += content[position:position + 1]
+                    position += 1
+                output.append(int(digits, 8) & 0xFF)
+            elif escaped == 0x0D:
+                if content[position:position + 1] == b"\n":
+                    position += 1
+            elif escaped != 0x0A:
+                output.append(escaped)
+            continue
+        if byte == 0x28:
+            depth += 1
+        elif byte == 0x29:
+            depth -= 1
+            if depth == 0:
+                break
+        output.append(byte)
+    return bytes(output), position
+
+
+def decode_hex_string(raw: bytes) -> bytes:
+    """Décode une chaîne hexadécimale PDF."""
+
+    digits = _NON_HEX.sub(b"", raw)
+    if len(digits) % 2:
+        digits += b"0"
+    return bytes.fromhex(digits.decode("ascii"))
+
+
+def _has_numbers(operands: list[object], count: int) -> bool:
+    """Vérifie que les derniers opérandes sont des nombres."""
+
+    if len(operands) < count:
+        return False
+    return all(isinstance(item, float) for item in operands[-count:])
+
+
+def _translate(matrix: list[float], tx: float, ty: float) -> list[float]:
+    """Applique une translation exprimée dans l'espace de la matrice."""
+
+    a, b, c, d, e, f = matrix
+    return [a, b, c, d, tx * a + ty * c + e, tx * b + ty * d + f]
+
+
+def _show_text(operand: object) -> str | None:
+    """Décode l'opérande d'un opérateur Tj."""
+
+    if isinstance(operand, bytes):
+        return decode_pdf_string(operand)
+    return None
+
+
+def _show_text_array(operand: object) -> str | None:
+    """Décode l'opérande d'un opérateur TJ, espacements compris."""
+
+    if not isinstance(operand, list):
+        return None
+    parts: list[str] = []
+    for item in operand:
+        if isinstance(item, float):
+            if item < TJ_SPACE_THRESHOLD:
+                parts.append(" ")
+        elif isinstance(item, bytes):
+            parts.append(decode_pdf_string(item))
+    return "".join(parts)
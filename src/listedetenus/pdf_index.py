@@ -0,0 +1,449 @@
+"""Index des pages d'un PDF construit à partir de la table xref.
+
+La table de références croisées (classique ou sous forme de flux) et
+l'arbre des pages sont lus une seule fois; l'index ne conserve ensuite que
+les positions des flux de contenu de chaque page, ce qui permet de décoder
+une page précise sans parcourir le reste du fichier.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Iterator
+
+from listedetenus.pdf_content import (
+    apply_filters,
+    decode_hex_string,
+    read_literal_string,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+STARTXREF_SEARCH_SIZE: int = 2048
+MAX_XREF_SECTIONS: int = 64
+OBJECT_STREAM_CACHE_SIZE: int = 4
+
+_WHITESPACE = re.compile(rb"(?:[\x00\t\n\x0c\r ]+|%[^\r\n]*)*")
+_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_OBJECT_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\b")
+_REFERENCE_TAIL = re.compile(rb"\s+(\d+)\s+R\b")
+_NUMBER = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+_NAME = re.compile(rb"/([^\x00\t\n\x0c\r /\[\]()<>{}%]*)")
+_KEYWORD = re.compile(rb"[A-Za-z]+")
+_NAME_ESCAPE = re.compile(rb"#([0-9A-Fa-f]{2})")
+_STREAM_KEYWORD = re.compile(rb"\s*stream(?:\r\n|\n|\r)")
+_XREF_SUBSECTION = re.compile(rb"\s*(\d+)\s+(\d+)")
+_XREF_ENTRY = re.compile(rb"\s*(\d{10})\s+(\d{5})\s+([nf])")
+
+
+@dataclass(frozen=True)
+class PdfReference:
+    """Référence indirecte `numéro génération R`."""
+
+    number: int
+    generation: int
+
+
+class PdfName(str):
+    """Nom PDF (`/Type`), distinct des chaînes de texte."""
+
+
+class PdfPageIndex:
+    """Positions des flux de contenu de chaque page d'un PDF.
+
+    Rôle:
+        Construire une fois l'index (xref puis arbre des pages), puis
+        décoder les pages à la demande en lisant directement leurs octets.
+    Entrées:
+        data: contenu binaire du PDF (bytes ou mmap), conservé par l'index.
+    Erreurs:
+        ValueError si la table xref ou l'arbre des pages est illisible.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._offsets: dict[int, int] = {}
+        self._compressed: dict[int, tuple[int, int]] = {}
+        self._object_streams: dict[int, tuple[bytes, list[int]]] = {}
+        try:
+            trailer = self._read_xref_chain()
+            self.pages: list[tuple[int, ...]] = self._collect_pages(trailer)
+        except (AttributeError, IndexError, TypeError) as error:
+            message = f"Structure PDF illisible: {error}."
+            raise ValueError(message) from error
+
+    @property
+    def page_count(self) -> int:
+        """Nombre de pages indexées."""
+
+        return len(self.pages)
+
+    def page_content(self, page_number: int) -> bytes:
+        """Retourne le contenu décodé d'une page (numérotée à partir de 0).
+
+        Les flux multiples d'une même page sont concaténés, car un jeton
+        peut être coupé entre deux flux.
+        """
+
+        parts: list[bytes] = []
+        for offset in self.pages[page_number]:
+            dictionary, raw = self._read_stream_at(offset)
+            decoded = _decode_stream(dictionary, raw)
+            if decoded is not None:
+                parts.append(decoded)
+        return b"\n".join(parts)
+
+    def iter_page_contents(
+        self, pages: range | None = None
+    ) -> Iterator[bytes]:
+        """Décode les pages demandées une par une, dans l'ordre."""
+
+        if pages is None:
+            pages = range(self.page_count)
+        for page_number in pages:
+            yield self.page_content(page_number)
+
+    def _read_xref_chain(self) -> dict[str, object]:
+        """Lit les sections xref successives et retourne le trailer."""
+
+        tail_start = max(0, len(self._data) - STARTXREF_SEARCH_SIZE)
+        matches = list(_STARTXREF.finditer(self._data, tail_start))
+        if not matches:
+            raise ValueError("Table xref introuvable (startxref absent).")
+
+        trailer: dict[str, object] | None = None
+        pending = [int(matches[-1].group(1))]
+        visited: set[int] = set()
+        while pending and len(visited) < MAX_XREF_SECTIONS:
+            offset = pending.pop(0)
+            if offset in visited or offset >= len(self._data):
+                continue
+            visited.add(offset)
+            section_trailer = self._read_xref_section(offset)
+            if trailer is None:
+                trailer = section_trailer
+            for key in ("XRefStm", "Prev"):
+                value = section_trailer.get(key)
+                if isinstance(value, int):
+                    pending.append(value)
+
+        if trailer is None:
+            raise ValueError("Table xref illisible.")
+        return trailer
+
+    def _read_xref_section(self, offset: int) -> dict[str, object]:
+        """Lit une section xref classique ou un flux xref."""
+
+        start = _WHITESPACE.match(self._data, offset).end()
+        if self._data[start:start + 4] == b"xref":
+            return self._read_xref_table(start + 4)
+        dictionary, raw = self._read_stream_at(offset)
+        if dictionary.get("Type") != "XRef":
+            raise ValueError("Section xref invalide.")
+        self._read_xref_stream(dictionary, raw)
+        return dictionary
+
+    def _read_xref_table(self, position: int) -> dict[str, object]:
+        """Lit une table xref classique suivie de son trailer."""
+
+        while True:
+            subsection = _XREF_SUBSECTION.match(self._data, position)
+            if subsection is None:
+                break
+            first, count = int(subsection.group(1)), int(subsection.group(2))
+            position = subsection.end()
+            for number in range(first, first + count):
+                entry = _XREF_ENTRY.match(self._data, position)
+                if entry is None:
+                    raise ValueError("Entrée xref invalide.")
+                position = entry.end()
+                if entry.group(3) == b"n":
+                    self._offsets.setdefault(number, int(entry.group(1)))
+
+        position = _WHITESPACE.match(self._data, position).end()
+        if self._data[position:position + 7] != b"trailer":
+            raise ValueError("Trailer xref introuvable.")
+        trailer, _ = _parse_value(self._data, position + 7)
+        if not isinstance(trailer, dict):
+            raise ValueError("Trailer xref invalide.")
+        return trailer
+
+    def _read_xref_stream(self, dictionary: dict, raw: bytes) -> None:
+        """Enregistre les entrées d'un flux xref (PDF 1.5 et plus)."""
+
+        decoded = _decode_stream(dictionary, raw)
+        widths = dictionary.get("W")
+        if decoded is None or not isinstance(widths, list):
+            raise ValueError("Flux xref illisible.")
+        index = dictionary.get("Index") or [0, dictionary.get("Size", 0)]
+        row_size = sum(widths)
+        position = 0
+        for pair_start in range(0, len(index) - 1, 2):
+            first, count = index[pair_start], index[pair_start + 1]
+            for number in range(first, first + count):
+                row = decoded[position:position + row_size]
+                position += row_size
+                if len(row) < row_size:
+                    return
+                fields = _split_fields(row, widths)
+                kind = fields[0] if widths[0] else 1
+                if kind == 1:
+                    self._offsets.setdefault(number, fields[1])
+                elif kind == 2 and number not in self._offsets:
+                    self._compressed.setdefault(
+                        number, (fields[1], fields[2])
+                    )
+
+    def _collect_pages(
+        self, trailer: dict[str, object]
+    ) -> list[tuple[int, ...]]:
+        """Parcourt l'arbre des pages et relève les flux de contenu."""
+
+        catalog = self._resolve(trailer.get("Root"))
+        if not isinstance(catalog, dict):
+            raise ValueError("Catalogue PDF introuvable.")
+
+        pages: list[tuple[int, ...]] = []
+        visited: set[PdfReference] = set()
+        stack: list[object] = [catalog.get("Pages")]
+        while stack:
+            reference = stack.pop()
+            if isinstance(reference, PdfReference):
+                if reference in visited:
+                    continue
+                visited.add(reference)
+            node = self._resolve(reference)
+            if not isinstance(node, dict):
+                continue
+            kids = self._resolve(node.get("Kids"))
+            if node.get("Type") == "Pages" or isinstance(kids, list):
+                stack.extend(reversed(kids or []))
+                continue
+            pages.append(self._content_offsets(node.get("Contents")))
+
+        if not pages:
+            raise ValueError("Arbre des pages vide.")
+        return pages
+
+    def _content_offsets(self, contents: object) -> tuple[int, ...]:
+        """Retourne les positions des flux de contenu d'une page."""
+
+        if isinstance(contents, PdfReference):
+            target = self._resolve(contents)
+            if isinstance(target, list):
+                contents = target
+            else:
+                contents = [contents]
+        if not isinstance(contents, list):
+            return ()
+        offsets = []
+        for item in contents:
+            if not isinstance(item, PdfReference):
+                continue
+            if item.number in self._offsets:
+                offsets.append(self._offsets[item.number])
+        return tuple(offsets)
+
+    def _resolve(self, value: object) -> object:
+        """Résout une référence indirecte en objet PDF."""
+
+        if not isinstance(value, PdfReference):
+            return value
+        if value.number in self._offsets:
+            header = _OBJECT_HEADER.match(
+                self._data, self._offsets[value.number]
+            )
+            if header is None:
+                return None
+            resolved, _ = _parse_value(self._data, header.end())
+            return resolved
+        if value.number in self._compressed:
+            return self._resolve_compressed(value.number)
+        return None
+
+    def _resolve_compressed(self, number: int) -> object:
+        """Lit un objet rangé dans un flux d'objets (ObjStm)."""
+
+        stream_number, position = self._compressed[number]
+        if stream_number not in self._object_streams:
+            if len(self._object_streams) >= OBJECT_STREAM_CACHE_SIZE:
+                self._object_streams.pop(next(iter(self._object_streams)))
+            offset = self._offsets.get(stream_number)
+            if offset is None:
+                return None
+            dictionary, raw = self._read_stream_at(offset)
+            decoded = _decode_stream(dictionary, raw) or b""
+            first = dictionary.get("First", 0)
+            header = [int(item) for item in decoded[:first].split()]
+            self._object_streams[stream_number] = (
+                decoded,
+                [first + item for item in header[1::2]],
+            )
+        decoded, starts = self._object_streams[stream_number]
+        if position >= len(starts):
+            return None
+        value, _ = _parse_value(decoded, starts[position])
+        return value
+
+    def _read_stream_at(self, offset: int) -> tuple[dict, bytes]:
+        """Lit le dictionnaire et les octets bruts d'un objet flux."""
+
+        header = _OBJECT_HEADER.match(self._data, offset)
+        if header is None:
+            raise ValueError(f"Objet introuvable à la position {offset}.")
+        dictionary, position = _parse_value(self._data, header.end())
+        keyword = _STREAM_KEYWORD.match(self._data, position)
+        if not isinstance(dictionary, dict) or keyword is None:
+            raise ValueError(f"Flux attendu à la position {offset}.")
+        start = keyword.end()
+        length = self._resolve(dictionary.get("Length"))
+        if isinstance(length, int):
+            end = start + length
+        else:
+            end = self._data.find(b"endstream", start)
+            if end == -1:
+                raise ValueError("Flux tronqué: endstream introuvable.")
+        return dictionary, self._data[start:end]
+
+
+def _parse_value(data: bytes, position: int) -> tuple[object, int]:
+    """Analyse un objet PDF à partir de position."""
+
+    position = _WHITESPACE.match(data, position).end()
+    head = data[position:position + 2]
+    if head == b"<<":
+        return _parse_dictionary(data, position + 2)
+    if head[:1] == b"<":
+        end = data.find(b">", position)
+        return decode_hex_string(data[position + 1:end]), end + 1
+    if head[:1] == b"[":
+        return _parse_array(data, position + 1)
+    if head[:1] == b"(":
+        return read_literal_string(data, position + 1)
+    if head[:1] == b"/":
+        match = _NAME.match(data, position)
+        return _decode_name(match.group(1)), match.end()
+    number = _NUMBER.match(data, position)
+    if number is not None:
+        token = number.group()
+        if b"." in token:
+            return float(token), number.end()
+        reference = _REFERENCE_TAIL.match(data, number.end())
+        if reference is not None:
+            generation = int(reference.group(1))
+            return PdfReference(int(token), generation), reference.end()
+        return int(token), number.end()
+    keyword = _KEYWORD.match(data, position)
+    if keyword is None:
+        raise ValueError(f"Objet PDF illisible à la position {position}.")
+    values = {b"true": True, b"false": False, b"null": None}
+    return values.get(keyword.group()), keyword.end()
+
+
+def _parse_dictionary(data: bytes, position: int) -> tuple[dict, int]:
+    """Analyse le contenu d'un dictionnaire jusqu'à `>>`."""
+
+    result: dict[str, object] = {}
+    while True:
+        position = _WHITESPACE.match(data, position).end()
+        if data[position:position + 2] == b">>":
+            return result, position + 2
+        key, position = _parse_value(data, position)
+        if not isinstance(key, PdfName):
+            raise ValueError("Clé de dictionnaire PDF invalide.")
+        value, position = _parse_value(data, position)
+        result[str(key)] = value
+
+
+def _parse_array(data: bytes, position: int) -> tuple[list, int]:
+    """Analyse le contenu d'un tableau jusqu'à `]`."""
+
+    result: list[object] = []
+    while True:
+        position = _WHITESPACE.match(data, position).end()
+        if data[position:position + 1] == b"]":
+            return result, position + 1
+        if position >= len(data):
+            raise ValueError("Tableau PDF non terminé.")
+        value, position = _parse_value(data, position)
+        result.append(value)
+
+
+def _decode_name(raw: bytes) -> PdfName:
+    """Décode un nom PDF, séquences #xx comprises."""
+
+    unescaped = _NAME_ESCAPE.sub(lambda match: bytes.fromhex(
+        match.group(1).decode("ascii")
+    ), raw)
+    return PdfName(unescaped.decode("latin-1"))
+
+
+def _decode_stream(dictionary: dict, raw: bytes) -> bytes | None:
+    """Applique les filtres du flux, puis un éventuel prédicteur PNG."""
+
+    filters = dictionary.get("Filter")
+    if not isinstance(filters, list):
+        filters = [] if filters is None else [filters]
+    decoded = apply_filters([str(name) for name in filters], raw)
+    if decoded is None or not filters:
+        return decoded
+    parameters = dictionary.get("DecodeParms")
+    if isinstance(parameters, list):
+        parameters = parameters[0] if parameters else None
+    if isinstance(parameters, dict) and parameters.get("Predictor", 1) >= 10:
+        columns = parameters.get("Columns", 1)
+        return _undo_png_predictor(decoded, columns)
+    return decoded
+
+
+def _undo_png_predictor(data: bytes, columns: int) -> bytes:
+    """Inverse les prédicteurs PNG (None, Sub, Up, Average, Paeth)."""
+
+    output = bytearray()
+    previous = bytearray(columns)
+    stride = columns + 1
+    for start in range(0, len(data) - columns, stride):
+        kind = data[start]
+        row = bytearray(data[start + 1:start + stride])
+        for index in range(len(row)):
+            left = row[index - 1] if index else 0
+            up = previous[index]
+            if kind == 1:
+                row[index] = (row[index] + left) & 0xFF
+            elif kind == 2:
+                row[index] = (row[index] + up) & 0xFF
+            elif kind == 3:
+                row[index] = (row[index] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                corner = previous[index - 1] if index else 0
+                row[index] = (row[index] + _paeth(left, up, corner)) & 0xFF
+        output += row
+        previous = row
+    return bytes(output)
+
+
+def _paeth(left: int, up: int, corner: int) -> int:
+    """Prédicteur de Paeth tel que défini par PNG."""
+
+    estimate = left + up - corner
+    distance_left = abs(estimate - left)
+    distance_up = abs(estimate - up)
+    distance_corner = abs(estimate - corner)
+    if distance_left <= distance_up and distance_left <= distance_corner:
+        return left
+    if distance_up <= distance_corner:
+        return up
+    return corner
+
+
+def _split_fields(row: bytes, widths: list[int]) -> list[int]:
+    """Découpe une ligne de flux xref selon les largeurs /W."""
+
+    fields = []
+    position = 0
+    for width in widths:
+        fields.append(int.from_bytes(row[position:position + width], "big"))
+        position += width
+    return fields
@@ -1,28 +1,87 @@
-"""Lecture sécurisée des tableaux depuis un fichier PDF textuel."""
+"""Lecture sécurisée des tableaux depuis un fichier PDF.
+
+Deux formats sont pris en charge: les vrais PDF, dont les flux de contenu
+sont décodés par pdf_content, et les exports textuels portant l'extension
+.pdf, découpés ligne par ligne.
+"""
 
 from __future__ import annotations
 
+import codecs
 import logging
+import math
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from time import perf_counter
+from typing import Callable, Iterable, Iterator
 
 from listedetenus.constants import MAX_ROW_FIELDS
-from listedetenus.models import PdfExtractionResult
+from listedetenus.models import PdfChunk, PdfExtractionResult
+from listedetenus.pdf_content import (
+    is_pdf_document,
+    iter_content_streams,
+    iter_text_lines,
+)
+from listedetenus.pdf_index import PdfPageIndex
+from listedetenus.stats import (
+    STAGE_DECODE,
+    STAGE_READ,
+    STAGE_SPLIT,
+    ConversionStats,
+)
 
 LOGGER = logging.getLogger(__name__)
 
 LINE_SEPARATORS: list[str] = [";", ",", "\t", "|"]
 FALLBACK_SEPARATOR: str = " "
 MIN_COLUMN_COUNT: int = 2
+TEXT_ENCODINGS: list[str] = ["utf-8", "latin-1"]
+ENCODING_SAMPLE_SIZE: int = 64 * 1024
+DECODE_CHUNK_SIZE: int = 1024 * 1024
+DIALECT_SAMPLE_LINES: int = 5
+LATIN1_FALLBACK_ERRORS = "listedetenus-latin1"
+
+_BLANK_LINE = re.compile(rb"\n[ \t\r\x0b\x0c]*\n")
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def _decode_as_latin1(error: UnicodeError) -> tuple[str, int]:
+    """Décode en latin-1 les octets refusés par le décodage principal.
+
+    Un export latin-1 dont l'échantillon initial est en ASCII est détecté
+    comme UTF-8: ses lettres accentuées restent ainsi lisibles ("Hélène")
+    au lieu de devenir des caractères de remplacement.
+    """
+
+    if not isinstance(error, UnicodeDecodeError):
+        raise error
+    rejected = error.object[error.start:error.end]
+    return bytes(rejected).decode("latin-1"), error.end
+
+
+codecs.register_error(LATIN1_FALLBACK_ERRORS, _decode_as_latin1)
+
+
+@dataclass(frozen=True)
+class TableDialect:
+    """Séparateur et nombre de colonnes attendus pour toute une table."""
+
+    separator: str
+    column_count: int
 
 
 def read_pdf_tables(pdf_path: Path) -> PdfExtractionResult:
-    """Extrait les tableaux d'un fichier PDF textuel.
+    """Extrait les tableaux d'un fichier PDF.
 
     Rôle:
-        Lire le contenu d'un fichier PDF (supposé textuel) et en déduire des
-        tableaux structurés à partir des séparateurs présents dans chaque
-        ligne.
+        Lire le contenu d'un fichier PDF et en déduire des tableaux
+        structurés: une table par flux de contenu pour un vrai PDF, ou des
+        blocs de lignes séparées pour un export textuel.
     Entrées:
         pdf_path: chemin du fichier PDF existant.
     Sorties:
@@ -32,14 +91,157 @@ def read_pdf_tables(pdf_path: Path) -> PdfExtractionResult:
         RuntimeError: échec de lecture du fichier.
     """
 
+    tables = list(iter_pdf_tables(pdf_path))
+    return PdfExtractionResult(source=pdf_path, tables=tables)
+
+
+def iter_pdf_tables(
+    pdf_path: Path,
+    pages: range | None = None,
+    progress: ProgressCallback | None = None,
+    stats: ConversionStats | None = None,
+) -> Iterator[list[list[str]]]:
+    """Parcourt les tableaux d'un fichier PDF au fil de la lecture.
+
+    Rôle:
+        Produire les tableaux un par un, sans conserver les tableaux déjà
+        transmis, afin que la mémoire reste bornée par la taille d'un seul
+        tableau.
+    Entrées:
+        pdf_path: chemin du fichier PDF existant.
+        pages: plage de pages à lire (numérotées à partir de 0); seules ces
+            pages sont décodées grâce à l'index xref. Réservé aux vrais PDF.
+        progress: appelé avec (fait, total) au fil de la lecture, en pages
+            pour un vrai PDF et en octets pour un export textuel; total
+            vaut 0 s'il est inconnu.
+        stats: mesures complétées au fil de la lecture (temps de lecture,
+            de décodage et de découpage, octets, lignes et pages).
+    Sorties:
+        Itérateur de tableaux; chaque tableau est une liste de lignes.
+    Erreurs:
+        ValueError: fichier manquant ou extension incorrecte (levée dès
+            l'appel), fichier vide ou aucune table (levée pendant le
+            parcours).
+        RuntimeError: échec de lecture du fichier.
+    """
+
     _validate_pdf_path(pdf_path)
-    content = _load_pdf_content(pdf_path)
-    tables = _extract_tables_from_text(content)
-    if not tables:
-        message = "Aucune table détectée dans le PDF."
-        raise ValueError(message)
+    return _require_tables(
+        _iter_file_tables(pdf_path, pages, progress, stats)
+    )
 
-    return PdfExtractionResult(source=pdf_path, tables=tables)
+
+def count_pdf_pages(pdf_path: Path) -> int:
+    """Compte les pages d'un vrai PDF à partir de son index xref.
+
+    Rôle:
+        Connaître le nombre de pages sans décoder leur contenu, par exemple
+        pour découper un traitement par plages de pages.
+    Entrées:
+        pdf_path: chemin du fichier PDF existant.
+    Sorties:
+        Nombre de pages; 0 pour un export textuel ou un PDF sans index
+        exploitable.
+    Erreurs:
+        ValueError: fichier manquant, vide ou extension incorrecte.
+        RuntimeError: échec de lecture du fichier.
+    """
+
+    _validate_pdf_path(pdf_path)
+    with _map_pdf(pdf_path) as data:
+        if not is_pdf_document(data):
+            return 0
+        try:
+            return PdfPageIndex(data).page_count
+        except ValueError as error:
+            LOGGER.info("Index des pages indisponible: %s", error)
+            return 0
+
+
+def plan_pdf_chunks(pdf_path: Path, chunk_count: int) -> list[PdfChunk]:
+    """Découpe un PDF en portions indépendantes pour un traitement parallèle.
+
+    Rôle:
+        Préparer des portions décrites par des plages de pages (vrai PDF) ou
+        des positions d'octets alignées sur des lignes vides (export
+        textuel), afin qu'aucune table ne soit coupée et que les processus
+        relisent eux-mêmes leur portion au lieu de recevoir une copie.
+    Entrées:
+        pdf_path: chemin du fichier PDF existant.
+        chunk_count: nombre de portions souhaité (au moins 1).
+    Sorties:
+        Liste ordonnée de PdfChunk, éventuellement plus courte que demandé.
+    Erreurs:
+        ValueError: fichier manquant, vide ou extension incorrecte.
+        RuntimeError: échec de lecture du fichier.
+    """
+
+    _validate_pdf_path(pdf_path)
+    chunk_count = max(1, chunk_count)
+    with _map_pdf(pdf_path) as data:
+        if is_pdf_document(data):
+            return _plan_page_chunks(data, chunk_count)
+        encoding = _detect_encoding(data)
+        boundaries = _text_boundaries(data, chunk_count)
+        return [
+            PdfChunk(start=start, stop=stop, encoding=encoding)
+            for start, stop in zip(boundaries, boundaries[1:])
+        ]
+
+
+def iter_chunk_tables(
+    pdf_path: Path,
+    chunk: PdfChunk,
+    stats: ConversionStats | None = None,
+) -> Iterator[list[list[str]]]:
+    """Parcourt les tableaux d'une portion préparée par plan_pdf_chunks.
+
+    Contrairement à iter_pdf_tables, une portion sans table n'est pas une
+    erreur: la vérification se fait sur l'ensemble des portions.
+    """
+
+    _validate_pdf_path(pdf_path)
+    with _map_pdf(pdf_path) as data:
+        if is_pdf_document(data):
+            yield from _iter_document_tables(
+                data, chunk.pages, stats=stats
+            )
+            return
+        raw_lines = _iter_decoded_lines(
+            data, chunk.encoding, chunk.start, chunk.stop, stats=stats
+        )
+        yield from _iter_text_tables(raw_lines, stats)
+
+
+def _plan_page_chunks(data: mmap.mmap, chunk_count: int) -> list[PdfChunk]:
+    """Répartit les pages d'un vrai PDF en plages contiguës."""
+
+    try:
+        page_count = PdfPageIndex(data).page_count
+    except ValueError as error:
+        LOGGER.info("Index des pages indisponible (%s).", error)
+        return [PdfChunk()]
+    step = math.ceil(page_count / chunk_count)
+    return [
+        PdfChunk(pages=range(first, min(first + step, page_count)))
+        for first in range(0, page_count, step)
+    ]
+
+
+def _text_boundaries(data: mmap.mmap, chunk_count: int) -> list[int]:
+    """Calcule des coupures d'octets placées juste après une ligne vide."""
+
+    size = len(data)
+    boundaries = [0]
+    for part in range(1, chunk_count):
+        target = max(size * part // chunk_count, boundaries[-1])
+        match = _BLANK_LINE.search(data, target)
+        if match is None:
+            break
+        if match.end() > boundaries[-1]:
+            boundaries.append(match.end())
+    boundaries.append(size)
+    return boundaries
 
 
 def _validate_pdf_path(pdf_path: Path) -> None:
@@ -53,59 +255,304 @@ def _validate_pdf_path(pdf_path: Path) -> None:
         raise ValueError("Le fichier PDF fourni est introuvable.")
 
 
-def _load_pdf_content(pdf_path: Path) -> str:
-    """Lit le fichier en texte en essayant des décodages sûrs."""
+@contextmanager
+def _map_pdf(pdf_path: Path) -> Iterator[mmap.mmap]:
+    """Projette le fichier en mémoire en lecture seule."""
 
     try:
-        raw_bytes = pdf_path.read_bytes()
-    except Exception as error:  # noqa: BLE001
+        handle = pdf_path.open("rb")
+    except OSError as error:
         message = f"Impossible de lire le PDF: {error}."
         LOGGER.error(message)
         raise RuntimeError(message) from error
 
-    if not raw_bytes:
-        raise ValueError("Le fichier PDF est vide.")
-
-    decoders = ["utf-8", "latin-1"]
-    for decoder in decoders:
+    with handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            raise ValueError("Le fichier PDF est vide.")
         try:
-            return raw_bytes.decode(decoder)
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as error:
+            message = f"Impossible de lire le PDF: {error}."
+            LOGGER.error(message)
+            raise RuntimeError(message) from error
+        with mapped:
+            yield mapped
+
+
+def _detect_encoding(data: mmap.mmap) -> str:
+    """Choisit le décodage à partir d'un échantillon borné du début."""
+
+    sample = data[:ENCODING_SAMPLE_SIZE]
+    is_complete = len(sample) == len(data)
+    for encoding in TEXT_ENCODINGS:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            decoder.decode(sample, final=is_complete)
         except UnicodeDecodeError:
             continue
-    return raw_bytes.decode("utf-8", errors="replace")
+        return encoding
+    return TEXT_ENCODINGS[-1]
+
+
+def _iter_decoded_lines(
+    data: mmap.mmap,
+    encoding: str,
+    start: int = 0,
+    stop: int | None = None,
+    progress: ProgressCallback | None = None,
+    stats: ConversionStats | None = None,
+) -> Iterator[str]:
+    """Décode le contenu par blocs et produit les lignes brutes.
+
+    La dernière ligne de chaque bloc est retenue jusqu'au bloc suivant, car
+    elle peut être incomplète (y compris un couple CR LF coupé en deux).
+    Les octets invalides hors de l'échantillon sont lus en latin-1.
+    """
+
+    decoder = codecs.getincrementaldecoder(encoding)(
+        errors=LATIN1_FALLBACK_ERRORS
+    )
+    size = len(data) if stop is None else stop
+    pending = ""
+    for offset in range(start, size, DECODE_CHUNK_SIZE):
+        end = min(offset + DECODE_CHUNK_SIZE, size)
+        started = perf_counter() if stats is not None else 0.0
+        text = pending + decoder.decode(data[offset:end], final=end >= size)
+        lines = text.splitlines(keepends=True)
+        pending = lines.pop() if lines else ""
+        if stats is not None:
+            stats.add_elapsed(STAGE_DECODE, started)
+            stats.bytes_read += end - offset
+            stats.lines_read += len(lines)
+        yield from lines
+        if progress is not None:
+            progress(end - start, size - start)
+    if pending:
+        if stats is not None:
+            stats.lines_read += 1
+        yield pending
+
+
+def _iter_file_tables(
+    pdf_path: Path,
+    pages: range | None,
+    progress: ProgressCallback | None = None,
+    stats: ConversionStats | None = None,
+) -> Iterator[list[list[str]]]:
+    """Choisit le décodage adapté au fichier et produit ses tableaux."""
+
+    with _map_pdf(pdf_path) as data:
+        if is_pdf_document(data):
+            yield from _iter_document_tables(data, pages, progress, stats)
+            return
+        if pages is not None:
+            message = "La sélection de pages exige un vrai PDF."
+            raise ValueError(message)
+        encoding = _detect_encoding(data)
+        raw_lines = _iter_decoded_lines(
+            data, encoding, progress=progress, stats=stats
+        )
+        yield from _iter_text_tables(raw_lines, stats)
+
+
+def _iter_text_tables(
+    raw_lines: Iterable[str], stats: ConversionStats | None
+) -> Iterator[list[list[str]]]:
+    """Tableaux d'un export textuel, découpage chronométré si demandé."""
+
+    lines = _iter_clean_lines(raw_lines)
+    if stats is None:
+        yield from _iter_tables_from_lines(lines)
+        return
+    for table_lines in _iter_table_lines(lines):
+        with stats.timer(STAGE_SPLIT):
+            tables = list(_split_table(table_lines))
+        yield from tables
+
+
+def _iter_document_tables(
+    data: mmap.mmap,
+    pages: range | None,
+    progress: ProgressCallback | None = None,
+    stats: ConversionStats | None = None,
+) -> Iterator[list[list[str]]]:
+    """Produit une table par page d'un vrai PDF.
+
+    Les pages sont lues via l'index xref; si celui-ci est inexploitable, les
+    flux de contenu sont parcourus séquentiellement (une table par flux).
+    """
+
+    started = perf_counter()
+    try:
+        index = PdfPageIndex(data)
+    except ValueError as error:
+        if pages is not None:
+            raise
+        LOGGER.info("Index des pages indisponible (%s).", error)
+        contents = iter_content_streams(data)
+        total = 0
+    else:
+        contents = index.iter_page_contents(pages)
+        total = len(pages) if pages is not None else index.page_count
+    if stats is not None:
+        stats.add_elapsed(STAGE_READ, started)
+        contents = _iter_timed_contents(contents, stats)
+
+    for done, content in enumerate(contents, start=1):
+        if stats is None:
+            table = _content_to_table(content)
+        else:
+            with stats.timer(STAGE_SPLIT):
+                table = _content_to_table(content)
+            stats.lines_read += len(table)
+        if table:
+            yield table
+        if progress is not None:
+            progress(done, total)
+
+
+def _iter_timed_contents(
+    contents: Iterable[bytes], stats: ConversionStats
+) -> Iterator[bytes]:
+    """Relaie les flux de contenu en chronométrant leur lecture."""
+
+    iterator = iter(contents)
+    while True:
+        started = perf_counter()
+        content = next(iterator, None)
+        stats.add_elapsed(STAGE_READ, started)
+        if content is None:
+            return
+        stats.pages_read += 1
+        stats.bytes_read += len(content)
+        yield content
+
+
+def _content_to_table(content: bytes) -> list[list[str]]:
+    """Convertit le contenu d'une page en lignes de cellules.
+
+    Une ligne visuelle composée de plusieurs fragments donne directement ses
+    cellules; une ligne d'un seul fragment est découpée comme du texte.
+    """
+
+    visual_lines = list(iter_text_lines(content))
+    text_lines = [cells[0] for cells in visual_lines if len(cells) == 1]
+    text_rows = iter(_split_lines(text_lines))
+
+    table: list[list[str]] = []
+    for cells in visual_lines:
+        if len(cells) >= MIN_COLUMN_COUNT:
+            row: list[str] | None = cells[:MAX_ROW_FIELDS]
+        else:
+            row = next(text_rows)
+        if row:
+            table.append(row)
+    return table
+
+
+def _require_tables(
+    tables: Iterable[list[list[str]]],
+) -> Iterator[list[list[str]]]:
+    """Relaie les tableaux et signale l'absence totale de table."""
+
+    found = False
+    for table in tables:
+        found = True
+        yield table
+    if not found:
+        message = "Aucune table détectée dans le PDF."
+        raise ValueError(message)
 
 
 def _extract_tables_from_text(text: str) -> list[list[list[str]]]:
     """Construit des tableaux à partir de lignes textuelles séparées."""
 
-    tables: list[list[list[str]]] = []
-    current_table: list[list[str]] = []
-    for line in _iter_clean_lines(text):
+    lines = _iter_clean_lines(text.splitlines())
+    return list(_iter_tables_from_lines(lines))
+
+
+def _iter_tables_from_lines(
+    lines: Iterable[str],
+) -> Iterator[list[list[str]]]:
+    """Regroupe les lignes en tableaux délimités par des lignes vides."""
+
+    for table_lines in _iter_table_lines(lines):
+        yield from _split_table(table_lines)
+
+
+def _iter_table_lines(lines: Iterable[str]) -> Iterator[list[str]]:
+    """Regroupe les lignes non vides comprises entre deux lignes vides."""
+
+    current_lines: list[str] = []
+    for line in lines:
         if line == "":
-            _append_table_if_not_empty(tables, current_table)
-            current_table = []
+            if current_lines:
+                yield current_lines
+                current_lines = []
             continue
-        row = _split_row(line)
-        if row:
-            current_table.append(row)
-    _append_table_if_not_empty(tables, current_table)
-    return tables
+        current_lines.append(line)
+    if current_lines:
+        yield current_lines
 
 
-def _iter_clean_lines(text: str) -> Iterable[str]:
-    """Retourne les lignes nettoyées du texte fourni."""
+def _split_table(lines: list[str]) -> Iterator[list[list[str]]]:
+    """Découpe les lignes d'une table; ne produit rien si elle est vide."""
 
-    for raw_line in text.splitlines():
-        yield raw_line.strip()
+    table = [row for row in _split_lines(lines) if row]
+    if table:
+        yield table
 
 
-def _append_table_if_not_empty(
-    tables: list[list[list[str]]], table: list[list[str]]
-) -> None:
-    """Ajoute un tableau s'il contient au moins une ligne."""
+def _split_lines(lines: list[str]) -> list[list[str] | None]:
+    """Découpe les lignes d'une même table avec un dialecte commun.
 
-    if table:
-        tables.append(table)
+    Le dialecte est déduit une fois des premières lignes; une ligne dont le
+    nombre de cellules ne correspond pas est découpée individuellement.
+    """
+
+    dialect = _detect_dialect(lines)
+    if dialect is None:
+        return [_split_row(line) for line in lines]
+
+    separator = dialect.separator
+    column_count = dialect.column_count
+    rows: list[list[str] | None] = []
+    for line in lines:
+        cells = line.split(separator)
+        if len(cells) == column_count:
+            rows.append([cell.strip() for cell in cells[:MAX_ROW_FIELDS]])
+        else:
+            rows.append(_split_row(line))
+    return rows
+
+
+def _detect_dialect(lines: list[str]) -> TableDialect | None:
+    """Retient le séparateur donnant le nombre de colonnes le plus stable.
+
+    À égalité, l'ordre de LINE_SEPARATORS départage les candidats.
+    """
+
+    sample = lines[:DIALECT_SAMPLE_LINES]
+    if not sample:
+        return None
+    best: TableDialect | None = None
+    best_support = 0
+    for separator in LINE_SEPARATORS:
+        counts = [line.count(separator) + 1 for line in sample]
+        column_count = max(counts, key=counts.count)
+        support = counts.count(column_count)
+        if column_count < MIN_COLUMN_COUNT or support <= best_support:
+            continue
+        best = TableDialect(separator=separator, column_count=column_count)
+        best_support = support
+    return best
+
+
+def _iter_clean_lines(raw_lines: Iterable[str]) -> Iterator[str]:
+    """Retourne les lignes nettoyées, fins de ligne comprises."""
+
+    for raw_line in raw_lines:
+        yield raw_line.strip()
 
 
 def _split_row(line: str) -> list[str] | None:
@@ -0,0 +1,158 @@
+"""Profilage CPU et traçage mémoire d'une conversion.
+
+Ces outils joignent à un ticket de performance un profil reproductible:
+le profil cProfile complet est enregistré pour pstats ou snakeviz, et un
+résumé lisible (fonctions les plus coûteuses, pics mémoire par étape,
+principaux sites d'allocation) est écrit sur un flux texte.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import linecache
+import logging
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, TextIO
+
+from listedetenus.stats import STAGES, ConversionStats, MemoryProbe
+
+DEFAULT_TOP = 20
+TRACEMALLOC_FRAMES = 1
+KIBIBYTE = 1024
+LOGGER = logging.getLogger(__name__)
+
+
+@contextmanager
+def profiled(
+    output_path: Path, stream: TextIO, top: int = DEFAULT_TOP
+) -> Iterator[cProfile.Profile]:
+    """Exécute le bloc sous cProfile puis enregistre et résume le profil.
+
+    Rôle:
+        Profiler le bloc, écrire le profil complet dans output_path et
+        afficher les top fonctions par temps cumulé, y compris si le bloc
+        échoue.
+    Entrées:
+        output_path: fichier .pstats à créer.
+        stream: flux du résumé texte.
+        top: nombre de fonctions affichées.
+    Erreurs:
+        RuntimeError si le profil ne peut pas être enregistré. Si le bloc
+        a lui-même échoué, cet échec est seulement journalisé et
+        l'exception du bloc est propagée telle quelle.
+    """
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    except BaseException:
+        profiler.disable()
+        _report_after_failure(
+            _write_profile, profiler, output_path, stream, top
+        )
+        raise
+    profiler.disable()
+    _write_profile(profiler, output_path, stream, top)
+
+
+@contextmanager
+def memory_traced(
+    stats: ConversionStats, stream: TextIO, top: int = DEFAULT_TOP
+) -> Iterator[MemoryProbe]:
+    """Exécute le bloc sous tracemalloc et résume les allocations.
+
+    Rôle:
+        Brancher une sonde mémoire sur stats pour relever le pic de
+        chaque étape, puis afficher le pic global, les pics par étape et
+        les principaux sites d'allocation au plus haut de la mémoire.
+    Entrées:
+        stats: mesures transmises à la conversion exécutée dans le bloc.
+        stream: flux du résumé texte.
+        top: nombre de sites d'allocation affichés.
+    """
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    probe = MemoryProbe()
+    stats.memory = probe
+    try:
+        yield probe
+    except BaseException:
+        snapshot = _stop_probe(probe, was_tracing)
+        _report_after_failure(
+            _write_memory_report, probe, snapshot, stream, top
+        )
+        raise
+    snapshot = _stop_probe(probe, was_tracing)
+    _write_memory_report(probe, snapshot, stream, top)
+
+
+def _report_after_failure(report: Callable[..., None], *args: Any) -> None:
+    """Écrit un rapport après l'échec du bloc mesuré, sans le masquer."""
+
+    try:
+        report(*args)
+    except Exception as error:  # noqa: BLE001
+        LOGGER.error("Rapport de diagnostic non écrit: %s", error)
+
+
+def _write_profile(
+    profiler: cProfile.Profile, output_path: Path, stream: TextIO, top: int
+) -> None:
+    """Enregistre le profil complet et écrit le résumé sur le flux."""
+
+    try:
+        profiler.dump_stats(str(output_path))
+    except OSError as error:
+        message = f"Impossible d'écrire le profil: {error}."
+        raise RuntimeError(message) from error
+    stream.write(f"Profil enregistré: {output_path}\n")
+    report = pstats.Stats(profiler, stream=stream)
+    report.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+
+
+def _stop_probe(
+    probe: MemoryProbe, was_tracing: bool
+) -> tracemalloc.Snapshot:
+    """Arrête la sonde et retourne l'instantané du pic mémoire."""
+
+    probe.finish()
+    snapshot = probe.snapshot or tracemalloc.take_snapshot()
+    if not was_tracing:
+        tracemalloc.stop()
+    return snapshot
+
+
+def _write_memory_report(
+    probe: MemoryProbe,
+    snapshot: tracemalloc.Snapshot,
+    stream: TextIO,
+    top: int,
+) -> None:
+    """Écrit pics mémoire et sites d'allocation sur le flux."""
+
+    stream.write(f"Pic mémoire: {_kib(probe.overall_peak)}\n")
+    stream.write("Pic mémoire par étape:\n")
+    for stage in STAGES:
+        if stage in probe.peak_bytes:
+            stream.write(f"  {stage:<12} {_kib(probe.peak_bytes[stage])}\n")
+    statistics = snapshot.statistics("lineno")
+    stream.write(f"Principaux sites d'allocation (top {top}):\n")
+    for statistic in statistics[:top]:
+        frame = statistic.traceback[0]
+        source = linecache.getline(frame.filename, frame.lineno).strip()
+        stream.write(
+            f"  {_kib(statistic.size):>12} {statistic.count:>8} blocs  "
+            f"{frame.filename}:{frame.lineno}  {source}\n"
+        )
+
+
+def _kib(size: int) -> str:
+    """Taille lisible en Kio."""
+
+    return f"{size / KIBIBYTE:,.1f} Kio"
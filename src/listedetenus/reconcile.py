@@ -0,0 +1,462 @@
+"""Rapprochement approximatif de deux listes converties.
+
+Les deux listes sont comparées sans confronter chaque ligne à toutes les
+autres. Les lignes identiques une fois les noms normalisés (accents, casse,
+tirets) sont d'abord appariées une à une. Pour les autres, la liste de
+droite est indexée par date de naissance et trigrammes du nom complet:
+une ligne de gauche ne retient que les lignes de même date qui partagent
+assez de trigrammes pour rester à moins de max_distance modifications
+(filtre de comptage des q-grammes), et seules ces paires candidates sont
+évaluées par une distance d'édition bornée.
+
+Une paire est appariée lorsque chacune des deux lignes est, seule, la plus
+proche de l'autre; les autres paires au plus près sont ambiguës et à
+vérifier. Les lignes sans candidat restent non appariées.
+
+Usage:
+    python -m listedetenus.reconcile hier.csv aujourdhui.csv rapprochement.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import logging
+import os
+import tempfile
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from listedetenus.constants import CSV_HEADERS
+from listedetenus.index import normalize_name
+from listedetenus.models import Detainee
+from listedetenus.workflow import CSV_EXTENSION
+
+DEFAULT_MAX_DISTANCE = 2
+GRAM_SIZE = 3
+STATUS_MATCHED = "apparie"
+STATUS_AMBIGUOUS = "ambigu"
+STATUS_UNMATCHED = "non_apparie"
+OUTPUT_HEADERS = [
+    "statut",
+    "distance",
+    *(f"{column}_gauche" for column in CSV_HEADERS),
+    *(f"{column}_droite" for column in CSV_HEADERS),
+]
+LOG_FORMAT = "%(levelname)s | %(message)s"
+LOGGER = logging.getLogger(__name__)
+
+_PADDING = "\x00" * (GRAM_SIZE - 1)
+
+Pair = tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class ReconciliationSummary:
+    """Bilan d'un rapprochement.
+
+    Attributs:
+        matched: paires appariées (dont exact_matches à l'identique).
+        exact_matches: paires identiques une fois les noms normalisés.
+        ambiguous_left: lignes de gauche à plusieurs candidats possibles.
+        unmatched_left: lignes de gauche sans candidat.
+        unmatched_right: lignes de droite sans candidat.
+        output: CSV de rapprochement écrit.
+    """
+
+    matched: int
+    exact_matches: int
+    ambiguous_left: int
+    unmatched_left: int
+    unmatched_right: int
+    output: Path
+
+
+@dataclass(frozen=True)
+class Reconciliation:
+    """Résultat du rapprochement, en indices dans chaque liste.
+
+    Attributs:
+        matched: paires (gauche, droite, distance) appariées.
+        ambiguous: paires au plus près pour les lignes de gauche dont le
+            candidat n'est pas unique ou est disputé.
+        unmatched_left, unmatched_right: lignes sans paire.
+        exact_matches: nombre de paires de matched à distance nulle
+            trouvées avant le calcul des distances.
+    """
+
+    matched: list[Pair]
+    ambiguous: list[Pair]
+    unmatched_left: list[int]
+    unmatched_right: list[int]
+    exact_matches: int
+
+
+def reconcile(
+    left: list[Detainee],
+    right: list[Detainee],
+    *,
+    max_distance: int = DEFAULT_MAX_DISTANCE,
+) -> Reconciliation:
+    """Rapproche deux listes de détenus.
+
+    Rôle:
+        Apparier les lignes identiques, puis évaluer par distance d'édition
+        bornée les seules paires candidates de même date de naissance.
+    Entrées:
+        left, right: listes à rapprocher.
+        max_distance: nombre maximal de modifications (insertion,
+            suppression, substitution) entre les noms complets normalisés.
+    Sorties:
+        Reconciliation, paires triées par ligne de gauche.
+    Erreurs:
+        ValueError si max_distance est négatif.
+    """
+
+    if max_distance < 0:
+        raise ValueError("La distance maximale ne peut pas être négative.")
+    left_keys = [_comparison_key(detainee) for detainee in left]
+    right_keys = [_comparison_key(detainee) for detainee in right]
+
+    exact: dict[tuple[str, str], list[int]] = defaultdict(list)
+    for position in range(len(right_keys) - 1, -1, -1):
+        exact[right_keys[position]].append(position)
+    matched: list[Pair] = []
+    pending: list[int] = []
+    for position, key in enumerate(left_keys):
+        same = exact.get(key)
+        if same:
+            matched.append((position, same.pop(), 0))
+        else:
+            pending.append(position)
+    exact_matches = len(matched)
+    remaining = sorted(
+        position for positions in exact.values() for position in positions
+    )
+
+    pairs = _candidate_pairs(
+        [(position, left_keys[position]) for position in pending],
+        [(position, right_keys[position]) for position in remaining],
+        max_distance,
+    )
+    fuzzy, ambiguous = _resolve(pairs)
+    matched.extend(fuzzy)
+    matched.sort()
+
+    paired_left = {pair[0] for pair in matched}
+    paired_left.update(pair[0] for pair in ambiguous)
+    paired_right = {pair[1] for pair in matched}
+    paired_right.update(pair[1] for pair in ambiguous)
+    return Reconciliation(
+        matched=matched,
+        ambiguous=ambiguous,
+        unmatched_left=[
+            position for position in pending if position not in paired_left
+        ],
+        unmatched_right=[
+            position
+            for position in remaining
+            if position not in paired_right
+        ],
+        exact_matches=exact_matches,
+    )
+
+
+def reconcile_csv(
+    left_csv: Path,
+    right_csv: Path,
+    output_csv: Path,
+    *,
+    max_distance: int = DEFAULT_MAX_DISTANCE,
+) -> ReconciliationSummary:
+    """Rapproche deux CSV convertis et écrit le résultat ligne à ligne.
+
+    Rôle:
+        Lire les deux listes, les rapprocher puis écrire un CSV avec le
+        statut, la distance et les lignes de gauche et de droite.
+    Entrées:
+        left_csv, right_csv: CSV avec les colonnes nom, prenom,
+            date_naissance.
+        output_csv: CSV de rapprochement, remplacé de manière atomique.
+        max_distance: voir reconcile.
+    Sorties:
+        ReconciliationSummary.
+    Erreurs:
+        ValueError si une entrée n'a pas les colonnes attendues ou si la
+            sortie n'a pas l'extension .csv.
+        RuntimeError si un fichier ne peut être lu ou écrit.
+    """
+
+    output_csv = Path(output_csv).expanduser().resolve()
+    if output_csv.suffix.lower() != CSV_EXTENSION:
+        raise ValueError("Le rapprochement doit avoir l'extension .csv.")
+    left = load_detainees(left_csv)
+    right = load_detainees(right_csv)
+    result = reconcile(left, right, max_distance=max_distance)
+    _write_output(output_csv, _iter_output_rows(result, left, right))
+    return ReconciliationSummary(
+        matched=len(result.matched),
+        exact_matches=result.exact_matches,
+        ambiguous_left=len({pair[0] for pair in result.ambiguous}),
+        unmatched_left=len(result.unmatched_left),
+        unmatched_right=len(result.unmatched_right),
+        output=output_csv,
+    )
+
+
+def load_detainees(csv_path: Path) -> list[Detainee]:
+    """Lit un CSV produit par l'outil.
+
+    Erreurs:
+        ValueError si les colonnes attendues sont absentes ou si une ligne
+        n'a pas trois colonnes (le numéro de ligne est indiqué).
+        RuntimeError si le fichier est illisible.
+    """
+
+    try:
+        with Path(csv_path).open("r", encoding="utf-8", newline="") as handle:
+            reader = csv.reader(handle)
+            header = [cell.strip().lower() for cell in next(reader, [])]
+            if header != CSV_HEADERS:
+                message = (
+                    f"{Path(csv_path).name} doit contenir les colonnes "
+                    f"{', '.join(CSV_HEADERS)}."
+                )
+                raise ValueError(message)
+            detainees: list[Detainee] = []
+            for line in reader:
+                if not line:
+                    continue
+                if len(line) != len(CSV_HEADERS):
+                    message = (
+                        f"Ligne {reader.line_num} de {Path(csv_path).name}: "
+                        f"{len(CSV_HEADERS)} colonnes attendues."
+                    )
+                    raise ValueError(message)
+                detainees.append(Detainee(*line))
+            return detainees
+    except (OSError, csv.Error, UnicodeDecodeError) as error:
+        message = f"Impossible de lire le CSV: {error}."
+        raise RuntimeError(message) from error
+
+
+def bounded_distance(first: str, second: str, limit: int) -> int:
+    """Distance de Levenshtein, ou limit + 1 si elle dépasse limit.
+
+    Seule la bande diagonale de largeur 2 * limit + 1 est calculée, et le
+    calcul s'arrête dès qu'une ligne entière dépasse la borne.
+    """
+
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    if len(first) > len(second):
+        first, second = second, first
+    beyond = limit + 1
+    previous = list(range(len(second) + 1))
+    for row, char in enumerate(first, 1):
+        start = max(1, row - limit)
+        end = min(len(second), row + limit)
+        current = [beyond] * (len(second) + 1)
+        current[0] = row if row <= limit else beyond
+        best = current[0]
+        for column in range(start, end + 1):
+            cost = previous[column - 1] + (char != second[column - 1])
+            cost = min(cost, previous[column] + 1, current[column - 1] + 1)
+            current[column] = cost
+            if cost < best:
+                best = cost
+        if best > limit:
+            return beyond
+        previous = current
+    return min(previous[-1], beyond)
+
+
+def _comparison_key(detainee: Detainee) -> tuple[str, str]:
+    """Date de naissance et nom complet normalisé d'un détenu."""
+
+    name = f"{detainee.nom} {detainee.prenom}".replace("-", " ")
+    return detainee.date_naissance, normalize_name(name)
+
+
+def _grams(name: str) -> set[str]:
+    """Trigrammes distincts du nom complété aux deux extrémités."""
+
+    padded = f"{_PADDING}{name}{_PADDING}"
+    return {
+        padded[start : start + GRAM_SIZE]
+        for start in range(len(padded) - GRAM_SIZE + 1)
+    }
+
+
+def _candidate_pairs(
+    left: Iterable[tuple[int, tuple[str, str]]],
+    right: Iterable[tuple[int, tuple[str, str]]],
+    max_distance: int,
+) -> Iterator[Pair]:
+    """Paires de même date à au plus max_distance modifications.
+
+    Chaque modification fait disparaître au plus GRAM_SIZE trigrammes: une
+    ligne de droite doit donc partager au moins |trigrammes| -
+    max_distance * GRAM_SIZE trigrammes avec celle de gauche pour être
+    évaluée.
+    """
+
+    names: dict[int, str] = {}
+    postings: dict[tuple[str, str], list[int]] = defaultdict(list)
+    for position, (birth_date, name) in right:
+        names[position] = name
+        for gram in _grams(name):
+            postings[(birth_date, gram)].append(position)
+
+    for position, (birth_date, name) in left:
+        grams = _grams(name)
+        shared: dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in postings.get((birth_date, gram), ()):
+                shared[candidate] += 1
+        required = max(1, len(grams) - max_distance * GRAM_SIZE)
+        for candidate, count in shared.items():
+            if count < required:
+                continue
+            distance = bounded_distance(
+                name, names[candidate], max_distance
+            )
+            if distance <= max_distance:
+                yield position, candidate, distance
+
+
+def _resolve(pairs: Iterable[Pair]) -> tuple[list[Pair], list[Pair]]:
+    """Sépare les paires appariées des paires ambiguës.
+
+    Une paire est appariée si chaque ligne est l'unique plus proche de
+    l'autre. Pour les autres lignes de gauche, toutes les paires à la
+    distance minimale sont ambiguës.
+    """
+
+    best_left: dict[int, list[Pair]] = {}
+    best_right: dict[int, list[Pair]] = {}
+    for pair in pairs:
+        for best, position in ((best_left, pair[0]), (best_right, pair[1])):
+            current = best.get(position)
+            if current is None or pair[2] < current[0][2]:
+                best[position] = [pair]
+            elif pair[2] == current[0][2]:
+                current.append(pair)
+
+    matched: list[Pair] = []
+    ambiguous: list[Pair] = []
+    for position in sorted(best_left):
+        closest = best_left[position]
+        if len(closest) == 1 and best_right[closest[0][1]] == closest:
+            matched.append(closest[0])
+        else:
+            ambiguous.extend(sorted(closest))
+    return matched, ambiguous
+
+
+def _iter_output_rows(
+    result: Reconciliation, left: list[Detainee], right: list[Detainee]
+) -> Iterator[list[str]]:
+    """Lignes du CSV: appariées, ambiguës puis non appariées."""
+
+    empty = [""] * len(CSV_HEADERS)
+    for status, pairs in (
+        (STATUS_MATCHED, result.matched),
+        (STATUS_AMBIGUOUS, result.ambiguous),
+    ):
+        for left_position, right_position, distance in pairs:
+            yield [
+                status,
+                str(distance),
+                *_fields(left[left_position]),
+                *_fields(right[right_position]),
+            ]
+    for position in result.unmatched_left:
+        yield [STATUS_UNMATCHED, "", *_fields(left[position]), *empty]
+    for position in result.unmatched_right:
+        yield [STATUS_UNMATCHED, "", *empty, *_fields(right[position])]
+
+
+def _fields(detainee: Detainee) -> tuple[str, str, str]:
+    """Colonnes CSV d'un détenu."""
+
+    return detainee.nom, detainee.prenom, detainee.date_naissance
+
+
+def _write_output(output_csv: Path, rows: Iterable[list[str]]) -> None:
+    """Écrit le CSV de rapprochement via un fichier temporaire."""
+
+    try:
+        output_csv.parent.mkdir(parents=True, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(
+            dir=output_csv.parent, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(
+                handle, "w", encoding="utf-8", newline=""
+            ) as stream:
+                writer = csv.writer(stream)
+                writer.writerow(OUTPUT_HEADERS)
+                writer.writerows(rows)
+            os.replace(temporary, output_csv)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+    except OSError as error:
+        message = f"Impossible d'écrire le rapprochement: {error}."
+        raise RuntimeError(message) from error
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Point d'entrée: rapproche deux CSV convertis."""
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Rapproche deux listes converties malgré les variantes "
+            "d'orthographe des noms"
+        )
+    )
+    parser.add_argument("gauche", type=Path, help="Première liste (CSV)")
+    parser.add_argument("droite", type=Path, help="Seconde liste (CSV)")
+    parser.add_argument("sortie", type=Path, help="CSV de rapprochement")
+    parser.add_argument(
+        "--max-distance",
+        type=int,
+        default=DEFAULT_MAX_DISTANCE,
+        metavar="N",
+        help=(
+            "Modifications tolérées entre les noms complets "
+            f"(défaut: {DEFAULT_MAX_DISTANCE})"
+        ),
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    try:
+        summary = reconcile_csv(
+            args.gauche,
+            args.droite,
+            args.sortie,
+            max_distance=args.max_distance,
+        )
+    except (ValueError, RuntimeError) as error:
+        LOGGER.error("Échec: %s", error)
+        return 1
+
+    LOGGER.info(
+        "Rapprochement: %d apparié(s) dont %d à l'identique, %d ambigu(s), "
+        "%d non apparié(s) à gauche, %d à droite.",
+        summary.matched,
+        summary.exact_matches,
+        summary.ambiguous_left,
+        summary.unmatched_left,
+        summary.unmatched_right,
+    )
+    LOGGER.info("Écrit: %s", summary.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,381 @@
+"""Service local de conversion avec des processus de travail préchauffés.
+
+Les outils qui appelaient la CLI pour chaque document paient à chaque fois
+le démarrage de l'interpréteur et les imports. Ce service HTTP, limité par
+défaut à 127.0.0.1, garde un pool de processus déjà initialisés:
+
+- POST /convert avec le PDF en corps de requête renvoie le CSV, transmis
+  par blocs;
+- GET /health répond "ok".
+
+La file d'attente est bornée: au-delà de queue_size requêtes acceptées en
+même temps, le service répond 503 immédiatement (contre-pression) au lieu
+d'accumuler les documents. Le corps de la requête est copié par blocs dans
+un fichier temporaire, sans être chargé en mémoire. Une conversion qui
+dépasse le délai (attente d'un processus libre non comprise) renvoie 504:
+le processus bloqué est arrêté et le pool remplacé.
+
+Usage:
+    python -m listedetenus.server --port 8765 --workers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import BinaryIO
+
+from listedetenus.batch import convert_file
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_TIMEOUT = 120.0
+MAX_BODY_SIZE = 256 * 1024 * 1024
+COPY_CHUNK_SIZE = 64 * 1024
+RETRY_AFTER_SECONDS = 1
+LOG_FORMAT = "%(levelname)s | %(message)s"
+LOGGER = logging.getLogger(__name__)
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """Serveur HTTP de conversion adossé à un pool de processus.
+
+    Rôle:
+        Recevoir des PDF, les convertir dans des processus préchauffés et
+        renvoyer le CSV, avec une file bornée et un délai par requête.
+    Entrées:
+        address: couple (hôte, port); le port 0 choisit un port libre.
+        workers: nombre de processus de conversion.
+        queue_size: nombre maximal de requêtes acceptées simultanément
+            (en cours ou en attente d'un processus).
+        timeout: délai maximal d'une conversion, en secondes, compté à
+            partir du moment où un processus est disponible.
+    Erreurs:
+        ValueError si les paramètres sont invalides.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = (DEFAULT_HOST, DEFAULT_PORT),
+        *,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        if workers < 1 or queue_size < 1 or timeout <= 0:
+            raise ValueError("Paramètres du service invalides.")
+        super().__init__(address, ConversionRequestHandler)
+        self.workers = workers
+        self.conversion_timeout = timeout
+        self.slots = threading.BoundedSemaphore(queue_size)
+        self.idle_workers = threading.BoundedSemaphore(workers)
+        self._pool_lock = threading.Lock()
+        self.executor = self._start_pool()
+
+    @property
+    def url(self) -> str:
+        """Adresse de base du service."""
+
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def server_close(self) -> None:
+        """Ferme le socket puis arrête les processus de conversion."""
+
+        super().server_close()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def convert(self, pdf_path: Path, csv_path: Path) -> Path:
+        """Convertit un PDF dans le pool; retourne le CSV écrit.
+
+        L'attente d'un processus libre n'entre pas dans le délai. Un pool
+        rompu (processus tué, par exemple lors du remplacement d'un pool
+        bloqué) est reconstruit et la conversion retentée une fois.
+
+        Erreurs:
+            TimeoutError si le délai est dépassé, RuntimeError si la
+            conversion échoue.
+        """
+
+        with self.idle_workers:
+            try:
+                error = self._run_in_pool(pdf_path, csv_path)
+            except BrokenProcessPool:
+                try:
+                    error = self._run_in_pool(pdf_path, csv_path)
+                except BrokenProcessPool as broken:
+                    message = "Processus de conversion interrompu."
+                    raise RuntimeError(message) from broken
+        if error is not None:
+            raise RuntimeError(error)
+        return csv_path
+
+    def _run_in_pool(self, pdf_path: Path, csv_path: Path) -> str | None:
+        """Exécute une conversion; remplace le pool s'il est inutilisable."""
+
+        executor = self.executor
+        try:
+            future = executor.submit(convert_file, pdf_path, csv_path)
+            return future.result(timeout=self.conversion_timeout)
+        except FutureTimeoutError as timeout_error:
+            LOGGER.warning("Délai dépassé, pool de conversion remplacé.")
+            self._replace_pool(executor)
+            message = "Délai de conversion dépassé."
+            raise TimeoutError(message) from timeout_error
+        except RuntimeError as error:
+            # BrokenProcessPool, ou pool déjà remplacé par un autre thread.
+            LOGGER.warning("Pool de conversion inutilisable: %s", error)
+            self._replace_pool(executor)
+            raise BrokenProcessPool(str(error)) from error
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        """Démarre un pool et attend que chaque processus soit prêt."""
+
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        warm_ups = [executor.submit(_warm_up) for _ in range(self.workers)]
+        for future in warm_ups:
+            future.result()
+        return executor
+
+    def _replace_pool(self, failed: ProcessPoolExecutor) -> None:
+        """Arrête les processus d'un pool bloqué ou rompu et le remplace.
+
+        Les conversions encore en cours dans ce pool échouent avec
+        BrokenProcessPool et sont retentées par convert sur le nouveau.
+        """
+
+        with self._pool_lock:
+            if self.executor is not failed:
+                return
+            self.executor = self._start_pool()
+        processes = getattr(failed, "_processes", None) or {}
+        for process in list(processes.values()):
+            process.terminate()
+        failed.shutdown(wait=False, cancel_futures=True)
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """Traite les requêtes /convert et /health."""
+
+    server: ConversionServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Répond à la sonde de disponibilité."""
+
+        if self.path != "/health":
+            self._send_text(HTTPStatus.NOT_FOUND, "Ressource inconnue.")
+            return
+        self._send_text(HTTPStatus.OK, "ok")
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Convertit le PDF reçu et renvoie le CSV."""
+
+        if self.path != "/convert":
+            self._send_text(HTTPStatus.NOT_FOUND, "Ressource inconnue.")
+            return
+        length = self._content_length()
+        if length is None:
+            return
+        with tempfile.TemporaryDirectory(prefix="listedetenus-") as tmp:
+            if not self.server.slots.acquire(blocking=False):
+                self._discard_body(length)
+                self._send_text(
+                    HTTPStatus.SERVICE_UNAVAILABLE,
+                    "File de conversion pleine.",
+                    {"Retry-After": str(RETRY_AFTER_SECONDS)},
+                )
+                return
+            # Le créneau est rendu avant l'envoi de la réponse: un client
+            # qui enchaîne ses requêtes ne voit jamais sa propre requête
+            # précédente occuper la file.
+            try:
+                status, message, csv_path = self._convert_body(
+                    length, Path(tmp)
+                )
+            finally:
+                self.server.slots.release()
+            if csv_path is None:
+                self._send_text(status, message)
+            else:
+                self._send_csv(csv_path)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Redirige le journal d'accès vers logging."""
+
+        LOGGER.debug("%s - %s", self.address_string(), format % args)
+
+    def _convert_body(
+        self, length: int, work_dir: Path
+    ) -> tuple[HTTPStatus, str, Path | None]:
+        """Enregistre le corps sur disque puis le convertit.
+
+        Sorties:
+            Statut et message d'erreur, ou chemin du CSV en cas de succès.
+        """
+
+        pdf_path = work_dir / "document.pdf"
+        body = _BoundedReader(self.rfile, length)
+        with pdf_path.open("wb") as handle:
+            shutil.copyfileobj(body, handle, COPY_CHUNK_SIZE)
+        if body.remaining:
+            self.close_connection = True
+            return HTTPStatus.BAD_REQUEST, "Corps de requête incomplet.", None
+        try:
+            csv_path = self.server.convert(
+                pdf_path, work_dir / "document.csv"
+            )
+        except TimeoutError as error:
+            return HTTPStatus.GATEWAY_TIMEOUT, str(error), None
+        except RuntimeError as error:
+            return HTTPStatus.UNPROCESSABLE_ENTITY, str(error), None
+        return HTTPStatus.OK, "", csv_path
+
+    def _send_csv(self, csv_path: Path) -> None:
+        """Transmet le CSV par blocs."""
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Length", str(csv_path.stat().st_size))
+        self.end_headers()
+        with csv_path.open("rb") as handle:
+            shutil.copyfileobj(handle, self.wfile, COPY_CHUNK_SIZE)
+
+    def _content_length(self) -> int | None:
+        """Lit et valide Content-Length; répond en cas d'erreur."""
+
+        raw_length = self.headers.get("Content-Length")
+        if raw_length is None:
+            self._send_text(
+                HTTPStatus.LENGTH_REQUIRED, "Content-Length requis."
+            )
+            return None
+        try:
+            length = int(raw_length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_text(
+                HTTPStatus.BAD_REQUEST, "Content-Length invalide."
+            )
+            return None
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            self._send_text(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                "Document trop volumineux.",
+            )
+            return None
+        return length
+
+    def _discard_body(self, length: int) -> None:
+        """Consomme un corps refusé pour garder la connexion utilisable."""
+
+        body = _BoundedReader(self.rfile, length)
+        while body.read(COPY_CHUNK_SIZE):
+            pass
+
+    def _send_text(
+        self,
+        status: HTTPStatus,
+        message: str,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Envoie une réponse texte courte."""
+
+        body = f"{message}\n".encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _BoundedReader:
+    """Lecture limitée aux length premiers octets d'un flux.
+
+    Sur une connexion persistante, la fin du corps n'est pas une fin de
+    flux: shutil.copyfileobj s'arrête ainsi à Content-Length au lieu
+    d'attendre la fermeture de la connexion.
+    """
+
+    def __init__(self, stream: BinaryIO, length: int) -> None:
+        self._stream = stream
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        """Lit au plus size octets sans dépasser la fin du corps."""
+
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        chunk = self._stream.read(size)
+        self.remaining -= len(chunk)
+        return chunk
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Démarre le service jusqu'à interruption."""
+
+    parser = argparse.ArgumentParser(
+        description="Service local de conversion PDF vers CSV"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE)
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="Délai maximal d'une conversion en secondes",
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format=LOG_FORMAT,
+    )
+
+    try:
+        server = ConversionServer(
+            (args.host, args.port),
+            workers=args.workers,
+            queue_size=args.queue_size,
+            timeout=args.timeout,
+        )
+    except (OSError, ValueError) as error:
+        LOGGER.error("Échec: %s", error)
+        return 1
+
+    with server:
+        LOGGER.info("Service de conversion sur %s", server.url)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            LOGGER.info("Service arrêté.")
+    return 0
+
+
+def _warm_up() -> None:
+    """Tâche vide: démarre un processus et charge ses modules."""
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
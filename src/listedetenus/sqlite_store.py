@@ -0,0 +1,291 @@
+"""Stockage des détenus extraits dans une base SQLite.
+
+Chaque conversion enregistre une liste (fichier source et date de la
+liste) dans la table listes, et ses lignes dans la table detenus. Les
+lignes sont insérées par executemany, lot par lot, dans une seule
+transaction: une conversion interrompue laisse la base inchangée. En mode
+remplacement, les index sont reconstruits après le chargement, ce qui est
+bien plus rapide que de les tenir à jour ligne par ligne; en mode
+mise à jour (upsert), la base accumule les listes successives et une liste
+déjà chargée (même source, même date) est remplacée.
+
+Les recherches par nom et prénom ou par date de naissance passent par les
+index detenus_nom_prenom et detenus_date_naissance.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+from listedetenus.models import DetaineeBatch
+from listedetenus.stats import STAGE_WRITE, ConversionStats
+
+CACHE_SIZE_KIB = 262144
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listes (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    date_liste TEXT NOT NULL,
+    lignes INTEGER NOT NULL DEFAULT 0,
+    chargee_le TEXT NOT NULL,
+    UNIQUE (source, date_liste)
+);
+CREATE TABLE IF NOT EXISTS detenus (
+    liste_id INTEGER NOT NULL REFERENCES listes (id),
+    nom TEXT NOT NULL,
+    prenom TEXT NOT NULL,
+    date_naissance TEXT NOT NULL
+);
+CREATE VIEW IF NOT EXISTS detenus_listes AS
+    SELECT d.nom, d.prenom, d.date_naissance, l.source, l.date_liste
+    FROM detenus AS d JOIN listes AS l ON l.id = d.liste_id;
+"""
+_INDEXES = {
+    "detenus_nom_prenom": "detenus (nom, prenom)",
+    "detenus_date_naissance": "detenus (date_naissance)",
+    "detenus_liste": "detenus (liste_id)",
+}
+_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    f"PRAGMA cache_size = -{CACHE_SIZE_KIB}",
+    "PRAGMA foreign_keys = OFF",
+)
+
+
+@dataclass(frozen=True)
+class StoredDetainee:
+    """Ligne retrouvée dans la base, avec la liste qui la contient.
+
+    Attributs:
+        nom, prenom, date_naissance: comme dans le CSV.
+        source: nom du fichier PDF converti.
+        date_liste: date de la liste, au format ISO.
+    """
+
+    nom: str
+    prenom: str
+    date_naissance: str
+    source: str
+    date_liste: str
+
+
+def write_sqlite_batches(
+    db_path: Path,
+    batches: Iterable[DetaineeBatch],
+    *,
+    source: str,
+    list_date: date,
+    upsert: bool = False,
+    stats: ConversionStats | None = None,
+) -> int:
+    """Charge des lots de détenus dans une base SQLite.
+
+    Rôle:
+        Enregistrer la liste (source, list_date) et insérer ses lignes par
+        executemany, en une transaction.
+    Entrées:
+        db_path: fichier de la base, créé au besoin (journal WAL).
+        batches: itérable de DetaineeBatch, consommé au fil du chargement.
+        source: nom du fichier d'origine, conservé avec la liste.
+        list_date: date de la liste.
+        upsert: si faux, la base ne contient plus que cette liste; si vrai,
+            la liste s'ajoute aux précédentes et remplace une liste de même
+            source et de même date.
+        stats: mesures complétées du temps de chargement (index compris) et
+            du nombre de lignes écrites.
+    Sorties:
+        Nombre de lignes insérées.
+    Erreurs:
+        RuntimeError en cas d'échec SQLite; la transaction est annulée. Les
+        erreurs levées par l'itérable sont propagées telles quelles, après
+        annulation.
+    """
+
+    try:
+        connection = _connect(db_path)
+    except sqlite3.Error as error:
+        message = f"Impossible d'ouvrir la base SQLite: {error}."
+        raise RuntimeError(message) from error
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            inserted = _load(
+                connection, batches, source, list_date, upsert, stats
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+    except sqlite3.Error as error:
+        message = f"Impossible d'écrire la base SQLite: {error}."
+        raise RuntimeError(message) from error
+    finally:
+        connection.close()
+    return inserted
+
+
+def find_detainees(
+    db_path: Path,
+    *,
+    nom: str | None = None,
+    prenom: str | None = None,
+    date_naissance: str | None = None,
+) -> list[StoredDetainee]:
+    """Recherche des détenus par nom, prénom et date de naissance.
+
+    Rôle:
+        Interroger la base à l'aide de ses index, sans parcours complet.
+    Entrées:
+        db_path: base écrite par write_sqlite_batches.
+        nom, prenom: valeurs exactes, telles qu'écrites dans le CSV.
+        date_naissance: date ISO AAAA-MM-JJ.
+    Sorties:
+        Lignes trouvées, triées par date de liste, nom et prénom.
+    Erreurs:
+        ValueError si ni nom ni date de naissance ne sont fournis, ou si
+            un prénom est donné sans nom (l'index commence par le nom).
+        RuntimeError en cas d'échec SQLite.
+    """
+
+    query, parameters = _lookup_query(nom, prenom, date_naissance)
+    try:
+        read_only = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        connection = sqlite3.connect(read_only, uri=True)
+        try:
+            rows = connection.execute(query, parameters).fetchall()
+        finally:
+            connection.close()
+    except sqlite3.Error as error:
+        message = f"Impossible de lire la base SQLite: {error}."
+        raise RuntimeError(message) from error
+    return [StoredDetainee(*row) for row in rows]
+
+
+def _lookup_query(
+    nom: str | None, prenom: str | None, date_naissance: str | None
+) -> tuple[str, list[str]]:
+    """Requête de recherche et ses paramètres."""
+
+    if nom is None and date_naissance is None:
+        message = "Indiquez au moins un nom ou une date de naissance."
+        raise ValueError(message)
+    if prenom is not None and nom is None:
+        raise ValueError("Un prénom ne se recherche qu'avec un nom.")
+    criteria = (
+        ("nom", nom),
+        ("prenom", prenom),
+        ("date_naissance", date_naissance),
+    )
+    conditions = []
+    parameters = []
+    for column, value in criteria:
+        if value is not None:
+            conditions.append(f"d.{column} = ?")
+            parameters.append(value)
+    query = (
+        "SELECT d.nom, d.prenom, d.date_naissance, l.source, l.date_liste "
+        "FROM detenus AS d JOIN listes AS l ON l.id = d.liste_id "
+        f"WHERE {' AND '.join(conditions)} "
+        "ORDER BY l.date_liste, d.nom, d.prenom"
+    )
+    return query, parameters
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    """Ouvre la base en mode autocommit, journal WAL, schéma en place."""
+
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        connection.execute("PRAGMA journal_mode = WAL")
+        for pragma in _PRAGMAS:
+            connection.execute(pragma)
+        connection.executescript(_SCHEMA)
+    except BaseException:
+        connection.close()
+        raise
+    return connection
+
+
+def _load(
+    connection: sqlite3.Connection,
+    batches: Iterable[DetaineeBatch],
+    source: str,
+    list_date: date,
+    upsert: bool,
+    stats: ConversionStats | None,
+) -> int:
+    """Corps de la transaction de chargement."""
+
+    if upsert:
+        _create_indexes(connection)
+    else:
+        # Tout est remplacé: index reconstruits en une passe à la fin.
+        for name in _INDEXES:
+            connection.execute(f"DROP INDEX IF EXISTS {name}")
+        connection.execute("DELETE FROM detenus")
+        connection.execute("DELETE FROM listes")
+    list_id = _register_list(connection, source, list_date)
+    # list_id est un entier issu de la base: l'inclure dans la requête
+    # évite de construire un tuple par ligne.
+    insert = (
+        "INSERT INTO detenus (liste_id, nom, prenom, date_naissance) "
+        f"VALUES ({int(list_id)}, ?, ?, ?)"
+    )
+    inserted = 0
+    for batch in batches:
+        if stats is None:
+            connection.executemany(insert, batch.iter_rows())
+        else:
+            with stats.timer(STAGE_WRITE):
+                connection.executemany(insert, batch.iter_rows())
+            stats.rows_written += len(batch)
+        inserted += len(batch)
+    connection.execute(
+        "UPDATE listes SET lignes = ? WHERE id = ?", (inserted, list_id)
+    )
+    if not upsert:
+        if stats is None:
+            _create_indexes(connection)
+        else:
+            with stats.timer(STAGE_WRITE):
+                _create_indexes(connection)
+    return inserted
+
+
+def _register_list(
+    connection: sqlite3.Connection, source: str, list_date: date
+) -> int:
+    """Crée ou vide la liste (source, list_date) et retourne son id."""
+
+    loaded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    row = connection.execute(
+        "SELECT id FROM listes WHERE source = ? AND date_liste = ?",
+        (source, list_date.isoformat()),
+    ).fetchone()
+    if row is not None:
+        connection.execute("DELETE FROM detenus WHERE liste_id = ?", row)
+        connection.execute(
+            "UPDATE listes SET chargee_le = ? WHERE id = ?",
+            (loaded_at, row[0]),
+        )
+        return row[0]
+    cursor = connection.execute(
+        "INSERT INTO listes (source, date_liste, chargee_le) VALUES (?, ?, ?)",
+        (source, list_date.isoformat(), loaded_at),
+    )
+    return cursor.lastrowid
+
+
+def _create_indexes(connection: sqlite3.Connection) -> None:
+    """Crée les index de recherche absents."""
+
+    for name, definition in _INDEXES.items():
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"
+        )
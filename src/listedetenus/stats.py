@@ -0,0 +1,188 @@
+"""Mesures d'une conversion: temps par étape et bilan des lignes.
+
+Les compteurs sont agrégés (une entrée par motif de rejet, pas une ligne
+de journal par ligne ignorée) et les temps ne mesurent que le travail
+propre à chaque étape, même lorsque les étapes s'enchaînent en flux.
+Sans objet de mesure, le pipeline ne chronomètre rien. Lorsque tracemalloc
+est actif, une sonde mémoire facultative relève le pic atteint à la fin de
+chaque étape chronométrée.
+
+L'objet de mesure est fourni par l'appelant plutôt que retourné par la
+conversion: convert_pdf_to_csv retourne déjà le chemin du CSV, dont
+dépendent le mode lot, la surveillance, le service et l'API asyncio; et
+un objet transmis reste consultable lorsque la conversion échoue ou est
+annulée, ce qui est justement le cas à diagnostiquer.
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Iterator
+
+STAGE_READ = "lecture"
+STAGE_DECODE = "decodage"
+STAGE_SPLIT = "decoupage"
+STAGE_HEADERS = "entetes"
+STAGE_DATES = "dates"
+STAGE_WRITE = "ecriture"
+STAGES = (
+    STAGE_READ,
+    STAGE_DECODE,
+    STAGE_SPLIT,
+    STAGE_HEADERS,
+    STAGE_DATES,
+    STAGE_WRITE,
+)
+
+REJECT_SHORT_ROW = "longueur_insuffisante"
+REJECT_MISSING_FIELD = "champ_manquant"
+REJECT_INVALID_DATE = "date_invalide"
+
+SNAPSHOT_GROWTH = 1.25
+
+
+def _empty_timings() -> dict[str, float]:
+    """Temps nuls pour chaque étape."""
+
+    return dict.fromkeys(STAGES, 0.0)
+
+
+class MemoryProbe:
+    """Pics mémoire par étape, relevés avec tracemalloc.
+
+    Rôle:
+        À la fin de chaque étape chronométrée, attribuer à l'étape le pic
+        atteint depuis le relevé précédent, puis remettre le pic à zéro.
+        Un instantané des allocations est conservé chaque fois que la
+        mémoire vivante dépasse de 25 % le précédent, pour connaître les
+        sites d'allocation au plus fort de la conversion.
+    Entrées:
+        Aucune; tracemalloc doit être démarré par l'appelant.
+    Attributs:
+        peak_bytes: pic par étape, en octets.
+        overall_peak: pic global de la conversion, en octets.
+        snapshot: instantané pris au plus haut niveau de mémoire vivante.
+    """
+
+    def __init__(self) -> None:
+        self.peak_bytes: dict[str, int] = {}
+        self.overall_peak = 0
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self._snapshot_size = 0
+        tracemalloc.reset_peak()
+
+    def observe(self, stage: str) -> None:
+        """Attribue à stage le pic atteint depuis le dernier relevé."""
+
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        if peak > self.peak_bytes.get(stage, 0):
+            self.peak_bytes[stage] = peak
+        self.overall_peak = max(self.overall_peak, peak)
+        if current > self._snapshot_size * SNAPSHOT_GROWTH:
+            self.snapshot = tracemalloc.take_snapshot()
+            self._snapshot_size = current
+
+    def finish(self) -> None:
+        """Relève le pic atteint après la dernière étape."""
+
+        self.overall_peak = max(
+            self.overall_peak, tracemalloc.get_traced_memory()[1]
+        )
+
+
+@dataclass
+class ConversionStats:
+    """Bilan mesuré d'une conversion, rempli au fil du pipeline.
+
+    Rôle:
+        Créé par l'appelant et transmis à convert_pdf_to_csv (paramètre
+        stats), l'objet est complété par la lecture, l'analyse et
+        l'écriture puis consulté par l'appelant, y compris après un échec.
+    Attributs:
+        seconds: secondes passées dans chaque étape de STAGES; en analyse
+            parallèle, somme des temps des processus.
+        total_seconds: durée totale de la conversion.
+        bytes_read: octets décodés (export textuel) ou de flux de contenu.
+        lines_read: lignes de texte lues.
+        pages_read: pages ou flux de contenu parcourus.
+        tables_read: tables reçues par l'analyse.
+        tables_skipped: tables écartées faute d'entêtes.
+        rows_accepted: lignes valides extraites.
+        rows_rejected: lignes écartées, par motif.
+        rows_written: lignes écrites dans le CSV.
+        cache_hit: vrai si le résultat provient du cache de conversions.
+        memory: sonde mémoire facultative, notifiée à la fin de chaque
+            étape chronométrée.
+    """
+
+    seconds: dict[str, float] = field(default_factory=_empty_timings)
+    total_seconds: float = 0.0
+    bytes_read: int = 0
+    lines_read: int = 0
+    pages_read: int = 0
+    tables_read: int = 0
+    tables_skipped: int = 0
+    rows_accepted: int = 0
+    rows_rejected: Counter[str] = field(default_factory=Counter)
+    rows_written: int = 0
+    cache_hit: bool = False
+    memory: MemoryProbe | None = field(default=None, repr=False)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Ajoute à l'étape la durée du bloc exécuté."""
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add_elapsed(stage, start)
+
+    def add_elapsed(self, stage: str, started: float) -> None:
+        """Ajoute à l'étape le temps écoulé depuis started (perf_counter)."""
+
+        self.seconds[stage] += perf_counter() - started
+        if self.memory is not None:
+            self.memory.observe(stage)
+
+    def merge(self, other: ConversionStats) -> None:
+        """Ajoute les mesures d'une portion analysée ailleurs."""
+
+        for stage, seconds in other.seconds.items():
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+        self.bytes_read += other.bytes_read
+        self.lines_read += other.lines_read
+        self.pages_read += other.pages_read
+        self.tables_read += other.tables_read
+        self.tables_skipped += other.tables_skipped
+        self.rows_accepted += other.rows_accepted
+        self.rows_rejected.update(other.rows_rejected)
+        self.rows_written += other.rows_written
+
+    def as_dict(self) -> dict[str, Any]:
+        """Représentation sérialisable en JSON."""
+
+        result: dict[str, Any] = {
+            "secondes": {
+                stage: round(seconds, 6)
+                for stage, seconds in self.seconds.items()
+            },
+            "secondes_total": round(self.total_seconds, 6),
+            "octets_lus": self.bytes_read,
+            "lignes_lues": self.lines_read,
+            "pages_lues": self.pages_read,
+            "tables_lues": self.tables_read,
+            "tables_ignorees": self.tables_skipped,
+            "lignes_acceptees": self.rows_accepted,
+            "lignes_rejetees": dict(sorted(self.rows_rejected.items())),
+            "lignes_ecrites": self.rows_written,
+            "cache": self.cache_hit,
+        }
+        if self.memory is not None:
+            result["pic_memoire_octets"] = dict(self.memory.peak_bytes)
+        return result
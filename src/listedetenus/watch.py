@@ -0,0 +1,290 @@
+"""Surveillance d'un dossier de dépôt et conversion des nouveaux PDF.
+
+Le dossier est scruté périodiquement (bibliothèque standard uniquement).
+Un fichier n'est converti qu'une fois sa taille et sa date de modification
+inchangées pendant plusieurs passages, pour ne jamais lire un PDF en cours
+de copie. Les conversions sont confiées à un pool de processus de taille
+fixe, avec un nombre borné de tâches en vol: une rafale de centaines de
+fichiers attend dans une file plutôt que de créer un processus par fichier.
+Un fichier d'état conserve les PDF déjà traités entre deux redémarrages.
+
+Usage:
+    python -m listedetenus.watch depot/ sortie/ --jobs 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from listedetenus.batch import convert_file
+from listedetenus.workflow import CSV_EXTENSION
+
+PDF_EXTENSION = ".pdf"
+STATE_FILE_NAME = ".listedetenus-watch.json"
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_SETTLE_POLLS = 2
+TASKS_PER_WORKER = 2
+LOG_FORMAT = "%(levelname)s | %(message)s"
+LOGGER = logging.getLogger(__name__)
+
+FileSignature = tuple[int, int]
+_Task = tuple[Path, FileSignature]
+
+
+@dataclass
+class _PendingFile:
+    """Fichier vu mais pas encore stable."""
+
+    signature: FileSignature
+    stable_polls: int = 0
+
+
+class FolderWatcher:
+    """Convertit les PDF déposés dans un dossier au fil de leur arrivée.
+
+    Rôle:
+        Détecter les fichiers nouveaux ou modifiés, attendre qu'ils soient
+        stables puis les convertir dans un pool de processus borné.
+    Entrées:
+        source_dir: dossier de dépôt scruté (PDF directs uniquement).
+        output_dir: dossier des CSV, un par PDF (même nom de base).
+        jobs: nombre de processus de conversion.
+        poll_interval: secondes entre deux passages.
+        settle_polls: passages consécutifs sans changement exigés avant
+            de convertir un fichier.
+        state_path: fichier d'état, dans output_dir par défaut.
+    Attributs:
+        converted: PDF convertis depuis le démarrage.
+        failed: PDF en échec, avec leur message d'erreur.
+    Erreurs:
+        ValueError si les dossiers ou les paramètres sont invalides.
+    """
+
+    def __init__(
+        self,
+        source_dir: Path,
+        output_dir: Path,
+        *,
+        jobs: int = 1,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        settle_polls: int = DEFAULT_SETTLE_POLLS,
+        state_path: Path | None = None,
+    ) -> None:
+        if jobs < 1 or settle_polls < 1 or poll_interval < 0:
+            raise ValueError("Paramètres de surveillance invalides.")
+        self.source_dir = Path(source_dir).expanduser().resolve()
+        if not self.source_dir.is_dir():
+            raise ValueError("Le dossier surveillé est introuvable.")
+        self.output_dir = Path(output_dir).expanduser().resolve()
+        if self.output_dir.exists() and not self.output_dir.is_dir():
+            raise ValueError("La sortie doit être un dossier.")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.jobs = jobs
+        self.poll_interval = poll_interval
+        self.settle_polls = settle_polls
+        self.state_path = Path(
+            state_path or self.output_dir / STATE_FILE_NAME
+        )
+        self.converted: list[Path] = []
+        self.failed: list[tuple[Path, str]] = []
+        self._state = _load_state(self.state_path)
+        self._pending: dict[Path, _PendingFile] = {}
+        self._ready: deque[_Task] = deque()
+        self._running: dict[Future[str | None], _Task] = {}
+
+    def run(
+        self,
+        stop_event: threading.Event | None = None,
+        *,
+        until_idle: bool = False,
+    ) -> None:
+        """Scrute le dossier jusqu'à l'arrêt demandé.
+
+        Entrées:
+            stop_event: événement provoquant l'arrêt propre de la boucle.
+            until_idle: si vrai, s'arrête dès qu'aucun fichier n'est en
+                attente ni en cours de conversion.
+        """
+
+        stop_event = stop_event or threading.Event()
+        LOGGER.info("Surveillance de %s", self.source_dir)
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            try:
+                while not stop_event.is_set():
+                    self.poll_once(executor)
+                    if until_idle and self.is_idle():
+                        break
+                    stop_event.wait(self.poll_interval)
+            finally:
+                self._drain()
+
+    def poll_once(self, executor: ProcessPoolExecutor) -> None:
+        """Effectue un passage: récolte, scrute puis soumet."""
+
+        self._collect(wait=False)
+        self._scan()
+        self._submit(executor)
+
+    def is_idle(self) -> bool:
+        """Indique qu'aucun fichier n'est en attente ni en conversion."""
+
+        return not (self._pending or self._ready or self._running)
+
+    def _scan(self) -> None:
+        """Met à jour la stabilité des fichiers du dossier."""
+
+        queued = {path for path, _ in self._ready}
+        queued.update(path for path, _ in self._running.values())
+        present: set[Path] = set()
+        for path in self.source_dir.iterdir():
+            if path.suffix.lower() != PDF_EXTENSION or path in queued:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if not path.is_file():
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            present.add(path)
+            if self._state.get(path.name) == list(signature):
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending.signature != signature:
+                self._pending[path] = _PendingFile(signature)
+                continue
+            pending.stable_polls += 1
+            if pending.stable_polls >= self.settle_polls:
+                del self._pending[path]
+                self._ready.append((path, signature))
+        for vanished in set(self._pending) - present:
+            del self._pending[vanished]
+
+    def _submit(self, executor: ProcessPoolExecutor) -> None:
+        """Soumet les fichiers prêts sans dépasser la limite en vol."""
+
+        limit = self.jobs * TASKS_PER_WORKER
+        while self._ready and len(self._running) < limit:
+            path, signature = self._ready.popleft()
+            target = self.output_dir / f"{path.stem}{CSV_EXTENSION}"
+            future = executor.submit(convert_file, path, target)
+            self._running[future] = (path, signature)
+
+    def _collect(self, wait: bool) -> None:
+        """Enregistre le résultat des conversions terminées."""
+
+        for future in list(self._running):
+            if not wait and not future.done():
+                continue
+            path, signature = self._running.pop(future)
+            try:
+                error = future.result()
+            except Exception as exception:  # noqa: BLE001
+                error = f"Processus de conversion interrompu: {exception}."
+            if error is None:
+                LOGGER.info("Converti: %s", path)
+                self.converted.append(path)
+            else:
+                LOGGER.error("Échec pour %s: %s", path, error)
+                self.failed.append((path, error))
+            self._state[path.name] = list(signature)
+            _save_state(self.state_path, self._state)
+
+    def _drain(self) -> None:
+        """Attend la fin des conversions en cours avant l'arrêt."""
+
+        self._collect(wait=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Point d'entrée: surveille un dossier jusqu'à interruption."""
+
+    parser = argparse.ArgumentParser(
+        description="Convertit en CSV les PDF déposés dans un dossier"
+    )
+    parser.add_argument("source", type=Path, help="Dossier de dépôt")
+    parser.add_argument("output", type=Path, help="Dossier des CSV")
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Processus de conversion"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Secondes entre deux passages (défaut: %(default)s)",
+    )
+    parser.add_argument(
+        "--settle",
+        type=int,
+        default=DEFAULT_SETTLE_POLLS,
+        help=(
+            "Passages sans changement avant conversion "
+            "(défaut: %(default)s)"
+        ),
+    )
+    parser.add_argument("--state", type=Path, help="Fichier d'état")
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Traite les fichiers présents puis s'arrête",
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format=LOG_FORMAT,
+    )
+
+    try:
+        watcher = FolderWatcher(
+            args.source,
+            args.output,
+            jobs=args.jobs,
+            poll_interval=args.interval,
+            settle_polls=args.settle,
+            state_path=args.state,
+        )
+    except ValueError as error:
+        LOGGER.error("Échec: %s", error)
+        return 1
+
+    try:
+        watcher.run(until_idle=args.once)
+    except KeyboardInterrupt:
+        LOGGER.info("Surveillance interrompue.")
+    return 1 if watcher.failed else 0
+
+
+def _load_state(state_path: Path) -> dict[str, list[int]]:
+    """Lit les signatures des PDF déjà traités."""
+
+    try:
+        with state_path.open("r", encoding="utf-8") as handle:
+            state = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def _save_state(state_path: Path, state: dict[str, list[int]]) -> None:
+    """Réécrit le fichier d'état de manière atomique."""
+
+    handle, temporary = tempfile.mkstemp(
+        dir=state_path.parent, suffix=".tmp"
+    )
+    with os.fdopen(handle, "w", encoding="utf-8") as stream:
+        json.dump(state, stream, indent=0, sort_keys=True)
+    os.replace(temporary, state_path)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,19 +1,79 @@
-"""Orchestration du flux de conversion PDF vers CSV."""
+"""Orchestration du flux de conversion PDF vers CSV ou SQLite."""
 
 from __future__ import annotations
 
 import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import date
 from pathlib import Path
+from time import perf_counter
+from typing import Iterable, Iterator, TypeVar
 
-from listedetenus.csv_writer import write_csv
-from listedetenus.pdf_loader import read_pdf_tables
-from listedetenus.parser import tables_to_detainees
+from listedetenus.cache import ConversionCache
+from listedetenus.csv_writer import (
+    write_csv,
+    write_csv_batches,
+    write_delta_csv,
+    write_split_delta_csv,
+)
+from listedetenus.delta import (
+    DeltaSummary,
+    RowDelta,
+    load_previous_rows,
+    split_delta_paths,
+)
+from listedetenus.models import Change, Detainee, DetaineeBatch, PdfChunk
+from listedetenus.pdf_loader import (
+    ProgressCallback,
+    iter_chunk_tables,
+    iter_pdf_tables,
+    plan_pdf_chunks,
+    read_pdf_tables,
+)
+from listedetenus.parser import (
+    DuplicateFilter,
+    iter_detainee_batches,
+    require_batches,
+    tables_to_detainees,
+)
+from listedetenus.sqlite_store import write_sqlite_batches
+from listedetenus.stats import ConversionStats
 
 CSV_EXTENSION = ".csv"
+CHUNKS_PER_JOB = 4
 LOGGER = logging.getLogger(__name__)
 
+_Item = TypeVar("_Item")
+# os.umask ne se lit qu'en le modifiant: une seule fois, à l'import.
+_UMASK = os.umask(0o022)
+os.umask(_UMASK)
+_NEW_FILE_MODE = 0o666 & ~_UMASK
+del _UMASK
+_ChunkResult = tuple[list[DetaineeBatch], ConversionStats | None]
 
-def convert_pdf_to_csv(pdf_path: Path, csv_path: Path) -> Path:
+
+class ConversionCancelled(RuntimeError):
+    """Conversion interrompue à la demande de l'appelant."""
+
+
+def convert_pdf_to_csv(
+    pdf_path: Path,
+    csv_path: Path,
+    *,
+    streaming: bool = False,
+    jobs: int = 1,
+    cache: ConversionCache | None = None,
+    dedup: DuplicateFilter | None = None,
+    cancel_event: threading.Event | None = None,
+    progress: ProgressCallback | None = None,
+    stats: ConversionStats | None = None,
+) -> Path:
     """Convertit un fichier PDF en CSV.
 
     Rôle:
@@ -21,31 +81,460 @@ def convert_pdf_to_csv(pdf_path: Path, csv_path: Path) -> Path:
     Entrées:
         pdf_path: chemin du fichier PDF à extraire.
         csv_path: chemin du fichier CSV de sortie souhaité.
+        streaming: si vrai, tables et détenus circulent en flux jusqu'à
+            l'écriture, la mémoire restant bornée par la taille d'une table.
+            Les lignes sont écrites dans un fichier temporaire qui ne
+            remplace le CSV qu'en cas de succès.
+        jobs: nombre de processus d'analyse. Au-delà de 1, le document est
+            découpé en plages de pages (ou blocs de tables) analysées en
+            parallèle puis réassemblées dans l'ordre d'origine.
+        cache: cache de conversions; un PDF déjà converti avec la même
+            configuration est réécrit sans être relu ni analysé.
+        dedup: filtre écartant les lignes répétées (fins de page, tables
+            recopiées); son attribut dropped compte les doublons.
+        cancel_event: événement consulté entre deux tables ou deux lots;
+            une fois positionné, la conversion s'arrête et le CSV existant
+            est laissé intact.
+        progress: appelé avec (fait, total) pendant la lecture: pages ou
+            octets du document, ou portions analysées si jobs > 1; total
+            vaut 0 s'il est inconnu. Appelé depuis le thread de conversion.
+        stats: mesures remplies pendant la conversion (temps par étape,
+            volumes lus, lignes rejetées par motif, lignes écrites). Fourni
+            par l'appelant plutôt que retourné, pour garder le chemin du
+            CSV comme valeur de retour et conserver les mesures d'une
+            conversion en échec.
     Sorties:
         Chemin absolu du CSV écrit.
     Erreurs:
         ValueError: chemins manquants, extension CSV invalide ou dossier cible
             incorrect.
+        ConversionCancelled: annulation demandée via cancel_event.
         RuntimeError: échec de l'extraction ou de l'écriture des données.
     """
 
+    if jobs < 1:
+        raise ValueError("Le nombre de processus doit être au moins 1.")
     resolved_pdf = _normalize_path(pdf_path)
     resolved_csv = _normalize_path(csv_path)
     _validate_csv_path(resolved_csv)
     _ensure_target_directory(resolved_csv)
 
+    in_memory = not streaming and cache is None
+    in_memory = in_memory and cancel_event is None and progress is None
+    in_memory = in_memory and stats is None
+    started = perf_counter()
     try:
-        extraction = read_pdf_tables(resolved_pdf)
-        detainees = tables_to_detainees(extraction.tables)
-        write_csv(resolved_csv, detainees)
+        if jobs == 1 and in_memory:
+            extraction = read_pdf_tables(resolved_pdf)
+            detainees = tables_to_detainees(extraction.tables)
+            write_csv(resolved_csv, _drop_duplicates(detainees, dedup))
+        else:
+            batches = _iter_source_batches(
+                resolved_pdf, jobs, cache, cancel_event, progress, stats
+            )
+            _write_batches(
+                resolved_csv, _filter_batches(batches, dedup), stats
+            )
+    except ConversionCancelled:
+        LOGGER.info("Conversion annulée: %s", resolved_pdf)
+        raise
     except Exception as error:  # noqa: BLE001
         message = f"Conversion impossible: {error}."
         LOGGER.error(message)
         raise RuntimeError(message) from error
+    finally:
+        if stats is not None:
+            stats.total_seconds += perf_counter() - started
 
     return resolved_csv
 
 
+def convert_pdf_to_sqlite(
+    pdf_path: Path,
+    db_path: Path,
+    *,
+    upsert: bool = False,
+    list_date: date | None = None,
+    jobs: int = 1,
+    cache: ConversionCache | None = None,
+    dedup: DuplicateFilter | None = None,
+    cancel_event: threading.Event | None = None,
+    progress: ProgressCallback | None = None,
+    stats: ConversionStats | None = None,
+) -> int:
+    """Charge les détenus d'un PDF dans une base SQLite.
+
+    Rôle:
+        Extraire les lignes en flux et les insérer en une transaction, la
+        liste étant étiquetée par le nom du PDF et sa date.
+    Entrées:
+        pdf_path: chemin du fichier PDF à extraire.
+        db_path: base SQLite, créée au besoin (extension libre).
+        upsert: si vrai, ajoute la liste aux précédentes (une liste de même
+            source et de même date est remplacée); sinon la base ne
+            contient plus que cette liste.
+        list_date: date de la liste; par défaut, la date du jour.
+        jobs, cache, dedup, cancel_event, progress, stats: comme pour
+            convert_pdf_to_csv.
+    Sorties:
+        Nombre de lignes chargées.
+    Erreurs:
+        ValueError: chemins manquants ou dossier cible incorrect.
+        ConversionCancelled: annulation demandée via cancel_event; la base
+            est laissée dans son état antérieur.
+        RuntimeError: échec de l'extraction ou du chargement.
+    """
+
+    if jobs < 1:
+        raise ValueError("Le nombre de processus doit être au moins 1.")
+    resolved_pdf = _normalize_path(pdf_path)
+    resolved_db = _normalize_path(db_path)
+    if resolved_db.is_dir():
+        raise ValueError("La base SQLite cible ne peut pas être un dossier.")
+    _ensure_target_directory(resolved_db)
+
+    started = perf_counter()
+    try:
+        batches = _iter_source_batches(
+            resolved_pdf, jobs, cache, cancel_event, progress, stats
+        )
+        return write_sqlite_batches(
+            resolved_db,
+            _filter_batches(batches, dedup),
+            source=resolved_pdf.name,
+            list_date=list_date or date.today(),
+            upsert=upsert,
+            stats=stats,
+        )
+    except ConversionCancelled:
+        LOGGER.info("Chargement annulé: %s", resolved_pdf)
+        raise
+    except Exception as error:  # noqa: BLE001
+        message = f"Conversion impossible: {error}."
+        LOGGER.error(message)
+        raise RuntimeError(message) from error
+    finally:
+        if stats is not None:
+            stats.total_seconds += perf_counter() - started
+
+
+def convert_pdf_to_delta(
+    pdf_path: Path,
+    previous_csv: Path,
+    output_csv: Path,
+    *,
+    split: bool = False,
+    jobs: int = 1,
+    cache: ConversionCache | None = None,
+    dedup: DuplicateFilter | None = None,
+) -> DeltaSummary:
+    """Écrit uniquement les arrivées et départs depuis la liste précédente.
+
+    Rôle:
+        Indexer le CSV précédent, puis comparer en flux les lignes extraites
+        du PDF: la mémoire dépend de la liste précédente seulement.
+    Entrées:
+        pdf_path: chemin du fichier PDF à extraire.
+        previous_csv: CSV écrit lors de la conversion précédente.
+        output_csv: CSV delta avec une colonne operation; avec split, base
+            des noms des fichiers d'arrivées (-arrivees) et de départs
+            (-departs).
+        split: si vrai, écrit deux CSV au format standard.
+        jobs, cache, dedup: comme pour convert_pdf_to_csv.
+    Sorties:
+        DeltaSummary avec les compteurs et les fichiers écrits.
+    Erreurs:
+        ValueError: chemins manquants ou invalides.
+        RuntimeError: échec de la lecture, de l'extraction ou de l'écriture.
+    """
+
+    if jobs < 1:
+        raise ValueError("Le nombre de processus doit être au moins 1.")
+    resolved_pdf = _normalize_path(pdf_path)
+    resolved_previous = _normalize_path(previous_csv)
+    resolved_output = _normalize_path(output_csv)
+    _validate_csv_path(resolved_output)
+    _ensure_target_directory(resolved_output)
+    outputs = (
+        split_delta_paths(resolved_output) if split else (resolved_output,)
+    )
+    if resolved_previous in outputs:
+        raise ValueError("Le CSV delta ne peut pas écraser le CSV précédent.")
+
+    try:
+        delta = RowDelta(load_previous_rows(resolved_previous))
+        batches = _filter_batches(
+            _iter_source_batches(resolved_pdf, jobs, cache), dedup
+        )
+        rows = (row for batch in batches for row in batch.iter_rows())
+        _write_changes(outputs, delta.iter_changes(rows))
+    except Exception as error:  # noqa: BLE001
+        message = f"Conversion impossible: {error}."
+        LOGGER.error(message)
+        raise RuntimeError(message) from error
+
+    return DeltaSummary(
+        arrivals=delta.arrivals,
+        departures=delta.departures,
+        unchanged=delta.unchanged,
+        outputs=outputs,
+    )
+
+
+def _iter_source_batches(
+    pdf_path: Path,
+    jobs: int,
+    cache: ConversionCache | None,
+    cancel_event: threading.Event | None = None,
+    progress: ProgressCallback | None = None,
+    stats: ConversionStats | None = None,
+) -> Iterable[DetaineeBatch]:
+    """Lots de détenus du PDF, depuis le cache ou par analyse en flux.
+
+    Les lots bruts sont enregistrés dans le cache au fil de la lecture; le
+    dédoublonnage éventuel intervient après, pour que le cache ne dépende
+    pas de cette option.
+    """
+
+    key = _cache_key(cache, pdf_path)
+    cached = cache.load(key) if key is not None else None
+    if cached is not None:
+        if stats is not None:
+            stats.cache_hit = True
+        return _until_cancelled(cached, cancel_event)
+    if jobs > 1:
+        chunks = plan_pdf_chunks(pdf_path, jobs * CHUNKS_PER_JOB)
+        LOGGER.debug(
+            "Analyse parallèle: %d portions, %d processus.", len(chunks), jobs
+        )
+        batches = _iter_parallel_batches(
+            pdf_path, chunks, jobs, progress, stats
+        )
+    elif progress is None and stats is None:
+        tables = _until_cancelled(iter_pdf_tables(pdf_path), cancel_event)
+        batches = iter_detainee_batches(tables)
+    else:
+        tables = iter_pdf_tables(pdf_path, progress=progress, stats=stats)
+        tables = _until_cancelled(tables, cancel_event)
+        batches = iter_detainee_batches(tables, stats=stats)
+    batches = _until_cancelled(batches, cancel_event)
+    return require_batches(_record(batches, cache, key))
+
+
+def _until_cancelled(
+    items: Iterable[_Item], cancel_event: threading.Event | None
+) -> Iterable[_Item]:
+    """Relaie les éléments en vérifiant l'annulation avant chacun."""
+
+    if cancel_event is None:
+        return items
+    return _iter_until_cancelled(items, cancel_event)
+
+
+def _iter_until_cancelled(
+    items: Iterable[_Item], cancel_event: threading.Event
+) -> Iterator[_Item]:
+    """Générateur de _until_cancelled."""
+
+    for item in items:
+        if cancel_event.is_set():
+            raise ConversionCancelled("Conversion annulée.")
+        yield item
+
+
+def _filter_batches(
+    batches: Iterable[DetaineeBatch], dedup: DuplicateFilter | None
+) -> Iterable[DetaineeBatch]:
+    """Écarte les lignes répétées si un filtre est fourni."""
+
+    if dedup is None:
+        return batches
+    return dedup.filter_batches(batches)
+
+
+def _drop_duplicates(
+    detainees: list[Detainee], dedup: DuplicateFilter | None
+) -> list[Detainee]:
+    """Écarte les détenus répétés si un filtre est fourni."""
+
+    if dedup is None:
+        return detainees
+    return [
+        detainee
+        for detainee in detainees
+        if dedup.add(detainee.nom, detainee.prenom, detainee.date_naissance)
+    ]
+
+
+def _write_batches(
+    csv_path: Path,
+    batches: Iterable[DetaineeBatch],
+    stats: ConversionStats | None = None,
+) -> None:
+    """Écrit des lots en flux; le CSV n'est remplacé qu'en cas de succès."""
+
+    with _replaced_on_success((csv_path,)) as (temporary,):
+        if stats is None:
+            write_csv_batches(temporary, batches)
+        else:
+            write_csv_batches(temporary, batches, stats)
+
+
+def _write_changes(
+    outputs: tuple[Path, ...], changes: Iterable[Change]
+) -> None:
+    """Écrit le delta (un ou deux CSV), remplacés seulement si tout réussit."""
+
+    with _replaced_on_success(outputs) as temporaries:
+        if len(temporaries) == 2:
+            write_split_delta_csv(*temporaries, changes)
+        else:
+            write_delta_csv(temporaries[0], changes)
+
+
+@contextmanager
+def _replaced_on_success(
+    outputs: tuple[Path, ...]
+) -> Iterator[tuple[Path, ...]]:
+    """Fournit des fichiers temporaires voisins des sorties.
+
+    En cas de succès, chaque temporaire remplace sa sortie (os.replace);
+    en cas d'échec, seuls les temporaires sont supprimés et les sorties
+    existantes, d'une conversion précédente, restent intactes.
+    """
+
+    temporaries: list[Path] = []
+    with ExitStack() as cleanup:
+        cleanup.callback(_remove_temporaries, temporaries)
+        for output in outputs:
+            handle, name = tempfile.mkstemp(
+                dir=output.parent, prefix=f".{output.stem}-", suffix=".tmp"
+            )
+            os.close(handle)
+            temporaries.append(Path(name))
+        yield tuple(temporaries)
+        for temporary, output in zip(temporaries, outputs):
+            _copy_mode(output, temporary)
+            os.replace(temporary, output)
+
+
+def _copy_mode(output: Path, temporary: Path) -> None:
+    """Donne au temporaire les droits de la sortie qu'il remplace.
+
+    mkstemp crée un fichier lisible par son seul propriétaire; une sortie
+    nouvelle reçoit les droits usuels d'un fichier créé par open().
+    """
+
+    if output.exists():
+        shutil.copymode(output, temporary)
+    else:
+        os.chmod(temporary, _NEW_FILE_MODE)
+
+
+def _cache_key(cache: ConversionCache | None, pdf_path: Path) -> str | None:
+    """Clé de cache du PDF; None si le cache est absent ou inutilisable."""
+
+    if cache is None:
+        return None
+    try:
+        return cache.key_for(pdf_path)
+    except OSError as error:
+        LOGGER.warning("Cache de conversion ignoré: %s", error)
+        return None
+
+
+def _record(
+    batches: Iterable[DetaineeBatch],
+    cache: ConversionCache | None,
+    key: str | None,
+) -> Iterable[DetaineeBatch]:
+    """Enregistre les lots dans le cache au fil de l'écriture."""
+
+    if cache is None or key is None:
+        return batches
+    return cache.record(key, batches)
+
+
+def _iter_parallel_batches(
+    pdf_path: Path,
+    chunks: list[PdfChunk],
+    jobs: int,
+    progress: ProgressCallback | None = None,
+    stats: ConversionStats | None = None,
+) -> Iterator[DetaineeBatch]:
+    """Distribue les portions et restitue les lots dans l'ordre.
+
+    Le nombre de portions en vol est borné pour que les résultats en
+    attente d'écriture ne s'accumulent pas en mémoire. Les mesures de
+    chaque portion sont ajoutées à stats à leur arrivée.
+    """
+
+    report = progress or (lambda done, total: None)
+    measure = stats is not None
+    if len(chunks) == 1:
+        batches, chunk_stats = _parse_chunk(pdf_path, chunks[0], measure)
+        _merge_stats(stats, chunk_stats)
+        yield from batches
+        report(1, 1)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending: deque[Future[_ChunkResult]] = deque()
+        done = 0
+        for chunk in chunks:
+            pending.append(
+                executor.submit(_parse_chunk, pdf_path, chunk, measure)
+            )
+            if len(pending) >= jobs * 2:
+                batches, chunk_stats = pending.popleft().result()
+                _merge_stats(stats, chunk_stats)
+                yield from batches
+                done += 1
+                report(done, len(chunks))
+        while pending:
+            batches, chunk_stats = pending.popleft().result()
+            _merge_stats(stats, chunk_stats)
+            yield from batches
+            done += 1
+            report(done, len(chunks))
+
+
+def _parse_chunk(
+    pdf_path: Path, chunk: PdfChunk, measure: bool = False
+) -> _ChunkResult:
+    """Extrait et analyse une portion (exécuté dans un processus fils).
+
+    Les lots en colonnes réduisent aussi le volume transmis au processus
+    parent; les mesures de la portion sont renvoyées si measure est vrai.
+    """
+
+    stats = ConversionStats() if measure else None
+    tables = iter_chunk_tables(pdf_path, chunk, stats)
+    batches = iter_detainee_batches(tables, require_rows=False, stats=stats)
+    return list(batches), stats
+
+
+def _merge_stats(
+    stats: ConversionStats | None, chunk_stats: ConversionStats | None
+) -> None:
+    """Ajoute les mesures d'une portion au bilan global."""
+
+    if stats is not None and chunk_stats is not None:
+        stats.merge(chunk_stats)
+
+
+def _remove_temporaries(temporaries: list[Path]) -> None:
+    """Supprime les fichiers temporaires non utilisés d'une écriture."""
+
+    for temporary in temporaries:
+        try:
+            temporary.unlink(missing_ok=True)
+        except OSError as error:
+            LOGGER.warning(
+                "Fichier temporaire non supprimé (%s): %s", temporary, error
+            )
+
+
 def _normalize_path(path_value: Path) -> Path:
     """Retourne un chemin absolu validé."""
 
@@ -0,0 +1,143 @@
+"""Construction de petits PDF réels pour les tests."""
+
+from __future__ import annotations
+
+import zlib
+
+
+def page_content(rows: list[list[str]], top: int = 800) -> bytes:
+    """Génère un flux de contenu affichant chaque cellule avec Tj."""
+
+    commands = [b"BT", b"/F1 10 Tf"]
+    for row_index, row in enumerate(rows):
+        y = top - row_index * 14
+        for cell_index, cell in enumerate(row):
+            x = 40 + cell_index * 150
+            text = cell.encode("latin-1")
+            text = text.replace(b"\\", b"\\\\").replace(b"(", b"\\(")
+            text = text.replace(b")", b"\\)")
+            commands.append(b"1 0 0 1 %d %d Tm (%s) Tj" % (x, y, text))
+    commands.append(b"ET")
+    return b"\n".join(commands)
+
+
+def build_pdf(contents: list[bytes], compress: bool = True) -> bytes:
+    """Assemble un PDF complet (xref comprise), une page par contenu."""
+
+    page_count = len(contents)
+    first_page = 4
+    objects: list[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for index, content in enumerate(contents):
+        page_number = first_page + index * 2
+        kids.append(b"%d 0 R" % page_number)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % (page_number + 1)
+        )
+        if compress:
+            data = zlib.compress(content)
+            header = b"<< /Length %d /Filter /FlateDecode >>" % len(data)
+        else:
+            data = content
+            header = b"<< /Length %d >>" % len(data)
+        objects.append(header + b"\nstream\n" + data + b"\nendstream")
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(kids),
+        page_count,
+    )
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n" % (len(objects) + 1)
+    output += b"0000000000 65535 f \n"
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(objects) + 1)
+    output += b"startxref\n%d\n%%%%EOF\n" % xref_offset
+    return bytes(output)
+
+
+def build_compact_pdf(contents: list[bytes]) -> bytes:
+    """Assemble un PDF 1.5: arbre des pages en ObjStm et flux xref."""
+
+    page_count = len(contents)
+    first_content = 4
+    object_stream_number = first_content + page_count
+    page_numbers = [object_stream_number + 1 + i for i in range(page_count)]
+    compressed = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % n for n in page_numbers), page_count),
+    }
+    for index, number in enumerate(page_numbers):
+        compressed[number] = (
+            b"<< /Type /Page /Parent 2 0 R /Contents %d 0 R >>"
+            % (first_content + index)
+        )
+
+    header_parts = []
+    body = bytearray()
+    for number, value in compressed.items():
+        header_parts.append(b"%d %d" % (number, len(body)))
+        body += value + b" "
+    header = b" ".join(header_parts) + b" "
+    object_stream = zlib.compress(header + bytes(body))
+
+    output = bytearray(b"%PDF-1.5\n")
+    offsets: dict[int, int] = {}
+    for index, content in enumerate(contents):
+        number = first_content + index
+        data = zlib.compress(content)
+        offsets[number] = len(output)
+        output += b"%d 0 obj\n<< /Length %d /Filter /FlateDecode >>\n" % (
+            number,
+            len(data),
+        )
+        output += b"stream\n" + data + b"\nendstream\nendobj\n"
+    offsets[object_stream_number] = len(output)
+    output += (
+        b"%d 0 obj\n<< /Type /ObjStm /N %d /First %d /Length %d "
+        b"/Filter /FlateDecode >>\nstream\n"
+        % (
+            object_stream_number,
+            len(compressed),
+            len(header),
+            len(object_stream),
+        )
+    )
+    output += object_stream + b"\nendstream\nendobj\n"
+
+    xref_number = page_numbers[-1] + 1
+    size = xref_number + 1
+    positions = {number: i for i, number in enumerate(compressed)}
+    rows = bytearray()
+    for number in range(size):
+        if number in offsets:
+            rows += bytes([1]) + offsets[number].to_bytes(4, "big") + b"\0"
+        elif number in positions:
+            rows += bytes([2]) + object_stream_number.to_bytes(4, "big")
+            rows += bytes([positions[number]])
+        elif number == xref_number:
+            rows += bytes([1]) + len(output).to_bytes(4, "big") + b"\0"
+        else:
+            rows += b"\0\0\0\0\0\0"
+    xref_data = zlib.compress(bytes(rows))
+    xref_offset = len(output)
+    output += (
+        b"%d 0 obj\n<< /Type /XRef /Size %d /W [1 4 1] /Root 1 0 R "
+        b"/Length %d /Filter /FlateDecode >>\nstream\n"
+        % (xref_number, size, len(xref_data))
+    )
+    output += xref_data + b"\nendstream\nendobj\n"
+    output += b"startxref\n%d\n%%%%EOF\n" % xref_offset
+    return bytes(output)
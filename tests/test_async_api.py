@@ -0,0 +1,125 @@
+"""Tests de l'API asyncio."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from typing import Iterator
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus import async_api, workflow
+from listedetenus.async_api import (
+    convert_pdf_to_csv_async,
+    iter_detainees_async,
+)
+from listedetenus.models import Detainee
+
+SOURCE_TEXT = "Nom;Prénom;Date\nABAS;Lena;05/09/1981\nZEE;Mara;1990-12-01"
+
+
+class AsyncApiTestCase(unittest.IsolatedAsyncioTestCase):
+    """Vérifie la conversion et la lecture depuis une boucle asyncio."""
+
+    async def test_concurrent_conversions_share_a_limit(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text(SOURCE_TEXT, encoding="utf-8")
+            limit = asyncio.Semaphore(2)
+
+            results = await asyncio.gather(
+                *(
+                    convert_pdf_to_csv_async(
+                        pdf_path, Path(tmp_dir) / f"{index}.csv", limit=limit
+                    )
+                    for index in range(4)
+                )
+            )
+
+            for result in results:
+                self.assertEqual(len(result.read_text("utf-8").split()), 3)
+
+    async def test_iter_detainees_async_yields_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text(SOURCE_TEXT, encoding="utf-8")
+
+            detainees = [item async for item in iter_detainees_async(pdf_path)]
+
+        self.assertEqual(
+            detainees,
+            [
+                Detainee("ABAS", "Lena", "1981-09-05"),
+                Detainee("ZEE", "Mara", "1990-12-01"),
+            ],
+        )
+
+    async def test_early_exit_closes_reader_before_returning(self) -> None:
+        closed = threading.Event()
+        table = [["Nom", "Prénom", "Date"], ["ABAS", "Lena", "05/09/1981"]]
+
+        def tables(_path: Path) -> Iterator[list[list[str]]]:
+            try:
+                while True:
+                    yield table
+            finally:
+                closed.set()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text(SOURCE_TEXT, encoding="utf-8")
+            with mock.patch.object(async_api, "iter_pdf_tables", tables):
+                reader = iter_detainees_async(pdf_path)
+                await anext(reader)
+                await reader.aclose()
+
+        self.assertTrue(closed.is_set())
+
+    async def test_caller_cancel_event_is_rejected(self) -> None:
+        with self.assertRaises(TypeError):
+            await convert_pdf_to_csv_async(
+                Path("source.pdf"),
+                Path("result.csv"),
+                cancel_event=threading.Event(),
+            )
+
+    async def test_cancellation_stops_conversion(self) -> None:
+        started = threading.Event()
+        table = [["Nom", "Prénom", "Date"], ["ABAS", "Lena", "05/09/1981"]]
+
+        def slow_tables(_path: Path) -> Iterator[list[list[str]]]:
+            for _ in range(200):
+                started.set()
+                time.sleep(0.01)
+                yield table
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text(SOURCE_TEXT, encoding="utf-8")
+            csv_path = Path(tmp_dir) / "result.csv"
+
+            with mock.patch.object(workflow, "iter_pdf_tables", slow_tables):
+                task = asyncio.create_task(
+                    convert_pdf_to_csv_async(pdf_path, csv_path)
+                )
+                await asyncio.get_running_loop().run_in_executor(
+                    None, started.wait
+                )
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+
+            self.assertFalse(csv_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
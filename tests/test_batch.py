@@ -0,0 +1,93 @@
+"""Tests de la conversion par lot."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus.batch import convert_batch
+from listedetenus.parser import DuplicateFilter
+
+
+def _write_sources(directory: Path) -> None:
+    """Crée deux PDF textuels valides et un PDF vide."""
+
+    (directory / "a.pdf").write_text(
+        "Nom;Prénom;Date\nABAS;Lena;05/09/1981", encoding="utf-8"
+    )
+    (directory / "b.pdf").write_text(
+        "Nom;Prénom;Date\nZEE;Mara;1990-12-01", encoding="utf-8"
+    )
+    (directory / "corrompu.pdf").write_bytes(b"")
+
+
+class ConvertBatchTestCase(unittest.TestCase):
+    """Vérifie la conversion de plusieurs fichiers."""
+
+    def test_convert_batch_writes_one_csv_per_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_dir = Path(tmp_dir) / "entrees"
+            source_dir.mkdir()
+            _write_sources(source_dir)
+            output_dir = Path(tmp_dir) / "sorties"
+
+            summary = convert_batch([source_dir], output_dir, jobs=2)
+
+            self.assertEqual(summary.succeeded, 2)
+            self.assertEqual(summary.failed, 1)
+            self.assertEqual(summary.exit_status, 1)
+            self.assertEqual(
+                [item.exit_status for item in summary.items], [0, 0, 1]
+            )
+            self.assertEqual(
+                sorted(path.name for path in output_dir.iterdir()),
+                ["a.csv", "b.csv"],
+            )
+
+    def test_convert_batch_merges_rows_in_source_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _write_sources(Path(tmp_dir))
+            merged = Path(tmp_dir) / "fusion.csv"
+
+            summary = convert_batch(
+                [Path(tmp_dir) / "*.pdf"], merged, merge=True
+            )
+
+            self.assertEqual(summary.merged_csv, merged.resolve())
+            self.assertEqual(
+                merged.read_text(encoding="utf-8").splitlines(),
+                [
+                    "nom,prenom,date_naissance",
+                    "ABAS,Lena,1981-09-05",
+                    "ZEE,Mara,1990-12-01",
+                ],
+            )
+
+    def test_convert_batch_merge_drops_rows_repeated_across_files(
+        self,
+    ) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _write_sources(Path(tmp_dir))
+            (Path(tmp_dir) / "c.pdf").write_text(
+                "Nom;Prénom;Date\nABAS;Lena;1981-09-05", encoding="utf-8"
+            )
+            merged = Path(tmp_dir) / "fusion.csv"
+            dedup = DuplicateFilter()
+
+            convert_batch(
+                [Path(tmp_dir) / "*.pdf"], merged, merge=True, dedup=dedup
+            )
+
+            self.assertEqual(len(merged.read_text("utf-8").splitlines()), 3)
+        self.assertEqual(dedup.dropped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
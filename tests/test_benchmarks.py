@@ -0,0 +1,84 @@
+"""Tests du générateur de corpus et de la comparaison aux références."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from benchmarks.bench_stages import compare
+from benchmarks.corpus import FORMAT_TEXT, OUTPUT_FORMATS, CorpusSpec
+from benchmarks.corpus import write_corpus
+from listedetenus.stats import ConversionStats
+from listedetenus.workflow import convert_pdf_to_csv
+
+
+class CorpusTestCase(unittest.TestCase):
+    """Vérifie que les corpus générés sont reproductibles et lisibles."""
+
+    def test_corpus_is_deterministic(self) -> None:
+        spec = CorpusSpec(rows=500, tables=3, rows_per_page=40)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            first = Path(tmp_dir) / "a.pdf"
+            second = Path(tmp_dir) / "b.pdf"
+            write_corpus(first, spec)
+            write_corpus(second, spec)
+
+            self.assertEqual(first.read_bytes(), second.read_bytes())
+
+    def test_corpus_converts_to_expected_row_count(self) -> None:
+        for output_format in OUTPUT_FORMATS:
+            spec = CorpusSpec(
+                rows=600,
+                tables=3,
+                rows_per_page=25,
+                invalid_ratio=0.1,
+                output_format=output_format,
+            )
+            stats = ConversionStats()
+            with self.subTest(output_format=output_format):
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    pdf_path = Path(tmp_dir) / "corpus.pdf"
+                    valid = write_corpus(pdf_path, spec)
+                    convert_pdf_to_csv(
+                        pdf_path, Path(tmp_dir) / "out.csv", stats=stats
+                    )
+
+                self.assertEqual(stats.rows_written, valid)
+                self.assertLess(valid, spec.rows)
+                self.assertEqual(stats.tables_skipped, 0)
+                if output_format != FORMAT_TEXT:
+                    self.assertEqual(stats.pages_read, 24)
+
+    def test_corpus_rejects_invalid_ratio(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(ValueError):
+                write_corpus(
+                    Path(tmp_dir) / "corpus.pdf", CorpusSpec(invalid_ratio=1)
+                )
+
+
+class CompareTestCase(unittest.TestCase):
+    """Vérifie la détection des régressions de débit."""
+
+    def test_compare_reports_drops_beyond_threshold(self) -> None:
+        results = {
+            "read_pdf_tables": {"lignes_par_seconde": 70.0},
+            "write_csv": {"lignes_par_seconde": 80.0},
+        }
+        reference = {"read_pdf_tables": 100.0, "write_csv": 100.0}
+
+        regressions = compare(results, reference, threshold=0.25)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("read_pdf_tables"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""Tests du cache de conversions."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus import constants, pdf_content, workflow
+from listedetenus.cache import STAT_INDEX_NAME, ConversionCache
+from listedetenus.models import DetaineeBatch
+
+SOURCE_TEXT = "Nom;Prénom;Date\nABAS;Lena;05/09/1981\nZEE;Mara;1990-12-01"
+EXPECTED_LINES = [
+    "nom,prenom,date_naissance",
+    "ABAS,Lena,1981-09-05",
+    "ZEE,Mara,1990-12-01",
+]
+
+
+def _fail(*_args: object, **_kwargs: object) -> None:
+    raise AssertionError("Le PDF n'aurait pas dû être relu.")
+
+
+class ConversionCacheTestCase(unittest.TestCase):
+    """Vérifie la réutilisation et l'invalidation des conversions."""
+
+    def test_hit_skips_reading_and_parsing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text(SOURCE_TEXT, encoding="utf-8")
+            cache = ConversionCache(Path(tmp_dir) / "cache")
+            first = Path(tmp_dir) / "first.csv"
+            second = Path(tmp_dir) / "second.csv"
+
+            workflow.convert_pdf_to_csv(pdf_path, first, cache=cache)
+            with mock.patch.object(workflow, "read_pdf_tables", _fail):
+                with mock.patch.object(workflow, "iter_pdf_tables", _fail):
+                    workflow.convert_pdf_to_csv(
+                        pdf_path, second, streaming=True, cache=cache
+                    )
+
+            self.assertEqual(
+                second.read_text(encoding="utf-8").splitlines(),
+                EXPECTED_LINES,
+            )
+
+    def test_key_changes_with_content_and_configuration(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text(SOURCE_TEXT, encoding="utf-8")
+            cache = ConversionCache(Path(tmp_dir) / "cache")
+
+            original = cache.key_for(pdf_path)
+            self.assertEqual(cache.key_for(pdf_path), original)
+            with mock.patch.object(
+                constants, "DATE_FORMATS", ["%d/%m/%Y"]
+            ):
+                self.assertNotEqual(cache.key_for(pdf_path), original)
+
+            with mock.patch.object(pdf_content, "LINE_TOLERANCE", 2.0):
+                self.assertNotEqual(cache.key_for(pdf_path), original)
+
+            pdf_path.write_text(SOURCE_TEXT + "\nBOB;Eli;01/01/2000")
+            self.assertNotEqual(cache.key_for(pdf_path), original)
+
+    def test_stat_index_forgets_deleted_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ConversionCache(Path(tmp_dir) / "cache")
+            removed = Path(tmp_dir) / "ancien.pdf"
+            kept = Path(tmp_dir) / "source.pdf"
+            for pdf_path in (removed, kept):
+                pdf_path.write_text(SOURCE_TEXT, encoding="utf-8")
+                cache.key_for(pdf_path)
+            removed.unlink()
+            kept.write_text(SOURCE_TEXT + "\n", encoding="utf-8")
+
+            cache.key_for(kept)
+
+            index = json.loads(
+                (cache.directory / STAT_INDEX_NAME).read_text("utf-8")
+            )
+            self.assertEqual(list(index), [str(kept.resolve())])
+
+    def test_corrupt_entry_is_dropped_and_reconverted(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text(SOURCE_TEXT, encoding="utf-8")
+            cache = ConversionCache(Path(tmp_dir) / "cache")
+            csv_path = Path(tmp_dir) / "result.csv"
+            workflow.convert_pdf_to_csv(pdf_path, csv_path, cache=cache)
+            (entry,) = cache.directory.glob("*.csv.gz")
+            entry.write_bytes(entry.read_bytes()[:-8])
+
+            with self.assertLogs("listedetenus.cache", "WARNING"):
+                workflow.convert_pdf_to_csv(
+                    pdf_path, csv_path, streaming=True, cache=cache
+                )
+
+            self.assertEqual(
+                csv_path.read_text(encoding="utf-8").splitlines(),
+                EXPECTED_LINES,
+            )
+            self.assertIsNotNone(cache.load(cache.key_for(pdf_path)))
+
+    def test_failed_conversion_is_not_cached(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text("Nom;Prénom;Date\nA;B;inconnue", "utf-8")
+            cache_dir = Path(tmp_dir) / "cache"
+
+            with self.assertRaises(RuntimeError):
+                workflow.convert_pdf_to_csv(
+                    pdf_path,
+                    Path(tmp_dir) / "result.csv",
+                    streaming=True,
+                    cache=ConversionCache(cache_dir),
+                )
+
+            self.assertEqual(list(cache_dir.glob("*.csv.gz")), [])
+            self.assertEqual(list(cache_dir.glob("*.tmp")), [])
+
+    def test_eviction_removes_least_recently_used(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ConversionCache(Path(tmp_dir))
+            batch = DetaineeBatch()
+            batch.append("ABAS", "Lena", "1981-09-05")
+            for key in ("ancien", "recent"):
+                cache.store(key, [batch])
+            old_entry = Path(tmp_dir) / "ancien.csv.gz"
+            os.utime(old_entry, ns=(0, 0))
+
+            cache.max_bytes = (Path(tmp_dir) / "recent.csv.gz").stat().st_size
+            cache.evict()
+
+            self.assertIsNone(cache.load("ancien"))
+            loaded = cache.load("recent")
+            self.assertIsNotNone(loaded)
+            self.assertEqual(
+                [row for batch in loaded for row in batch.iter_rows()],
+                [("ABAS", "Lena", "1981-09-05")],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
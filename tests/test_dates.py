@@ -0,0 +1,108 @@
+"""Tests de la normalisation des dates de naissance."""
+
+from __future__ import annotations
+
+import random
+import sys
+import threading
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus.constants import DATE_FORMATS
+from listedetenus.dates import BirthDateParser
+
+
+def _strptime_reference(raw_value: str) -> str | None:
+    """Reproduit l'ancienne normalisation fondée sur strptime."""
+
+    cleaned = raw_value.replace(" ", "").replace(".", "/")
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+class BirthDateParserTestCase(unittest.TestCase):
+    """Vérifie l'équivalence avec strptime et la validation des bornes."""
+
+    def test_parse_supports_all_formats(self) -> None:
+        dates = BirthDateParser()
+
+        self.assertEqual(dates.parse("05/09/1981"), "1981-09-05")
+        self.assertEqual(dates.parse("5-9-1981"), "1981-09-05")
+        self.assertEqual(dates.parse("1990-12-01"), "1990-12-01")
+        self.assertEqual(dates.parse("01.01.90"), "1990-01-01")
+        self.assertEqual(dates.parse("01/01/68"), "2068-01-01")
+
+    def test_parse_rejects_impossible_dates(self) -> None:
+        dates = BirthDateParser()
+
+        self.assertEqual(dates.parse("29/02/2000"), "2000-02-29")
+        self.assertIsNone(dates.parse("29/02/1900"))
+        self.assertIsNone(dates.parse("31/04/1990"))
+        self.assertIsNone(dates.parse("00/01/1990"))
+        self.assertIsNone(dates.parse("01/01/0000"))
+        self.assertIsNone(dates.parse("inconnue"))
+
+    def test_parse_matches_strptime_on_random_values(self) -> None:
+        generator = random.Random(42)
+        separators = ["/", "-", ".", " ", ""]
+        dates = BirthDateParser()
+        for _ in range(3000):
+            year = generator.choice(
+                [generator.randint(0, 99), generator.randint(0, 2100)]
+            )
+            parts = [
+                str(generator.randint(0, 40)),
+                str(generator.randint(0, 14)),
+                str(year).zfill(generator.choice([1, 2, 4])),
+            ]
+            if generator.random() < 0.3:
+                parts.reverse()
+            value = generator.choice(separators).join(parts)
+            self.assertEqual(
+                dates.parse(value), _strptime_reference(value), value
+            )
+
+    def test_shared_cache_eviction_is_thread_safe(self) -> None:
+        errors: list[BaseException] = []
+        previous_interval = sys.getswitchinterval()
+
+        def parse_many(month: int) -> None:
+            dates = BirthDateParser(cache_size=2)
+            try:
+                for index in range(20000):
+                    day = index % 28 + 1
+                    dates.parse(f"{day:02d}/{month:02d}/{1900 + index % 100}")
+            except BaseException as error:  # noqa: BLE001
+                errors.append(error)
+
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [
+                threading.Thread(target=parse_many, args=(month,))
+                for month in range(1, 9)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(previous_interval)
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(
+            len(BirthDateParser(cache_size=2)._format_set.cache), 2
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
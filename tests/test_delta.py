@@ -0,0 +1,109 @@
+"""Tests du mode delta par rapport à la liste précédente."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus.delta import RowDelta, load_previous_rows
+from listedetenus.workflow import convert_pdf_to_delta
+
+PREVIOUS_CSV = (
+    "nom,prenom,date_naissance\n"
+    "ABAS,Lena,1981-09-05\n"
+    "BRUN,Paul,1975-03-02\n"
+    "ZEE,Mara,1990-12-01\n"
+)
+CURRENT_TEXT = (
+    "Nom;Prénom;Date\n"
+    "ABAS;Lena;05/09/1981\n"
+    "NOUVEAU;Eli;01/02/2000\n"
+    "ZEE;Mara;1990-12-01"
+)
+
+
+class RowDeltaTestCase(unittest.TestCase):
+    """Vérifie le calcul des arrivées et départs."""
+
+    def test_duplicates_are_counted(self) -> None:
+        row = ("ABAS", "Lena", "1981-09-05")
+        delta = RowDelta(Counter({row: 2}))
+
+        changes = list(delta.iter_changes([row]))
+
+        self.assertEqual(changes, [("depart", row)])
+        self.assertEqual(
+            (delta.arrivals, delta.departures, delta.unchanged), (0, 1, 1)
+        )
+
+    def test_previous_csv_requires_standard_headers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            previous = Path(tmp_dir) / "previous.csv"
+            previous.write_text("a,b\n1,2\n", encoding="utf-8")
+
+            with self.assertRaises(ValueError):
+                load_previous_rows(previous)
+
+
+class ConvertPdfToDeltaTestCase(unittest.TestCase):
+    """Vérifie l'écriture des fichiers delta."""
+
+    def _write_inputs(self, directory: Path) -> tuple[Path, Path]:
+        pdf_path = directory / "source.pdf"
+        pdf_path.write_text(CURRENT_TEXT, encoding="utf-8")
+        previous = directory / "previous.csv"
+        previous.write_text(PREVIOUS_CSV, encoding="utf-8")
+        return pdf_path, previous
+
+    def test_delta_csv_has_operation_column(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path, previous = self._write_inputs(Path(tmp_dir))
+            output = Path(tmp_dir) / "delta.csv"
+
+            summary = convert_pdf_to_delta(pdf_path, previous, output)
+
+            self.assertEqual(
+                output.read_text(encoding="utf-8").splitlines(),
+                [
+                    "operation,nom,prenom,date_naissance",
+                    "arrivee,NOUVEAU,Eli,2000-02-01",
+                    "depart,BRUN,Paul,1975-03-02",
+                ],
+            )
+        self.assertEqual(
+            (summary.arrivals, summary.departures, summary.unchanged),
+            (1, 1, 2),
+        )
+
+    def test_split_delta_writes_two_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path, previous = self._write_inputs(Path(tmp_dir))
+            output = Path(tmp_dir) / "delta.csv"
+
+            summary = convert_pdf_to_delta(
+                pdf_path, previous, output, split=True
+            )
+            arrivals, departures = summary.outputs
+
+            self.assertEqual(arrivals.name, "delta-arrivees.csv")
+            self.assertEqual(
+                arrivals.read_text(encoding="utf-8").splitlines()[1:],
+                ["NOUVEAU,Eli,2000-02-01"],
+            )
+            self.assertEqual(
+                departures.read_text(encoding="utf-8").splitlines()[1:],
+                ["BRUN,Paul,1975-03-02"],
+            )
+            self.assertFalse(output.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
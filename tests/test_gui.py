@@ -0,0 +1,86 @@
+"""Tests de la conversion en arrière-plan de l'interface graphique."""
+
+from __future__ import annotations
+
+import queue
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+try:
+    from listedetenus import gui
+except ImportError:  # pragma: no cover - Tk absent
+    gui = None
+
+
+@unittest.skipIf(gui is None, "tkinter indisponible")
+class WorkerConversionTestCase(unittest.TestCase):
+    """Vérifie les messages et l'annulation des tâches de la file."""
+
+    def _run(self, cancelled: bool) -> tuple[str | None, list[tuple]]:
+        messages: queue.Queue[tuple] = queue.Queue()
+        cancel_event = threading.Event()
+        if cancelled:
+            cancel_event.set()
+        gui._init_worker(messages, cancel_event)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text(
+                "Nom;Prénom;Date\nABAS;Lena;05/09/1981", encoding="utf-8"
+            )
+            result = gui._convert_file(
+                "I001", pdf_path, Path(tmp_dir) / "source.csv"
+            )
+        received = []
+        while not messages.empty():
+            received.append(messages.get_nowait())
+        return result, received
+
+    def test_worker_reports_start_and_progress(self) -> None:
+        result, received = self._run(cancelled=False)
+
+        self.assertIsNone(result)
+        self.assertEqual(received[0], ("start", "I001"))
+        self.assertEqual(received[-1][:2], ("progress", "I001"))
+
+    def test_worker_returns_cancel_marker(self) -> None:
+        result, _ = self._run(cancelled=True)
+
+        self.assertEqual(result, gui.CANCELLED_MARKER)
+
+
+
+@unittest.skipIf(gui is None, "tkinter indisponible")
+class MessageOrderingTestCase(unittest.TestCase):
+    """Vérifie qu'un fichier terminé n'est plus modifié par la file."""
+
+    def test_late_progress_does_not_reopen_finished_item(self) -> None:
+        app = gui.ConversionApp.__new__(gui.ConversionApp)
+        app._finished = set()
+        app._remaining = 1
+        app._files = {}
+        updates: list[tuple[str, str, float]] = []
+        with mock.patch.object(
+            app,
+            "_update_item",
+            lambda *update: updates.append(update),
+            create=True,
+        ):
+            app._apply_message(("done", "I001", None))
+            app._apply_message(("progress", "I001", 1, 2))
+            app._apply_message(("start", "I001"))
+
+        self.assertEqual(updates, [("I001", gui.STATUS_DONE, 1.0)])
+        self.assertEqual(app._remaining, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
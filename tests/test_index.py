@@ -0,0 +1,135 @@
+"""Tests de l'index de recherche persistant."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus import cli, index
+from listedetenus.index import IndexMatch, SearchIndex, normalize_name
+from listedetenus.models import Detainee
+
+FIRST_LIST = [
+    Detainee("Lefèvre", "Chloé", "1990-01-02"),
+    Detainee("DUPONT", "Jean", "1980-03-04"),
+    Detainee("Dupuis", "Anne", "1975-05-06"),
+]
+
+
+def _write_csv(path: Path, *rows: str) -> Path:
+    path.write_text(
+        "\n".join(["nom,prenom,date_naissance", *rows]) + "\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+class SearchIndexTestCase(unittest.TestCase):
+    """Vérifie l'ajout de listes et les recherches exactes ou par préfixe."""
+
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp_dir.name)
+        self.index = SearchIndex(self.root / "index")
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def test_normalize_name_folds_accents_and_case(self) -> None:
+        self.assertEqual(normalize_name("  Lefèvre-d'Été "), "LEFEVRE-D'ETE")
+        self.assertEqual(normalize_name("Anne\x1fMarie"), "ANNE MARIE")
+
+    def test_exact_search_ignores_accents_and_case(self) -> None:
+        self.index.add("liste-1", FIRST_LIST)
+
+        found = SearchIndex(self.root / "index").search(
+            "lefevre", "chloe", "1990-01-02"
+        )
+
+        expected = IndexMatch("Lefèvre", "Chloé", "1990-01-02", "liste-1")
+        self.assertEqual(found, [expected])
+        missing = self.index.search("lefevre", "chloe", "1990-01-03")
+        self.assertEqual(missing, [])
+        self.assertEqual(self.index.search("lef"), [])
+
+    def test_prefix_search_on_last_given_name(self) -> None:
+        self.index.add("liste-1", FIRST_LIST)
+
+        by_name = self.index.search("dup", prefix=True)
+        by_first_name = self.index.search("dupont", "je", prefix=True)
+
+        limited = self.index.search("dup", prefix=True, limit=1)
+        names = [match.nom for match in by_name]
+        self.assertEqual(names, ["DUPONT", "Dupuis"])
+        self.assertEqual([match.prenom for match in by_first_name], ["Jean"])
+        self.assertEqual(len(limited), 1)
+
+    def test_added_lists_are_searched_together(self) -> None:
+        first = _write_csv(self.root / "a.csv", "DUPONT,Jean,1980-03-04")
+        second = _write_csv(self.root / "b.csv", "DUPONT,Jean,1980-03-04")
+        self.index.add_csv(first)
+        self.index.add_csv(second)
+
+        found = SearchIndex(self.root / "index").search("Dupont", "Jean")
+
+        self.assertEqual(
+            [match.source for match in found],
+            [str(first.resolve()), str(second.resolve())],
+        )
+
+    def test_reindexing_a_list_replaces_its_rows(self) -> None:
+        csv_path = _write_csv(self.root / "a.csv", "DUPONT,Jean,1980-03-04")
+        self.index.add_csv(csv_path)
+        _write_csv(csv_path, "MARTIN,Paul,1970-07-08")
+        self.index.add_csv(csv_path)
+
+        self.assertEqual(self.index.search("dupont"), [])
+        self.assertEqual(len(self.index.search("martin")), 1)
+        self.assertEqual(self.index.sources, [str(csv_path.resolve())])
+
+    def test_compaction_merges_segments_and_drops_retired_rows(self) -> None:
+        with mock.patch.object(index, "SEGMENT_ROWS", 1):
+            with mock.patch.object(index, "MAX_SEGMENTS", 4):
+                self.index.add("liste-1", FIRST_LIST)
+                self.index.add("liste-1", FIRST_LIST[:2])
+
+        segments = sorted((self.root / "index").glob("segment-*.keys"))
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(self.index.search("dupuis"), [])
+        self.assertEqual(len(self.index.search("d", prefix=True)), 1)
+
+    def test_add_csv_rejects_unexpected_columns(self) -> None:
+        csv_path = self.root / "delta.csv"
+        csv_path.write_text("operation,nom\n+,A\n", encoding="utf-8")
+
+        with self.assertRaises(ValueError):
+            self.index.add_csv(csv_path)
+        self.assertEqual(self.index.sources, [])
+
+    def test_cli_indexes_converted_csv(self) -> None:
+        pdf_path = self.root / "source.pdf"
+        pdf_path.write_text(
+            "Nom;Prénom;Date\nABAS;Léna;05/09/1981", encoding="utf-8"
+        )
+        csv_path = self.root / "result.csv"
+        index_dir = self.root / "index"
+
+        status = cli.main(
+            [str(pdf_path), str(csv_path), "--index", str(index_dir)]
+        )
+
+        self.assertEqual(status, 0)
+        (found,) = SearchIndex(index_dir).search("abas", "lena")
+        self.assertEqual(found.date_naissance, "1981-09-05")
+
+
+if __name__ == "__main__":
+    unittest.main()
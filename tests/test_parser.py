@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import random
 import sys
 import tempfile
 import unittest
@@ -12,9 +13,17 @@ SRC_DIR = PROJECT_ROOT / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
-from listedetenus.csv_writer import write_csv
-from listedetenus.models import Detainee
-from listedetenus.parser import tables_to_detainees
+from listedetenus import parser
+from listedetenus.constants import HEADER_KEYWORDS, HEADER_SEARCH_DEPTH
+from listedetenus.csv_writer import write_csv, write_csv_batches
+from listedetenus.models import Detainee, DetaineeBatch
+from listedetenus.parser import (
+    DuplicateFilter,
+    _match_header_signature,
+    iter_detainee_batches,
+    iter_detainees,
+    tables_to_detainees,
+)
 
 
 class TablesToDetaineesTestCase(unittest.TestCase):
@@ -94,6 +103,165 @@ class TablesToDetaineesTestCase(unittest.TestCase):
             ],
         )
 
+    def test_iter_detainees_consumes_tables_lazily(self) -> None:
+        consumed: list[int] = []
+
+        def tables():
+            for index in range(3):
+                consumed.append(index)
+                yield [
+                    ["Nom", "Prénom", "Date de naissance"],
+                    [f"NOM{index}", "Lena", "05/09/1981"],
+                ]
+
+        detainees = iter_detainees(tables())
+        first = next(detainees)
+
+        self.assertEqual(first.nom, "NOM0")
+        self.assertEqual(consumed, [0])
+        self.assertEqual([item.nom for item in detainees], ["NOM1", "NOM2"])
+
+    def test_iter_detainee_batches_stores_columns(self) -> None:
+        table = [
+            ["Nom", "Prénom", "Date de naissance"],
+            ["ABAS", "Lena", "05/09/1981"],
+            ["ZEE", "Mara", "1990-12-01"],
+            ["ROY", "Lena", "05/09/1981"],
+        ]
+
+        batches = list(iter_detainee_batches([table], batch_size=2))
+
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        self.assertIs(batches[0].prenoms[0], batches[1].prenoms[0])
+        self.assertEqual(
+            [detainee for batch in batches for detainee in batch],
+            tables_to_detainees([table]),
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "detenus.csv"
+            write_csv_batches(csv_path, batches)
+            self.assertEqual(
+                csv_path.read_text(encoding="utf-8").splitlines()[1:],
+                [
+                    "ABAS,Lena,1981-09-05",
+                    "ZEE,Mara,1990-12-01",
+                    "ROY,Lena,1981-09-05",
+                ],
+            )
+
+    def test_detainee_batch_round_trips_detainees(self) -> None:
+        detainees = [
+            Detainee(nom="ABAS", prenom="Lena", date_naissance="1981-09-05")
+        ]
+
+        batch = DetaineeBatch.from_detainees(detainees)
+
+        self.assertEqual(list(batch), detainees)
+        self.assertFalse(hasattr(detainees[0], "__dict__"))
+
+    def test_header_matcher_agrees_with_keyword_scan(self) -> None:
+        generator = random.Random(7)
+        words = ["Nom", "Prénom", "prenom", "Date", "naissance", "n°", "x"]
+        for _ in range(500):
+            row = tuple(
+                " ".join(generator.sample(words, generator.randint(1, 3)))
+                for _ in range(generator.randint(1, 5))
+            )
+            self.assertEqual(
+                _match_header_signature(row), _keyword_scan(row), row
+            )
+
+    def test_header_cache_keeps_only_headers(self) -> None:
+        parser._HEADER_SIGNATURES.clear()
+        header = ("NOM", "Prénom", "Date de naissance")
+
+        self.assertIsNone(_match_header_signature(("ABAS", "Lena", "x")))
+        self.assertEqual(_match_header_signature(header), (0, 1, 2))
+
+        self.assertEqual(
+            list(parser._HEADER_SIGNATURES),
+            [("nom", "prénom", "date de naissance")],
+        )
+
+    def test_tables_to_detainees_limits_header_search_depth(self) -> None:
+        filler = [["titre", "page"]] * HEADER_SEARCH_DEPTH
+        table = filler + [
+            ["Nom", "Prénom", "Date de naissance"],
+            ["ABAS", "Lena", "05/09/1981"],
+        ]
+
+        with self.assertRaises(ValueError):
+            tables_to_detainees([table])
+
+
+class DuplicateFilterTestCase(unittest.TestCase):
+    """Vérifie le dédoublonnage en flux des lignes répétées."""
+
+    def test_rows_repeated_across_tables_are_dropped(self) -> None:
+        first = [
+            ["Nom", "Prénom", "Date de naissance"],
+            ["ABAS", "Lena", "05/09/1981"],
+            ["ZEE", "Mara", "1990-12-01"],
+        ]
+        second = [
+            ["Nom", "Prénom", "Date de naissance"],
+            ["ZEE", "Mara", "01/12/1990"],
+            ["BRUN", "Paul", "02/03/1975"],
+        ]
+        dedup = DuplicateFilter()
+
+        detainees = tables_to_detainees([first, second], dedup=dedup)
+
+        self.assertEqual(
+            [detainee.nom for detainee in detainees], ["ABAS", "ZEE", "BRUN"]
+        )
+        self.assertEqual(dedup.dropped, 1)
+
+    def test_bloom_mode_drops_the_same_rows(self) -> None:
+        rows = [
+            (f"NOM{index % 700}", "Lena", "1981-09-05")
+            for index in range(2000)
+        ]
+        exact = DuplicateFilter()
+        bloom = DuplicateFilter(bloom_capacity=1000)
+
+        self.assertEqual(
+            list(exact.filter_records(rows)), list(bloom.filter_records(rows))
+        )
+        self.assertEqual(bloom.dropped, 1300)
+
+    def test_filter_batches_keeps_columns_aligned(self) -> None:
+        batch = DetaineeBatch()
+        for nom in ("A", "B", "A"):
+            batch.append(nom, "Lena", "1981-09-05")
+
+        kept = list(DuplicateFilter().filter_batches([batch]))
+
+        self.assertEqual(
+            [row for item in kept for row in item.iter_rows()],
+            [("A", "Lena", "1981-09-05"), ("B", "Lena", "1981-09-05")],
+        )
+
+
+def _keyword_scan(row: tuple[str, ...]) -> tuple[int, int, int] | None:
+    """Reproduit la recherche d'entêtes cellule par cellule."""
+
+    positions: dict[str, int] = {}
+    for cell_index, cell in enumerate(row):
+        lowered = cell.lower()
+        for field, keywords in HEADER_KEYWORDS.items():
+            if field in positions:
+                continue
+            if any(keyword in lowered for keyword in keywords):
+                positions[field] = cell_index
+    if len(positions) != len(HEADER_KEYWORDS):
+        return None
+    return (
+        positions["nom"],
+        positions["prenom"],
+        positions["date_naissance"],
+    )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,69 @@
+"""Tests du décodage des flux de contenu PDF."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus.pdf_content import iter_content_streams, iter_text_lines
+from listedetenus.pdf_loader import read_pdf_tables
+from tests.pdf_samples import build_pdf, page_content
+
+
+class PdfContentTestCase(unittest.TestCase):
+    """Vérifie l'extraction du texte des flux FlateDecode."""
+
+    def test_iter_text_lines_groups_cells_by_vertical_position(self) -> None:
+        content = (
+            b"BT /F1 10 Tf 40 800 Td (Nom) Tj 150 0 Td (Pr\\351nom) Tj "
+            b"ET BT 40 786 Td [(AB) -20 (AS)] TJ ET "
+            b"BT 190 786 Td <4C656E61> Tj ET"
+        )
+
+        lines = list(iter_text_lines(content))
+
+        self.assertEqual(lines, [["Nom", "Prénom"], ["ABAS", "Lena"]])
+
+    def test_iter_content_streams_skips_images_and_inflates(self) -> None:
+        text = zlib.compress(b"BT (A) Tj ET")
+        data = (
+            b"%%PDF-1.4\n1 0 obj\n<< /Subtype /Image /Length 3 >>\nstream\n"
+            b"xyz\nendstream\nendobj\n2 0 obj\n<< /Length %d /Filter "
+            b"/FlateDecode >>\nstream\n%s\nendstream\nendobj\n"
+            % (len(text), text)
+        )
+
+        self.assertEqual(list(iter_content_streams(data)), [b"BT (A) Tj ET"])
+
+    def test_read_pdf_tables_reads_compressed_pages(self) -> None:
+        pages = [
+            page_content(
+                [["Nom", "Prénom", "Date"], ["ABAS", "Lena", "05/09/1981"]]
+            ),
+            page_content([["Nom;Prénom;Date"], ["ZEE;Mara;1990-12-01"]]),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "sample.pdf"
+            pdf_path.write_bytes(build_pdf(pages))
+
+            result = read_pdf_tables(pdf_path)
+
+        self.assertEqual(
+            result.tables,
+            [
+                [["Nom", "Prénom", "Date"], ["ABAS", "Lena", "05/09/1981"]],
+                [["Nom", "Prénom", "Date"], ["ZEE", "Mara", "1990-12-01"]],
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
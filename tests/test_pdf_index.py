@@ -0,0 +1,63 @@
+"""Tests de l'index des pages construit depuis la table xref."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus.pdf_index import PdfPageIndex
+from listedetenus.pdf_loader import count_pdf_pages, iter_pdf_tables
+from tests.pdf_samples import build_compact_pdf, build_pdf, page_content
+
+PAGES = [
+    page_content([["Nom", "Prénom", "Date"], ["ABAS", "Lena", "05/09/1981"]]),
+    page_content([["Nom", "Prénom", "Date"], ["ZEE", "Mara", "1990-12-01"]]),
+    page_content([["Nom", "Prénom", "Date"], ["ROY", "Ana", "02/03/1970"]]),
+]
+
+
+class PdfPageIndexTestCase(unittest.TestCase):
+    """Vérifie la lecture de la table xref et de l'arbre des pages."""
+
+    def test_index_reads_classic_xref_table(self) -> None:
+        index = PdfPageIndex(build_pdf(PAGES))
+
+        self.assertEqual(index.page_count, 3)
+        self.assertEqual(index.page_content(1), PAGES[1])
+
+    def test_index_reads_xref_stream_and_object_stream(self) -> None:
+        index = PdfPageIndex(build_compact_pdf(PAGES))
+
+        self.assertEqual(index.page_count, 3)
+        self.assertEqual(list(index.iter_page_contents(range(2, 3))), [
+            PAGES[2]
+        ])
+
+    def test_index_rejects_missing_xref(self) -> None:
+        with self.assertRaises(ValueError):
+            PdfPageIndex(b"%PDF-1.4\n1 0 obj\n<< >>\nendobj\n")
+
+    def test_iter_pdf_tables_reads_selected_pages(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "sample.pdf"
+            pdf_path.write_bytes(build_compact_pdf(PAGES))
+
+            tables = list(iter_pdf_tables(pdf_path, pages=range(1, 2)))
+            page_count = count_pdf_pages(pdf_path)
+
+        self.assertEqual(page_count, 3)
+        self.assertEqual(
+            tables,
+            [[["Nom", "Prénom", "Date"], ["ZEE", "Mara", "1990-12-01"]]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,13 +6,20 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_DIR = PROJECT_ROOT / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
-from listedetenus.pdf_loader import read_pdf_tables
+from listedetenus import pdf_loader
+from listedetenus.pdf_loader import (
+    iter_chunk_tables,
+    iter_pdf_tables,
+    plan_pdf_chunks,
+    read_pdf_tables,
+)
 
 
 class PdfLoaderTestCase(unittest.TestCase):
@@ -35,6 +42,109 @@ class PdfLoaderTestCase(unittest.TestCase):
             ]
             self.assertEqual(result.tables, [expected])
 
+    def test_iter_pdf_tables_yields_tables_one_by_one(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "sample.pdf"
+            pdf_path.write_text(
+                "Nom;Prénom\nA;B\n\n  \nNom;Prénom\nC;D\n",
+                encoding="utf-8",
+            )
+
+            tables = list(iter_pdf_tables(pdf_path))
+
+            self.assertEqual(
+                tables,
+                [
+                    [["Nom", "Prénom"], ["A", "B"]],
+                    [["Nom", "Prénom"], ["C", "D"]],
+                ],
+            )
+
+    def test_read_pdf_tables_decodes_across_small_chunks(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "sample.pdf"
+            pdf_path.write_bytes(
+                "Nom;Prénom\r\nÉLIE;Loïc\r\n".encode("utf-8")
+            )
+
+            with mock.patch.object(pdf_loader, "DECODE_CHUNK_SIZE", 3):
+                result = read_pdf_tables(pdf_path)
+
+            self.assertEqual(
+                result.tables, [[["Nom", "Prénom"], ["ÉLIE", "Loïc"]]]
+            )
+
+    def test_read_pdf_tables_falls_back_to_latin1(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "sample.pdf"
+            pdf_path.write_bytes("Nom;Prénom\nA;Zoé".encode("latin-1"))
+
+            result = read_pdf_tables(pdf_path)
+
+            self.assertEqual(
+                result.tables, [[["Nom", "Prénom"], ["A", "Zoé"]]]
+            )
+
+    def test_latin1_after_ascii_sample_keeps_accents(self) -> None:
+        ascii_rows = "Nom;Prenom\n" + "A;B\n" * 20000
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "sample.pdf"
+            pdf_path.write_bytes(
+                (ascii_rows + "DURAND;Hélène\n").encode("latin-1")
+            )
+
+            result = read_pdf_tables(pdf_path)
+
+            self.assertEqual(result.tables[0][-1], ["DURAND", "Hélène"])
+
+    def test_read_pdf_tables_rejects_empty_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "sample.pdf"
+            pdf_path.write_bytes(b"")
+            with self.assertRaises(ValueError):
+                read_pdf_tables(pdf_path)
+
+    def test_plan_pdf_chunks_splits_text_on_blank_lines(self) -> None:
+        blocks = [f"Nom;Prénom\nN{index};P" for index in range(6)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "sample.pdf"
+            pdf_path.write_text("\n\n".join(blocks), encoding="utf-8")
+
+            chunks = plan_pdf_chunks(pdf_path, 3)
+            tables = [
+                table
+                for chunk in chunks
+                for table in iter_chunk_tables(pdf_path, chunk)
+            ]
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(tables, list(_split_blocks(blocks)))
+
+    def test_read_pdf_tables_uses_one_separator_per_table(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "sample.pdf"
+            pdf_path.write_text(
+                "Nom\tPrénom\tDate\n"
+                "DUPONT, JR\tJean\t01/01/1990\n"
+                "ROY\tAna\t02/03/1970\n"
+                "ligne;hors;dialecte;ici",
+                encoding="utf-8",
+            )
+
+            result = read_pdf_tables(pdf_path)
+
+        self.assertEqual(
+            result.tables,
+            [
+                [
+                    ["Nom", "Prénom", "Date"],
+                    ["DUPONT, JR", "Jean", "01/01/1990"],
+                    ["ROY", "Ana", "02/03/1970"],
+                    ["ligne", "hors", "dialecte", "ici"],
+                ]
+            ],
+        )
+
     def test_read_pdf_tables_rejects_non_pdf_extension(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             text_path = Path(tmp_dir) / "sample.txt"
@@ -43,5 +153,12 @@ class PdfLoaderTestCase(unittest.TestCase):
                 read_pdf_tables(text_path)
 
 
+def _split_blocks(blocks: list[str]):
+    """Découpe les blocs de test comme le ferait le lecteur textuel."""
+
+    for block in blocks:
+        yield [line.split(";") for line in block.splitlines()]
+
+
 if __name__ == "__main__":
     unittest.main()
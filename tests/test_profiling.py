@@ -0,0 +1,76 @@
+"""Tests du profilage et du traçage mémoire d'une conversion."""
+
+from __future__ import annotations
+
+import io
+import pstats
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus.profiling import memory_traced, profiled
+from listedetenus.stats import STAGE_DATES, ConversionStats
+from listedetenus.workflow import convert_pdf_to_csv
+
+SOURCE_TEXT = "Nom;Prénom;Date\n" + "ABAS;Lena;05/09/1981\n" * 200
+
+
+class ProfilingTestCase(unittest.TestCase):
+    """Vérifie les rapports produits autour d'une conversion."""
+
+    def _write_source(self, directory: Path) -> Path:
+        pdf_path = directory / "source.pdf"
+        pdf_path.write_text(SOURCE_TEXT, encoding="utf-8")
+        return pdf_path
+
+    def test_profiled_writes_pstats_and_summary(self) -> None:
+        report = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = self._write_source(Path(tmp_dir))
+            profile_path = Path(tmp_dir) / "conversion.pstats"
+
+            with profiled(profile_path, report, top=5):
+                convert_pdf_to_csv(pdf_path, Path(tmp_dir) / "result.csv")
+
+            functions = pstats.Stats(str(profile_path)).stats
+        self.assertTrue(
+            any(name == "convert_pdf_to_csv" for _, _, name in functions)
+        )
+        self.assertIn("cumulative time", report.getvalue())
+
+    def test_profile_failure_does_not_mask_conversion_error(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            unwritable = Path(tmp_dir) / "absent" / "conversion.pstats"
+
+            with self.assertLogs("listedetenus.profiling", "ERROR"):
+                with self.assertRaises(ValueError):
+                    with profiled(unwritable, io.StringIO()):
+                        raise ValueError("conversion en échec")
+
+    def test_memory_traced_reports_stage_peaks(self) -> None:
+        report = io.StringIO()
+        stats = ConversionStats()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = self._write_source(Path(tmp_dir))
+
+            with memory_traced(stats, report, top=3) as probe:
+                convert_pdf_to_csv(
+                    pdf_path, Path(tmp_dir) / "result.csv", stats=stats
+                )
+
+        self.assertGreater(probe.peak_bytes[STAGE_DATES], 0)
+        self.assertGreaterEqual(
+            probe.overall_peak, max(probe.peak_bytes.values())
+        )
+        self.assertIn("Pic mémoire par étape", report.getvalue())
+        self.assertIn("Principaux sites d'allocation", report.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
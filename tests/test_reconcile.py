@@ -0,0 +1,141 @@
+"""Tests du rapprochement approximatif de deux listes."""
+
+from __future__ import annotations
+
+import csv
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus.models import Detainee
+from listedetenus.reconcile import (
+    STATUS_AMBIGUOUS,
+    STATUS_MATCHED,
+    STATUS_UNMATCHED,
+    bounded_distance,
+    load_detainees,
+    reconcile,
+    reconcile_csv,
+)
+
+
+class ReconcileTestCase(unittest.TestCase):
+    """Vérifie le blocage, les distances et le classement des paires."""
+
+    def test_bounded_distance_stops_beyond_limit(self) -> None:
+        self.assertEqual(bounded_distance("DUPONT", "DUPOND", 2), 1)
+        self.assertEqual(bounded_distance("KITTEN", "SITTING", 3), 3)
+        self.assertEqual(bounded_distance("KITTEN", "SITTING", 2), 3)
+        self.assertEqual(bounded_distance("", "AB", 2), 2)
+
+    def test_spelling_variants_are_matched(self) -> None:
+        left = [
+            Detainee("DUPONT", "Jean-Pierre", "1980-03-04"),
+            Detainee("Lefèvre", "Chloé", "1990-01-02"),
+        ]
+        right = [
+            Detainee("LEFEVRE", "Chloe", "1990-01-02"),
+            Detainee("DUPOND", "Jean Pierre", "1980-03-04"),
+        ]
+
+        result = reconcile(left, right)
+
+        self.assertEqual(result.matched, [(0, 1, 1), (1, 0, 0)])
+        self.assertEqual(result.exact_matches, 1)
+        self.assertEqual(result.unmatched_left, [])
+        self.assertEqual(result.unmatched_right, [])
+
+    def test_other_birth_date_or_distant_name_is_unmatched(self) -> None:
+        left = [
+            Detainee("DUPONT", "Jean", "1980-03-04"),
+            Detainee("MARTIN", "Paul", "1970-07-08"),
+        ]
+        right = [
+            Detainee("DUPONT", "Jean", "1980-03-05"),
+            Detainee("BERNARD", "Paul", "1970-07-08"),
+        ]
+
+        result = reconcile(left, right)
+
+        self.assertEqual(result.matched, [])
+        self.assertEqual(result.unmatched_left, [0, 1])
+        self.assertEqual(result.unmatched_right, [0, 1])
+
+    def test_equally_close_candidates_are_ambiguous(self) -> None:
+        left = [Detainee("DUPONT", "Jean", "1980-03-04")]
+        right = [
+            Detainee("DUPOND", "Jean", "1980-03-04"),
+            Detainee("DUPONS", "Jean", "1980-03-04"),
+        ]
+
+        result = reconcile(left, right)
+
+        self.assertEqual(result.matched, [])
+        self.assertEqual(result.ambiguous, [(0, 0, 1), (0, 1, 1)])
+        self.assertEqual(result.unmatched_right, [])
+
+    def test_reconcile_rejects_negative_distance(self) -> None:
+        with self.assertRaises(ValueError):
+            reconcile([], [], max_distance=-1)
+
+    def test_load_detainees_reports_malformed_line(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "liste.csv"
+            csv_path.write_text(
+                "nom,prenom,date_naissance\n"
+                "DUPONT,Jean,1980-03-04\nMARTIN,Paul\n",
+                encoding="utf-8",
+            )
+
+            with self.assertRaisesRegex(ValueError, "Ligne 3 de liste.csv"):
+                load_detainees(csv_path)
+
+    def test_reconcile_csv_writes_statuses(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            left_csv = root / "hier.csv"
+            right_csv = root / "aujourdhui.csv"
+            left_csv.write_text(
+                "nom,prenom,date_naissance\n"
+                "DUPONT,Jean,1980-03-04\nMARTIN,Paul,1970-07-08\n",
+                encoding="utf-8",
+            )
+            right_csv.write_text(
+                "nom,prenom,date_naissance\n"
+                "DUPOND,Jean,1980-03-04\nABAS,Lena,1981-09-05\n",
+                encoding="utf-8",
+            )
+
+            summary = reconcile_csv(
+                left_csv, right_csv, root / "rapprochement.csv"
+            )
+
+            with summary.output.open(encoding="utf-8", newline="") as handle:
+                rows = list(csv.DictReader(handle))
+
+        self.assertEqual(summary.matched, 1)
+        self.assertEqual(summary.unmatched_left, 1)
+        self.assertEqual(summary.unmatched_right, 1)
+        statuses = [
+            (row["statut"], row["nom_gauche"], row["nom_droite"])
+            for row in rows
+        ]
+        self.assertEqual(
+            statuses,
+            [
+                (STATUS_MATCHED, "DUPONT", "DUPOND"),
+                (STATUS_UNMATCHED, "MARTIN", ""),
+                (STATUS_UNMATCHED, "", "ABAS"),
+            ],
+        )
+        self.assertNotIn(STATUS_AMBIGUOUS, {row["statut"] for row in rows})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Tests du service local de conversion."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest import mock
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus import server as server_module
+from listedetenus.server import ConversionServer
+
+SOURCE = "Nom;Prénom;Date\nABAS;Lena;05/09/1981".encode("utf-8")
+
+
+class ConversionServerTestCase(unittest.TestCase):
+    """Vérifie les réponses du service avec un client HTTP local."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ConversionServer(
+            ("127.0.0.1", 0), workers=1, queue_size=1, timeout=30
+        )
+        cls.thread = threading.Thread(
+            target=cls.server.serve_forever, daemon=True
+        )
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+
+    def _post(self, body: bytes) -> urllib.request.Request:
+        return urllib.request.Request(
+            f"{self.server.url}/convert", data=body, method="POST"
+        )
+
+    def test_post_returns_csv(self) -> None:
+        with urllib.request.urlopen(self._post(SOURCE), timeout=30) as reply:
+            self.assertEqual(reply.status, 200)
+            self.assertEqual(
+                reply.read().decode("utf-8").splitlines(),
+                ["nom,prenom,date_naissance", "ABAS,Lena,1981-09-05"],
+            )
+
+    def test_invalid_document_is_rejected(self) -> None:
+        with self.assertRaises(urllib.error.HTTPError) as caught:
+            urllib.request.urlopen(self._post(b"Nom;Prenom"), timeout=30)
+        self.assertEqual(caught.exception.code, 422)
+
+    def test_full_queue_returns_service_unavailable(self) -> None:
+        self.server.slots.acquire()
+        try:
+            with self.assertRaises(urllib.error.HTTPError) as caught:
+                urllib.request.urlopen(self._post(SOURCE), timeout=30)
+        finally:
+            self.server.slots.release()
+        self.assertEqual(caught.exception.code, 503)
+        self.assertEqual(caught.exception.headers["Retry-After"], "1")
+
+    def test_health(self) -> None:
+        with urllib.request.urlopen(
+            f"{self.server.url}/health", timeout=30
+        ) as reply:
+            self.assertEqual(reply.read(), b"ok\n")
+
+
+def _stuck_conversion(pdf_path: Path, csv_path: Path) -> str | None:
+    """Conversion qui ne se termine pas (remplace convert_file)."""
+
+    time.sleep(60)
+    return None
+
+
+class ConversionTimeoutTestCase(unittest.TestCase):
+    """Vérifie qu'une conversion trop longue renvoie 504."""
+
+    def test_timeout_returns_gateway_timeout_and_replaces_pool(self) -> None:
+        # Le pool envoie la tâche par référence: ses processus exécutent
+        # la conversion bloquée à la place de convert_file.
+        with mock.patch.object(
+            server_module, "convert_file", _stuck_conversion
+        ):
+            server = ConversionServer(
+                ("127.0.0.1", 0), workers=1, queue_size=1, timeout=0.5
+            )
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            first_pool = server.executor
+            try:
+                request = urllib.request.Request(
+                    f"{server.url}/convert", data=SOURCE, method="POST"
+                )
+                started = time.monotonic()
+                with self.assertRaises(urllib.error.HTTPError) as caught:
+                    urllib.request.urlopen(request, timeout=30)
+                elapsed = time.monotonic() - started
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+
+        self.assertEqual(caught.exception.code, 504)
+        self.assertLess(elapsed, 30)
+        self.assertIsNot(server.executor, first_pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
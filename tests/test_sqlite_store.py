@@ -0,0 +1,136 @@
+"""Tests du stockage SQLite des détenus."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from typing import Iterator
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus import sqlite_store
+from listedetenus.models import DetaineeBatch
+from listedetenus.sqlite_store import find_detainees, write_sqlite_batches
+
+FIRST_DAY = date(2024, 5, 1)
+SECOND_DAY = date(2024, 5, 2)
+
+
+def _batch(*rows: tuple[str, str, str]) -> DetaineeBatch:
+    batch = DetaineeBatch()
+    for row in rows:
+        batch.append(*row)
+    return batch
+
+
+class SqliteStoreTestCase(unittest.TestCase):
+    """Vérifie le chargement, les modes et les recherches indexées."""
+
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp_dir.name) / "detenus.sqlite"
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def _load(
+        self, batch: DetaineeBatch, list_date: date, upsert: bool
+    ) -> int:
+        return write_sqlite_batches(
+            self.db_path,
+            [batch],
+            source="liste.pdf",
+            list_date=list_date,
+            upsert=upsert,
+        )
+
+    def test_replace_keeps_only_last_list(self) -> None:
+        self._load(_batch(("ABAS", "Lena", "1981-09-05")), FIRST_DAY, False)
+        inserted = self._load(
+            _batch(("ZEE", "Mara", "1990-12-01")), SECOND_DAY, False
+        )
+
+        self.assertEqual(inserted, 1)
+        self.assertEqual(find_detainees(self.db_path, nom="ABAS"), [])
+        (found,) = find_detainees(self.db_path, nom="ZEE", prenom="Mara")
+        self.assertEqual(found.source, "liste.pdf")
+        self.assertEqual(found.date_liste, "2024-05-02")
+
+    def test_upsert_appends_lists_and_replaces_same_day(self) -> None:
+        row = ("ABAS", "Lena", "1981-09-05")
+        self._load(_batch(row), FIRST_DAY, True)
+        second = _batch(row, ("ZEE", "Mara", "1990-12-01"))
+        self._load(second, SECOND_DAY, True)
+        self._load(_batch(row), SECOND_DAY, True)
+
+        found = find_detainees(self.db_path, date_naissance="1981-09-05")
+        self.assertEqual(
+            [item.date_liste for item in found], ["2024-05-01", "2024-05-02"]
+        )
+        self.assertEqual(find_detainees(self.db_path, nom="ZEE"), [])
+
+    def test_failed_load_leaves_database_unchanged(self) -> None:
+        self._load(_batch(("ABAS", "Lena", "1981-09-05")), FIRST_DAY, False)
+
+        def failing_batches() -> Iterator[DetaineeBatch]:
+            yield _batch(("ZEE", "Mara", "1990-12-01"))
+            raise ValueError("lecture interrompue")
+
+        with self.assertRaises(ValueError):
+            write_sqlite_batches(
+                self.db_path,
+                failing_batches(),
+                source="autre.pdf",
+                list_date=SECOND_DAY,
+            )
+
+        self.assertEqual(len(find_detainees(self.db_path, nom="ABAS")), 1)
+        self.assertEqual(find_detainees(self.db_path, nom="ZEE"), [])
+
+    def test_lookups_use_indexes(self) -> None:
+        self._load(_batch(("ABAS", "Lena", "1981-09-05")), FIRST_DAY, False)
+        criteria = [
+            {"nom": "ABAS", "prenom": "Lena"},
+            {"date_naissance": "1981-09-05"},
+        ]
+        connection = sqlite3.connect(self.db_path)
+        try:
+            for criterion in criteria:
+                query, parameters = sqlite_store._lookup_query(
+                    criterion.get("nom"),
+                    criterion.get("prenom"),
+                    criterion.get("date_naissance"),
+                )
+                plan = connection.execute(
+                    f"EXPLAIN QUERY PLAN {query}", parameters
+                ).fetchall()
+                details = " ".join(str(step[-1]) for step in plan)
+                with self.subTest(criterion=criterion):
+                    self.assertIn("USING INDEX", details)
+                    self.assertNotIn("SCAN d", details)
+        finally:
+            connection.close()
+
+    def test_find_detainees_accepts_relative_path(self) -> None:
+        self._load(_batch(("ABAS", "Lena", "1981-09-05")), FIRST_DAY, False)
+        relative = Path(os.path.relpath(self.db_path))
+
+        (found,) = find_detainees(relative, nom="ABAS")
+
+        self.assertEqual(found.prenom, "Lena")
+
+    def test_find_detainees_requires_indexed_criterion(self) -> None:
+        with self.assertRaises(ValueError):
+            find_detainees(self.db_path, prenom="Lena")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Budget de démarrage de la ligne de commande, mesuré avec -X importtime."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+# Microsecondes d'imports pour la CLI (pipeline complet chargé: ~120 ms).
+STARTUP_BUDGET_US = 60_000
+MEASURE_RUNS = 3
+PIPELINE_MODULES = {
+    "listedetenus.workflow",
+    "listedetenus.pdf_loader",
+    "listedetenus.parser",
+    "listedetenus.batch",
+    "listedetenus.cache",
+    "concurrent.futures.process",
+}
+
+
+def _run_python(*arguments: str) -> subprocess.CompletedProcess[str]:
+    """Exécute un interpréteur neuf avec le paquet dans le chemin."""
+
+    environment = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    return subprocess.run(
+        [sys.executable, *arguments],
+        capture_output=True,
+        text=True,
+        env=environment,
+        check=True,
+    )
+
+
+def _startup_time(statement: str) -> int:
+    """Microsecondes cumulées des imports faits par statement.
+
+    Seules les lignes de premier niveau postérieures à site comptent:
+    elles couvrent tout ce que statement a chargé, y compris les modules
+    importés via importlib, que -X importtime ne journalise pas eux-mêmes.
+    """
+
+    stderr = _run_python("-X", "importtime", "-c", statement).stderr
+    total = 0
+    after_site = False
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit() or name.startswith("  "):
+            continue
+        if after_site:
+            total += int(cumulative)
+        after_site = after_site or name.strip() == "site"
+    return total
+
+
+def _loaded_modules(statement: str) -> set[str]:
+    """Modules présents dans sys.modules après statement."""
+
+    code = f"{statement}\nimport sys\nprint(*sys.modules, sep=chr(10))"
+    return set(_run_python("-c", code).stdout.split())
+
+
+class StartupTestCase(unittest.TestCase):
+    """Vérifie que le démarrage ne charge pas tout le pipeline."""
+
+    def test_package_import_defers_cli_and_pipeline(self) -> None:
+        modules = _loaded_modules("from listedetenus import Detainee")
+
+        self.assertIn("listedetenus.models", modules)
+        self.assertNotIn("listedetenus.cli", modules)
+        self.assertFalse(PIPELINE_MODULES & modules)
+
+    def test_cli_import_defers_pipeline(self) -> None:
+        modules = _loaded_modules("import listedetenus.cli")
+
+        self.assertFalse(PIPELINE_MODULES & modules)
+
+    def test_cli_import_fits_startup_budget(self) -> None:
+        best = min(
+            _startup_time("import listedetenus.cli")
+            for _ in range(MEASURE_RUNS)
+        )
+
+        self.assertLess(best, STARTUP_BUDGET_US)
+
+    def test_package_exposes_lazy_attributes(self) -> None:
+        import listedetenus
+        from listedetenus.cli import main
+
+        self.assertIs(listedetenus.main, main)
+        self.assertIn("Detainee", dir(listedetenus))
+        with self.assertRaises(AttributeError):
+            getattr(listedetenus, "absent")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests des mesures de conversion."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus.stats import STAGES, ConversionStats
+from listedetenus.workflow import convert_pdf_to_csv
+from tests.pdf_samples import build_pdf, page_content
+
+SOURCE_TEXT = (
+    "Nom;Prénom;Date\n"
+    "ABAS;Lena;05/09/1981\n"
+    "BRUN;;01/01/1990\n"
+    "ZEE;Mara;31/02/1990\n"
+    "SEUL\n"
+    "\n"
+    "Titre;Sans;Entêtes\n"
+    "a;b;c"
+)
+
+
+class ConversionStatsTestCase(unittest.TestCase):
+    """Vérifie le bilan rempli pendant la conversion."""
+
+    def test_text_export_counts_rejections_by_reason(self) -> None:
+        stats = ConversionStats()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text(SOURCE_TEXT, encoding="utf-8")
+
+            convert_pdf_to_csv(
+                pdf_path, Path(tmp_dir) / "result.csv", stats=stats
+            )
+
+        self.assertEqual((stats.tables_read, stats.tables_skipped), (2, 1))
+        self.assertEqual(stats.rows_accepted, 1)
+        self.assertEqual(stats.rows_written, 1)
+        self.assertEqual(
+            dict(stats.rows_rejected),
+            {"champ_manquant": 1, "date_invalide": 1},
+        )
+        self.assertEqual(stats.bytes_read, len(SOURCE_TEXT.encode("utf-8")))
+        self.assertEqual(stats.lines_read, 8)
+        self.assertEqual(set(stats.seconds), set(STAGES))
+        self.assertGreater(stats.total_seconds, 0)
+
+    def test_real_pdf_counts_pages(self) -> None:
+        header = ["Nom", "Prénom", "Date"]
+        pages = [
+            page_content([header, [f"NOM{index}", "Lena", "05/09/1981"]])
+            for index in range(2)
+        ]
+        stats = ConversionStats()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_bytes(build_pdf(pages))
+
+            convert_pdf_to_csv(
+                pdf_path, Path(tmp_dir) / "result.csv", stats=stats
+            )
+
+        self.assertEqual(stats.pages_read, 2)
+        self.assertEqual(stats.rows_written, 2)
+        self.assertEqual(stats.as_dict()["lignes_rejetees"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
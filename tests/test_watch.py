@@ -0,0 +1,72 @@
+"""Tests de la surveillance d'un dossier de dépôt."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from listedetenus.watch import FolderWatcher
+
+
+class FolderWatcherTestCase(unittest.TestCase):
+    """Vérifie la détection, la conversion et la reprise sur état."""
+
+    def test_converts_stable_files_once_across_restarts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir) / "depot"
+            output = Path(tmp_dir) / "sortie"
+            source.mkdir()
+            (source / "a.pdf").write_text(
+                "Nom;Prénom;Date\nABAS;Lena;05/09/1981", encoding="utf-8"
+            )
+            (source / "vide.pdf").write_bytes(b"")
+            (source / "notes.txt").write_text("ignoré", encoding="utf-8")
+
+            watcher = FolderWatcher(source, output, poll_interval=0)
+            watcher.run(until_idle=True)
+
+            self.assertEqual(watcher.converted, [source / "a.pdf"])
+            self.assertEqual(
+                [path for path, _ in watcher.failed], [source / "vide.pdf"]
+            )
+            self.assertEqual(
+                (output / "a.csv").read_text("utf-8").splitlines()[1:],
+                ["ABAS,Lena,1981-09-05"],
+            )
+
+            restarted = FolderWatcher(source, output, poll_interval=0)
+            restarted.run(until_idle=True)
+
+            self.assertEqual(restarted.converted, [])
+            self.assertEqual(restarted.failed, [])
+
+    def test_waits_for_unchanged_size_and_mtime(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir)
+            pdf_path = source / "a.pdf"
+            pdf_path.write_text("Nom;Prénom;Date\n", encoding="utf-8")
+            watcher = FolderWatcher(
+                source, source / "sortie", poll_interval=0, settle_polls=2
+            )
+
+            watcher._scan()
+            watcher._scan()
+            with pdf_path.open("a", encoding="utf-8") as handle:
+                handle.write("ABAS;Lena;05/09/1981")
+            watcher._scan()
+            self.assertFalse(watcher._ready)
+            watcher._scan()
+            watcher._scan()
+
+            self.assertEqual([path for path, _ in watcher._ready], [pdf_path])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import sys
 import tempfile
+import threading
 import unittest
+from datetime import date
 from pathlib import Path
 from unittest import mock
 
@@ -15,6 +17,8 @@ if str(SRC_DIR) not in sys.path:
 
 from listedetenus import workflow
 from listedetenus.models import PdfExtractionResult
+from listedetenus.sqlite_store import StoredDetainee, find_detainees
+from tests.pdf_samples import build_pdf, page_content
 
 
 class WorkflowTestCase(unittest.TestCase):
@@ -56,6 +60,139 @@ class WorkflowTestCase(unittest.TestCase):
             self.assertEqual(captured["data"], ["payload"])
             self.assertTrue(csv_path.parent.exists())
 
+    def test_convert_pdf_to_csv_streaming_writes_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text(
+                "Nom;Prénom;Date\nABAS;Lena;05/09/1981\n\n"
+                "Nom;Prénom;Date\nZEE;Mara;1990-12-01",
+                encoding="utf-8",
+            )
+            csv_path = Path(tmp_dir) / "result.csv"
+
+            workflow.convert_pdf_to_csv(pdf_path, csv_path, streaming=True)
+
+            self.assertEqual(
+                csv_path.read_text(encoding="utf-8").splitlines(),
+                [
+                    "nom,prenom,date_naissance",
+                    "ABAS,Lena,1981-09-05",
+                    "ZEE,Mara,1990-12-01",
+                ],
+            )
+
+    def test_convert_pdf_to_csv_streaming_removes_partial_csv(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text("Nom;Prénom;Date\nA;B;inconnue", "utf-8")
+            csv_path = Path(tmp_dir) / "result.csv"
+
+            with self.assertRaises(RuntimeError):
+                workflow.convert_pdf_to_csv(
+                    pdf_path, csv_path, streaming=True
+                )
+
+            self.assertFalse(csv_path.exists())
+
+    def test_failed_reconversion_keeps_previous_csv(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text("Nom;Prénom;Date\nA;B;inconnue", "utf-8")
+            csv_path = Path(tmp_dir) / "result.csv"
+            csv_path.write_text("nom,prenom,date_naissance\n", "utf-8")
+
+            with self.assertRaises(RuntimeError):
+                workflow.convert_pdf_to_csv(
+                    pdf_path, csv_path, streaming=True
+                )
+
+            self.assertEqual(
+                csv_path.read_text(encoding="utf-8"),
+                "nom,prenom,date_naissance\n",
+            )
+            self.assertEqual(
+                sorted(path.name for path in Path(tmp_dir).iterdir()),
+                ["result.csv", "source.pdf"],
+            )
+
+    def test_convert_pdf_to_csv_parallel_keeps_document_order(self) -> None:
+        blocks = [
+            f"Nom;Prénom;Date\nNOM{index};Lena;05/09/1981"
+            for index in range(12)
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text("\n\n".join(blocks), encoding="utf-8")
+            csv_path = Path(tmp_dir) / "result.csv"
+
+            workflow.convert_pdf_to_csv(pdf_path, csv_path, jobs=2)
+
+            lines = csv_path.read_text(encoding="utf-8").splitlines()
+
+        self.assertEqual(
+            lines[1:], [f"NOM{index},Lena,1981-09-05" for index in range(12)]
+        )
+
+    def test_convert_pdf_to_csv_reports_page_progress(self) -> None:
+        header = ["Nom", "Prénom", "Date"]
+        pages = [
+            page_content([header, [f"NOM{index}", "Lena", "05/09/1981"]])
+            for index in range(3)
+        ]
+        reports: list[tuple[int, int]] = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_bytes(build_pdf(pages))
+
+            workflow.convert_pdf_to_csv(
+                pdf_path,
+                Path(tmp_dir) / "result.csv",
+                progress=lambda done, total: reports.append((done, total)),
+            )
+
+        self.assertEqual(reports, [(1, 3), (2, 3), (3, 3)])
+
+    def test_convert_pdf_to_csv_cancel_removes_partial_csv(self) -> None:
+        cancel_event = threading.Event()
+        cancel_event.set()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text("Nom;Prénom;Date\nA;B;01/01/1990", "utf-8")
+            csv_path = Path(tmp_dir) / "result.csv"
+
+            with self.assertRaises(workflow.ConversionCancelled):
+                workflow.convert_pdf_to_csv(
+                    pdf_path, csv_path, cancel_event=cancel_event
+                )
+
+            self.assertFalse(csv_path.exists())
+
+    def test_convert_pdf_to_sqlite_tags_rows_with_list(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "source.pdf"
+            pdf_path.write_text(
+                "Nom;Prénom;Date\nABAS;Lena;05/09/1981\nZEE;Mara;1990-12-01",
+                encoding="utf-8",
+            )
+            db_path = Path(tmp_dir) / "base" / "detenus.db"
+
+            loaded = workflow.convert_pdf_to_sqlite(
+                pdf_path, db_path, list_date=date(2024, 5, 1)
+            )
+
+            (found,) = find_detainees(db_path, nom="ZEE")
+        self.assertEqual(loaded, 2)
+        expected = StoredDetainee(
+            "ZEE", "Mara", "1990-12-01", "source.pdf", "2024-05-01"
+        )
+        self.assertEqual(found, expected)
+
+    def test_convert_pdf_to_csv_rejects_zero_jobs(self) -> None:
+        with self.assertRaises(ValueError):
+            workflow.convert_pdf_to_csv(
+                Path("source.pdf"), Path("result.csv"), jobs=0
+            )
+
     def test_convert_pdf_to_csv_requires_csv_extension(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             pdf_path = Path(tmp_dir) / "source.pdf"